@@ -17,7 +17,8 @@ Kurallar:
 """
 from __future__ import annotations
 
-from typing import List, Dict, Iterable
+from typing import List, Dict, Iterable, Tuple
+import hashlib
 import re
 
 try:
@@ -61,6 +62,25 @@ def detokenize(tokens: List[int], tokenizer=None) -> str:
     return tokenizer.decode(tokens)
 
 
+def encode_sentences(sentences: List[str], tokenizer=None) -> Tuple[List[int], List[int]]:
+    """Tüm cümleleri tek batch çağrısıyla encode edip düz token akışı üret.
+
+    Dönen: (flat_tokens, offsets) — i'inci cümle flat_tokens[offsets[i]:offsets[i+1]]
+    aralığındadır. Her cümle tek başına encode edildiği için token'lar
+    cümle başına `encode` çağrısıyla birebir aynıdır.
+    """
+    if tokenizer is None:
+        tokenizer = _get_tokenizer()
+    batch = getattr(tokenizer, 'encode_batch', None)
+    encoded = batch(sentences) if batch is not None else [tokenizer.encode(s) for s in sentences]
+    flat: List[int] = []
+    offsets = [0]
+    for toks in encoded:
+        flat.extend(toks)
+        offsets.append(len(flat))
+    return flat, offsets
+
+
 def chunk_sentences(
     sentences: List[str],
     max_tokens: int = 450,
@@ -68,74 +88,71 @@ def chunk_sentences(
     min_chunk_tokens: int = 20,
     store_tokens: bool = False,
 ) -> List[Dict]:
+    """Cümleleri token limitine göre greedy birleştir.
+
+    Cümleler tek `encode_batch` çağrısıyla düz bir token akışına çevrilir;
+    mevcut chunk bu akışta [lo, hi) aralığı olarak tutulur. Her chunk
+    yalnızca bir kez decode edilir, overlap kuyruğu yeniden decode edilmez.
+    """
     if not sentences:
         return []
     tokenizer = _get_tokenizer()
+    flat, offsets = encode_sentences(sentences, tokenizer)
 
     chunks: List[Dict] = []
-    current_tokens: List[int] = []
-    current_texts: List[str] = []
+    lo = hi = 0  # mevcut chunk'ın token akışındaki aralığı
     start_token_index = 0
 
     def flush():
-        nonlocal start_token_index, current_tokens, current_texts
-        if not current_tokens:
+        nonlocal lo, start_token_index
+        n = hi - lo
+        if n <= 0:
             return
-        if len(current_tokens) < min_chunk_tokens:
+        if n < min_chunk_tokens:
             # Çok küçük; atla
-            current_tokens = []
-            current_texts = []
+            lo = hi
             return
-        chunk_id = f"c{len(chunks)+1}"
-        chunk_text = detokenize(current_tokens, tokenizer)
-        end_token_index = start_token_index + len(current_tokens) - 1
+        tokens = flat[lo:hi]
+        end_token_index = start_token_index + n - 1
         chunk_obj = {
-            'id': chunk_id,
-            'text': chunk_text,
-            'token_count': len(current_tokens),
+            'id': f"c{len(chunks)+1}",
+            'text': detokenize(tokens, tokenizer),
+            'token_count': n,
             'start_token': start_token_index,
             'end_token': end_token_index,
         }
         if store_tokens:
-            # Derin kopya – değişmesin
-            chunk_obj['tokens'] = list(current_tokens)
+            chunk_obj['tokens'] = tokens
         chunks.append(chunk_obj)
-        # Overlap uygula
+        # Overlap uygula: kuyruk aynı akış üzerinde kalır
         if overlap > 0:
-            keep = current_tokens[-overlap:]
-            start_token_index = end_token_index + 1 - len(keep)
-            current_tokens = keep[:]
-            # Metnin son cümlesi heuristik olarak yeterli; yeniden inşa et
-            # Orijinal sentence'lar saklamadığımız için basit dekod kullanıyoruz
-            current_texts = [detokenize(keep, tokenizer)]
+            keep = min(overlap, n)
+            lo = hi - keep
+            start_token_index = end_token_index + 1 - keep
         else:
-            current_tokens = []
-            current_texts = []
+            lo = hi
             start_token_index = end_token_index + 1
 
-    for sent in sentences:
-        sent_tokens = tokenize(sent, tokenizer)
-        if not sent_tokens:
+    for i in range(len(sentences)):
+        s_lo, s_hi = offsets[i], offsets[i + 1]
+        n_sent = s_hi - s_lo
+        if not n_sent:
             continue
         # Eğer tek cümle bile limitten büyükse: hard split
-        if len(sent_tokens) > max_tokens:
-            # Parçalara böl
-            for i in range(0, len(sent_tokens), max_tokens):
-                piece = sent_tokens[i:i+max_tokens]
-                if current_tokens:
+        if n_sent > max_tokens:
+            for p_lo in range(s_lo, s_hi, max_tokens):
+                if hi > lo:
                     flush()
-                current_tokens = piece
-                current_texts = [detokenize(piece, tokenizer)]
+                lo, hi = p_lo, min(p_lo + max_tokens, s_hi)
                 flush()
             continue
-        prospective_len = len(current_tokens) + len(sent_tokens)
-        if prospective_len <= max_tokens:
-            current_tokens.extend(sent_tokens)
-            current_texts.append(sent)
+        if (hi - lo) + n_sent <= max_tokens:
+            if hi == lo:
+                lo = s_lo
+            hi = s_hi
         else:
             flush()
-            current_tokens = sent_tokens[:]
-            current_texts = [sent]
+            lo, hi = s_lo, s_hi
     # Son kalan
     flush()
     return chunks
@@ -147,7 +164,11 @@ def tokenize_and_chunk(
     overlap: int = 50,
     min_chunk_tokens: int = 20,
     store_tokens: bool = False,
+    mode: str = 'fixed',
 ) -> List[Dict]:
+    """mode='fixed': greedy + overlap (varsayılan); mode='content': content_defined_chunks."""
+    if mode == 'content':
+        return content_defined_chunks(text, max_tokens=max_tokens, min_chunk_tokens=min_chunk_tokens)
     sents = simple_sentence_split(text)
     return chunk_sentences(
         sents,
@@ -160,7 +181,8 @@ def tokenize_and_chunk(
 __all__ = [
     'tokenize_and_chunk',
     'chunk_sentences',
-    'simple_sentence_split'
+    'simple_sentence_split',
+    'encode_sentences',
 ]
 
 
@@ -173,16 +195,15 @@ def validate_overlap(chunks: List[Dict], overlap: int) -> bool:
         return True
     if len(chunks) < 2:
         return True
-    tok = None
-    for a, b in zip(chunks, chunks[1:]):
-        if 'tokens' in a and 'tokens' in b:
-            ta = a['tokens']
-            tb = b['tokens']
-        else:
-            if tok is None:
-                tok = _get_tokenizer()
-            ta = tok.encode(a['text'])
-            tb = tok.encode(b['text'])
+    # Token'ı saklanmamış chunk'lar tek batch çağrısıyla (ve her biri bir kez) encode edilir
+    need = [i for i, c in enumerate(chunks) if 'tokens' not in c]
+    encoded: Dict[int, List[int]] = {}
+    if need:
+        flat, offsets = encode_sentences([chunks[i]['text'] for i in need])
+        encoded = {i: flat[offsets[j]:offsets[j + 1]] for j, i in enumerate(need)}
+    for i in range(len(chunks) - 1):
+        ta = chunks[i].get('tokens') or encoded.get(i, [])
+        tb = chunks[i + 1].get('tokens') or encoded.get(i + 1, [])
         if len(ta) < overlap or len(tb) < overlap:
             # Chunk çok küçükse katı kontrolü atlıyoruz
             continue
@@ -191,3 +212,118 @@ def validate_overlap(chunks: List[Dict], overlap: int) -> bool:
     return True
 
 __all__.append('validate_overlap')
+
+
+def _sentence_anchor(sentence: str) -> int:
+    """Cümle içeriğinden deterministik 64-bit anchor hash'i."""
+    return int.from_bytes(hashlib.blake2b(sentence.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def content_defined_chunks(
+    text: str,
+    max_tokens: int = 450,
+    min_chunk_tokens: int = 20,
+    avg_sentences: int = 8,
+    tokenizer=None,
+) -> List[Dict]:
+    """Cümle hash'lerine dayalı (content-defined) chunking.
+
+    Sınır kuralı: mevcut chunk en az `min_chunk_tokens` token içeriyorsa ve
+    cümlenin anchor hash'i `avg_sentences`'a bölünüyorsa chunk o cümleden
+    sonra kapanır; ayrıca `max_tokens` aşılacaksa zorunlu kapanır. Sınırlar
+    sadece yerel içeriğe bağlı olduğundan bir cümledeki düzeltme en fazla
+    o bölgedeki chunk'ları değiştirir, sonraki sınırlar kaymaz.
+
+    Overlap uygulanmaz (overlap sınırları tekrar kaydırırdı). Her chunk'a
+    metnin hash'i `content_hash` olarak eklenir; `diff_chunks` bunu kullanır.
+    """
+    sentences = simple_sentence_split(text)
+    if not sentences:
+        return []
+    if tokenizer is None:
+        tokenizer = _get_tokenizer()
+    divisor = max(1, int(avg_sentences))
+
+    chunks: List[Dict] = []
+    current: List[str] = []
+    current_len = 0
+    position = 0  # global token sayacı
+
+    def emit(chunk_text: str, n_tokens: int):
+        nonlocal position
+        if n_tokens >= min_chunk_tokens:
+            chunks.append({
+                'id': f"c{len(chunks)+1}",
+                'text': chunk_text,
+                'token_count': n_tokens,
+                'start_token': position,
+                'end_token': position + n_tokens - 1,
+                'content_hash': _content_hash(chunk_text),
+            })
+        position += n_tokens
+
+    def flush():
+        nonlocal current, current_len
+        if current:
+            emit(' '.join(current), current_len)
+        current = []
+        current_len = 0
+
+    flat, offsets = encode_sentences(sentences, tokenizer)
+    for i, sent in enumerate(sentences):
+        s_lo, s_hi = offsets[i], offsets[i + 1]
+        n = s_hi - s_lo
+        if not n:
+            continue
+        if n > max_tokens:
+            flush()
+            for p_lo in range(s_lo, s_hi, max_tokens):
+                piece = flat[p_lo:min(p_lo + max_tokens, s_hi)]
+                emit(tokenizer.decode(piece), len(piece))
+            continue
+        if current_len + n > max_tokens:
+            flush()
+        current.append(sent)
+        current_len += n
+        if current_len >= min_chunk_tokens and _sentence_anchor(sent) % divisor == 0:
+            flush()
+    flush()
+    return chunks
+
+
+def diff_chunks(old_chunks: List[Dict], new_chunks: List[Dict]) -> Dict[str, List[Dict]]:
+    """İki chunk listesini içerik hash'ine göre karşılaştır.
+
+    Dönen:
+      {
+        'added':   yeni listede olup eskide olmayan chunk'lar,
+        'removed': eski listede olup yenide olmayan chunk'lar,
+        'kept':    iki tarafta da aynı içerikli chunk'lar (yeni liste objeleri,
+                   'previous_id' alanı eski id'yi gösterir),
+      }
+    Aynı içerik birden fazla kez geçiyorsa adet bazında eşleştirilir.
+    """
+    def key(ch: Dict) -> str:
+        return ch.get('content_hash') or _content_hash(ch.get('text', ''))
+
+    pool: Dict[str, List[Dict]] = {}
+    for ch in old_chunks:
+        pool.setdefault(key(ch), []).append(ch)
+    added: List[Dict] = []
+    kept: List[Dict] = []
+    for ch in new_chunks:
+        matches = pool.get(key(ch))
+        if matches:
+            prev = matches.pop(0)
+            kept.append({**ch, 'previous_id': prev.get('id')})
+        else:
+            added.append(ch)
+    removed = [ch for rest in pool.values() for ch in rest]
+    return {'added': added, 'removed': removed, 'kept': kept}
+
+
+__all__ += ['content_defined_chunks', 'diff_chunks']
@@ -3,14 +3,15 @@
 Adımlar:
 1. Topic satırlarını normalize et ve boş olanları at.
 2. Topic embedding'lerini (fake veya gerçek) hesapla (embedding cache zaten metin bazlı çalışıyor).
-3. Chunk embedding'leri ile topic embedding'leri arasında cosine matrisi oluştur.
-4. Her topic için en yüksek skor ve hangi chunk'ta olduğu.
+3. Chunk embedding'leri ile topic embedding'leri arasında cosine matrisi oluştur
+   (NumPy varsa tek BLAS çarpımı; yoksa saf Python döngüleri).
+4. Her topic için en yüksek skor ve hangi chunk'ta olduğu (sütun bazlı argmax).
 5. Skora göre sınıflandırma (covered / partial / missing).
 6. Özet istatistik ve coverage ratio.
 """
 from __future__ import annotations
 from typing import List, Dict, Tuple
-from app.core.embeddings import get_or_compute_embeddings, cosine_similarity, embed_texts
+from app.core.embeddings import get_or_compute_embeddings, cosine_similarity, embed_texts, normalized_matrix, _NUMPY, np
 
 
 def prepare_topics(raw: str) -> List[str]:
@@ -47,6 +48,32 @@ def similarity_matrix(chunk_embeddings: List[Dict], topic_embeddings: List[Dict]
     return matrix
 
 
+def best_matches(chunk_embeddings: List[Dict], topic_embeddings: List[Dict]) -> List[Tuple[float, int]]:
+    """Her topic için (en yüksek skor, en iyi chunk index'i) listesi.
+
+    NumPy varsa n_chunks x n_topics benzerlik bloğu tek matris çarpımıyla
+    hesaplanır ve sütun bazlı max/argmax ile indirgenir. Eşit skorlarda ilk
+    chunk seçilir (list.index davranışı ile aynı).
+    """
+    if not chunk_embeddings or not topic_embeddings:
+        return []
+    dim = len(chunk_embeddings[0]['embedding'])
+    if not _NUMPY or dim == 0:
+        matrix = similarity_matrix(chunk_embeddings, topic_embeddings)
+        out = []
+        for j in range(len(topic_embeddings)):
+            col_scores = [matrix[i][j] for i in range(len(chunk_embeddings))]
+            best_score = max(col_scores)
+            out.append((best_score, col_scores.index(best_score)))
+        return out
+    chunk_mat = normalized_matrix([c['embedding'] for c in chunk_embeddings], dim)
+    topic_mat = normalized_matrix([t['embedding'] for t in topic_embeddings], dim)
+    sims = chunk_mat @ topic_mat.T  # (n_chunks x n_topics)
+    best_idx = sims.argmax(axis=0)
+    best_scores = sims[best_idx, np.arange(sims.shape[1])]
+    return list(zip(best_scores.astype(float).tolist(), best_idx.tolist()))
+
+
 def classify(score: float, covered_thr: float, partial_thr: float) -> str:
     if score >= covered_thr:
         return 'covered'
@@ -72,21 +99,13 @@ def compute_coverage(
         # Hepsi missing
         results = [{'topic': t['topic'], 'status': 'missing', 'best_score': 0.0, 'best_chunk_id': None} for t in topic_embs]
     else:
-        matrix = similarity_matrix(embedded_chunks, topic_embs)
-        # topic sütunları üzerinden max bul
         results = []
-        for j, tp in enumerate(topic_embs):
-            # j'inci topic için tüm chunk skorları
-            col_scores = [matrix[i][j] for i in range(len(embedded_chunks))]
-            best_score = max(col_scores)
-            best_idx = col_scores.index(best_score)
-            best_chunk_id = embedded_chunks[best_idx]['id']
-            status = classify(best_score, covered_thr, partial_thr)
+        for tp, (best_score, best_idx) in zip(topic_embs, best_matches(embedded_chunks, topic_embs)):
             results.append({
                 'topic': tp['topic'],
-                'status': status,
+                'status': classify(best_score, covered_thr, partial_thr),
                 'best_score': best_score,
-                'best_chunk_id': best_chunk_id,
+                'best_chunk_id': embedded_chunks[best_idx]['id'],
             })
     summary = {
         'covered': sum(1 for r in results if r['status']=='covered'),
@@ -99,5 +118,6 @@ def compute_coverage(
 
 __all__ = [
     'compute_coverage',
-    'prepare_topics'
+    'prepare_topics',
+    'best_matches',
 ]
@@ -6,15 +6,28 @@ Metrikler:
 - Lexical diversity (type/token) -> repetition skoru
 - Average sentence length
 - Pause density (heuristic: '...' , boş satır, uzun çizgi vs.)
+- Segment modu (STT segmentleri verilirse): gerçek sessizlik boşlukları,
+  kayan pencerede WPM serisi, uzun duraklama ve hız patlaması işaretleri
 
 Çıktı: compute_delivery_metrics(transcript:str, duration_minutes:Optional[float]) -> dict
+
+Kelime / cümle / duraklama sayımları ortak `TextProfile`'dan okunur
+(app/core/text_profile.py); aynı transkript için profil bir kez çıkarılır.
+Filler'lar app/core/fillers.py ile (dil listeleri settings.filler_words,
+çok kelimeli ifadeler dahil) tek geçişte sayılır; ayrıntı sonuçta 'fillers'.
 """
 from __future__ import annotations
 from typing import List, Dict, Optional
-import re
 
-WORD_RE = re.compile(r"\b\w+\b", re.UNICODE)
-SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+from .fillers import DEFAULT_FILLER_WORDS, analyze_fillers
+from .text_profile import TextProfile, get_text_profile, WORD_RE, SENT_SPLIT_RE  # noqa: F401
+
+try:  # opsiyonel: segment modu vektörize hesap
+	import numpy as np  # type: ignore
+	_NUMPY = True
+except Exception:  # pragma: no cover
+	np = None  # type: ignore
+	_NUMPY = False
 
 DEFAULT_CONFIG = {
 	'ideal_wpm_min': 130,
@@ -24,6 +37,11 @@ DEFAULT_CONFIG = {
 	'sentence_len_min': 8,
 	'sentence_len_max': 24,
 	'pause_tolerance': 0.10,
+	# segment modu
+	'pause_long_sec': 2.0,
+	'wpm_window_sec': 30.0,
+	'wpm_step_sec': 10.0,
+	'burst_wpm_factor': 1.3,  # ideal_wpm_max * faktör üstü pencere -> hız patlaması
 	'weights': {
 		'wpm': 0.25,
 		'filler': 0.25,
@@ -33,43 +51,13 @@ DEFAULT_CONFIG = {
 	}
 }
 
-DEFAULT_FILLERS = [
-	'şey', 'yani', 'hani', 'aslında', 'işte', 'falan', 'gibi', 'efendim', 'ya', 'aynen'
-]
+DEFAULT_FILLERS = DEFAULT_FILLER_WORDS['tr']
 
 
 def _safe_div(a: float, b: float) -> float:
 	return a / b if b else 0.0
 
 
-def _words(text: str) -> List[str]:
-	return [w.lower() for w in WORD_RE.findall(text)]
-
-
-def _sentences(text: str) -> List[str]:
-	t = text.strip()
-	if not t:
-		return []
-	t = re.sub(r"[\r\n]+", " ", t)
-	parts = SENT_SPLIT_RE.split(t)
-	return [p.strip() for p in parts if p.strip()]
-
-
-def _count_fillers(words: List[str], fillers: List[str]) -> int:
-	fset = set(fillers)
-	return sum(1 for w in words if w in fset)
-
-
-def _lexical_diversity(words: List[str]) -> float:
-	if not words:
-		return 0.0
-	return len(set(words)) / len(words)
-
-
-def _pause_markers(text: str) -> int:
-	return len(re.findall(r"(\.\.\.|…|--)", text)) + text.count('\n\n')
-
-
 def _normalize_wpm(wpm: float, min_w: float, max_w: float) -> float:
 	if wpm <= 0:
 		return 0.0
@@ -122,35 +110,118 @@ def _normalize_pause(density: float, tol: float) -> float:
 	return max(0.0, 0.5 * (1 - (density - tol) / tol))
 
 
-def compute_delivery_metrics(
-	transcript: str,
-	duration_minutes: Optional[float] = None,
-	config: Optional[Dict] = None,
-	fillers: Optional[List[str]] = None,
-) -> Dict:
-	cfg = DEFAULT_CONFIG.copy()
+def analyze_segments(segments: List[Dict], config: Optional[Dict] = None) -> Optional[Dict]:
+	"""STT segmentlerinden (start/end/text, saniye) zaman tabanlı konuşma metrikleri.
+
+	Tüm hesap segment dizileri üzerinde tek vektörize geçiştir:
+	- sessizlik: ardışık segmentler arası boşluk (üst üste binme -> 0)
+	- kelime zamanları: segment içinde eşit aralıklı varsayılır
+	- WPM serisi: `wpm_window_sec` pencere, `wpm_step_sec` adım (searchsorted ile sayım)
+	- uzun duraklama: boşluk >= `pause_long_sec`; hız patlaması: pencere WPM >
+	  ideal_wpm_max * `burst_wpm_factor` (ardışık pencereler birleştirilir)
+	numpy yoksa veya geçerli segment yoksa None.
+	"""
+	if not _NUMPY or not segments:
+		return None
+	cfg = {**DEFAULT_CONFIG, **(config or {})}
+	segs = sorted(
+		(sg for sg in segments if sg.get('start') is not None and sg.get('end') is not None),
+		key=lambda sg: float(sg['start']),
+	)
+	if not segs:
+		return None
+	starts = np.array([float(sg['start']) for sg in segs])
+	ends = np.maximum(np.array([float(sg['end']) for sg in segs]), starts)
+	n_words = np.array([len(WORD_RE.findall(sg.get('text') or '')) for sg in segs], dtype=np.int64)
+
+	prev_end = np.maximum.accumulate(ends)[:-1]
+	gaps = np.clip(starts[1:] - prev_end, 0.0, None)
+	long_idx = np.flatnonzero(gaps >= float(cfg['pause_long_sec']))
+	t0, t1 = float(starts[0]), float(ends.max())
+	span = t1 - t0
+	speaking = float(np.sum(ends - starts))
+
+	total = int(n_words.sum())
+	seg_idx = np.repeat(np.arange(len(segs)), n_words)
+	offs = np.arange(total) - np.repeat(np.cumsum(n_words) - n_words, n_words)
+	word_t = np.sort(starts[seg_idx] + (offs + 0.5) / np.maximum(n_words[seg_idx], 1) * (ends - starts)[seg_idx])
+
+	window = float(cfg['wpm_window_sec'])
+	if 0 < span < window:
+		window = span
+	step = max(float(cfg['wpm_step_sec']), 1e-6)
+	win_t = np.arange(t0, max(t0, t1 - window) + 1e-9, step)
+	if win_t[-1] < t1 - window - 1e-9:  # son pencere konuşma sonuna hizalanır
+		win_t = np.append(win_t, t1 - window)
+	counts = np.searchsorted(word_t, win_t + window) - np.searchsorted(word_t, win_t)
+	wpm_series = counts / (window / 60.0) if window > 0 else np.zeros(len(win_t))
+
+	burst_thr = float(cfg['ideal_wpm_max']) * float(cfg['burst_wpm_factor'])
+	flagged = np.flatnonzero(wpm_series > burst_thr)
+	bursts = []
+	if flagged.size:
+		# ardışık pencere indeksleri tek patlama aralığı
+		groups = np.split(flagged, np.flatnonzero(np.diff(flagged) != 1) + 1)
+		bursts = [
+			{'start': float(win_t[g[0]]), 'end': float(win_t[g[-1]] + window), 'max_wpm': float(wpm_series[g].max())}
+			for g in groups
+		]
+	pauses = [
+		{'start': float(prev_end[i]), 'end': float(starts[i + 1]), 'duration': float(gaps[i])}
+		for i in long_idx
+	]
+	return {
+		'words': total,
+		'duration_minutes': span / 60.0,
+		'raw': {
+			'speaking_minutes': speaking / 60.0,
+			'articulation_wpm': _safe_div(total, speaking / 60.0),
+			'silence_seconds': float(gaps.sum()),
+			'long_pause_count': int(long_idx.size),
+			'max_pause_seconds': float(gaps.max()) if gaps.size else 0.0,
+			'wpm_std': float(wpm_series.std()) if wpm_series.size else 0.0,
+			'wpm_max': float(wpm_series.max()) if wpm_series.size else 0.0,
+			'burst_count': len(bursts),
+		},
+		'timeline': {
+			'window_sec': window,
+			'step_sec': step,
+			't': win_t.tolist(),
+			'wpm': wpm_series.tolist(),
+			'pauses': pauses,
+			'bursts': bursts,
+		},
+	}
+
+
+def resolve_config(config: Optional[Dict] = None) -> Dict:
+	"""DEFAULT_CONFIG + override (iç içe dict'ler kopyalanır; DEFAULT_CONFIG değişmez)."""
+	cfg = {k: (dict(v) if isinstance(v, dict) else v) for k, v in DEFAULT_CONFIG.items()}
 	if config:
 		for k, v in config.items():
 			if isinstance(v, dict) and k in cfg:
 				cfg[k].update(v)  # type: ignore
 			else:
 				cfg[k] = v
-	fillers_list = fillers or DEFAULT_FILLERS
-
-	words = _words(transcript)
-	sentences = _sentences(transcript)
-	word_count = len(words)
-	if not duration_minutes or duration_minutes <= 0:
-		duration_minutes = _safe_div(word_count, 150.0)
-
-	unique_words = len(set(words))
+	return cfg
+
+
+def score_delivery(
+	cfg: Dict,
+	word_count: int,
+	unique_words: int,
+	duration_minutes: float,
+	filler_info: Dict,
+	sentence_count: int,
+	pause_count: int,
+	mode: str = 'text',
+) -> Dict:
+	"""Sayımlardan delivery sonuç dict'i (compute_delivery_metrics ve canlı akümülatör ortak)."""
 	wpm = _safe_div(word_count, duration_minutes)
-	filler_count = _count_fillers(words, fillers_list)
+	filler_count = filler_info['count']
 	filler_ratio = _safe_div(filler_count, word_count)
-	diversity = _lexical_diversity(words)
-	sentence_count = len(sentences)
+	diversity = _safe_div(unique_words, word_count)
 	avg_sentence_len = _safe_div(word_count, sentence_count) if sentence_count else 0.0
-	pause_count = _pause_markers(transcript)
 	pause_density = _safe_div(pause_count, sentence_count) if sentence_count else 0.0
 
 	insufficient = word_count < 20
@@ -169,7 +240,8 @@ def compute_delivery_metrics(
 		delivery_score = sum(scores[k] * weights[k] for k in scores)
 	scores['delivery_score'] = delivery_score
 
-	return {
+	result = {
+		'mode': mode,
 		'raw': {
 			'words': word_count,
 			'unique_words': unique_words,
@@ -177,6 +249,7 @@ def compute_delivery_metrics(
 			'wpm': wpm,
 			'filler_count': filler_count,
 			'filler_ratio': filler_ratio,
+			'filler_per_minute': filler_info['per_minute'] or 0.0,
 			'sentence_count': sentence_count,
 			'avg_sentence_len': avg_sentence_len,
 			'pause_markers': pause_count,
@@ -185,7 +258,53 @@ def compute_delivery_metrics(
 		},
 		'scores': scores,
 		'weights': weights,
-		'config_used': {k: v for k, v in cfg.items() if k != 'weights'}
+		'config_used': {k: v for k, v in cfg.items() if k != 'weights'},
+		'fillers': filler_info,
 	}
+	return result
+
+
+def compute_delivery_metrics(
+	transcript: str,
+	duration_minutes: Optional[float] = None,
+	config: Optional[Dict] = None,
+	fillers: Optional[List[str]] = None,
+	profile: Optional[TextProfile] = None,
+	language: Optional[str] = None,
+	segments: Optional[List[Dict]] = None,
+) -> Dict:
+	"""profile verilirse transkript yeniden taranmaz (transcript yok sayılır).
+
+	fillers verilmezse filler listesi `language`'e (yoksa tahmin edilen dile) göre
+	settings.filler_words'ten seçilir.
+	segments (STT start/end/text) verilirse süre segmentlerden alınır, pause
+	yoğunluğu gerçek uzun sessizliklerden hesaplanır; raw'a zaman metrikleri,
+	sonuca 'timeline' eklenir (bkz. analyze_segments). transcript boşsa metin
+	segmentlerden birleştirilir.
+	"""
+	cfg = resolve_config(config)
+	seg_info = analyze_segments(segments, cfg) if segments else None
+	if seg_info is not None and profile is None and not (transcript or '').strip():
+		transcript = ' '.join((sg.get('text') or '').strip() for sg in segments)  # type: ignore[union-attr]
+	prof = profile if profile is not None else get_text_profile(transcript)
+	word_count = prof.word_count
+	if (not duration_minutes or duration_minutes <= 0) and seg_info is not None:
+		duration_minutes = seg_info['duration_minutes']
+	if not duration_minutes or duration_minutes <= 0:
+		duration_minutes = _safe_div(word_count, 150.0)
 
-__all__ = ['compute_delivery_metrics']
+	filler_info = analyze_fillers(
+		duration_minutes=duration_minutes, language=language, fillers=fillers or None, profile=prof,
+	)
+	# segment modunda duraklama = gerçek uzun sessizlik (metin işaretleri yerine)
+	pause_count = seg_info['raw']['long_pause_count'] if seg_info is not None else prof.pause_markers
+	result = score_delivery(
+		cfg, word_count, prof.unique_words, duration_minutes, filler_info, prof.sentence_count, pause_count,
+		mode='segments' if seg_info is not None else 'text',
+	)
+	if seg_info is not None:
+		result['raw'].update(seg_info['raw'])
+		result['timeline'] = seg_info['timeline']
+	return result
+
+__all__ = ['compute_delivery_metrics', 'analyze_segments', 'score_delivery', 'resolve_config']
@@ -2,9 +2,10 @@
 Gemini embedding çağrıları + disk cache + cosine similarity yardımcıları.
 
 Cache Stratejisi:
-- Dosya: `.cache/embeddings.jsonl` (her satır: {"key":sha256, "model":..., "text_sha":..., "vector":[...]})
+- Vektörler: `.cache/embeddings.f32` (float32, append-only, read-only mmap ile okunur)
+- İndeks: `.cache/embeddings.idx.sqlite` (sha256 digest -> offset/dim)
 - Anahtar: sha256(model_name + "::" + chunk_text)
-- Bellek: process süresince dict cache
+- Eski `.cache/embeddings.jsonl` ilk açılışta tek seferlik binary formata taşınır
 
 Not: Şu an gerçek Gemini çağrısı TODO bırakıldı; entegrasyon için
 google-generativeai import edilip API anahtarı secrets'tan alınacak.
@@ -12,16 +13,31 @@ Hackathon hız avantajı için önce yapı kurulur, sonra gerçek çağrı eklen
 """
 from __future__ import annotations
 
-import os, json, hashlib
+import os, sys, json, hashlib
+import mmap
+import sqlite3
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import time
 
-_EMBED_CACHE_PATH = os.path.join('.cache', 'embeddings.jsonl')
-_memory_cache: Dict[str, List[float]] = {}
+try:  # opsiyonel: vektörize benzerlik yardımcıları
+	import numpy as np  # type: ignore
+	_NUMPY = True
+except Exception:  # pragma: no cover
+	np = None  # type: ignore
+	_NUMPY = False
+
+_CACHE_DIR = '.cache'
+_EMBED_CACHE_PATH = os.path.join(_CACHE_DIR, 'embeddings.jsonl')  # eski (legacy) JSONL cache
+_VECTOR_FILE = 'embeddings.f32'
+_INDEX_FILE = 'embeddings.idx.sqlite'
+_LOOKUP_BATCH = 500  # SQLite parametre limiti altında kal
 
 
 def _ensure_cache_dir():
-	os.makedirs(os.path.dirname(_EMBED_CACHE_PATH), exist_ok=True)
+	os.makedirs(_CACHE_DIR, exist_ok=True)
 
 
 def _hash_key(model: str, text: str) -> str:
@@ -34,20 +50,193 @@ def _hash_text(text: str) -> str:
 	return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
 
-def load_disk_cache() -> None:
-	if not os.path.exists(_EMBED_CACHE_PATH):
-		return
-	try:
-		with open(_EMBED_CACHE_PATH, 'r', encoding='utf-8') as f:
+def _as_float32(vec: List[float]) -> List[float]:
+	"""Vektörü float32 hassasiyetine yuvarla (cache'ten okunan değerle birebir aynı olsun)."""
+	return array('f', vec).tolist()
+
+
+class EmbeddingDiskCache:
+	"""Binary, memory-mapped embedding cache.
+
+	Dosyalar (cache_dir altında):
+	  - embeddings.f32        : ardışık float32 vektörler (little-endian, sadece append)
+	  - embeddings.idx.sqlite : key(sha256 digest, 32 byte) -> (offset, dim) indeksi
+
+	Okuma: vektör dosyası read-only mmap edilir; lookup SQLite PRIMARY KEY
+	(B-tree, O(log n)) ile yapılır, sadece istenen satırlar listeye çevrilir.
+	Yazma: önce vektör byte'ları dosyaya eklenip fsync edilir, sonra indeks
+	satırları tek transaction'da commit edilir. Arada çökme olursa dosyada
+	sahipsiz byte kalır ama indeks hiçbir zaman yarım vektörü göstermez.
+	"""
+
+	def __init__(self, cache_dir: str = _CACHE_DIR):
+		self.cache_dir = cache_dir
+		os.makedirs(cache_dir, exist_ok=True)
+		self.vector_path = os.path.join(cache_dir, _VECTOR_FILE)
+		self.index_path = os.path.join(cache_dir, _INDEX_FILE)
+		self._lock = threading.Lock()
+		self._mm: Optional[mmap.mmap] = None
+		self._conn = sqlite3.connect(self.index_path, check_same_thread=False, isolation_level=None)
+		self._conn.execute("PRAGMA journal_mode=WAL;")
+		self._conn.execute("PRAGMA synchronous=NORMAL;")
+		self._conn.execute(
+			"""
+			CREATE TABLE IF NOT EXISTS vectors (
+				key BLOB PRIMARY KEY,
+				model TEXT,
+				offset INTEGER NOT NULL,
+				dim INTEGER NOT NULL
+			) WITHOUT ROWID;
+			"""
+		)
+		if not os.path.exists(self.vector_path):
+			open(self.vector_path, 'ab').close()
+
+	def __len__(self) -> int:
+		with self._lock:
+			return self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+	def _mapped(self, needed_bytes: int) -> Optional[mmap.mmap]:
+		# Dosya büyüdüyse yeniden map et (mmap boyutu sabit)
+		if self._mm is None or len(self._mm) < needed_bytes:
+			if self._mm is not None:
+				self._mm.close()
+				self._mm = None
+			size = os.path.getsize(self.vector_path)
+			if size == 0:
+				return None
+			with open(self.vector_path, 'rb') as f:
+				self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		return self._mm
+
+	def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+		"""Verilen hex key'ler için cache'te bulunan vektörleri döndür."""
+		found: Dict[str, List[float]] = {}
+		uniq = list(dict.fromkeys(keys))
+		with self._lock:
+			rows = []
+			for i in range(0, len(uniq), _LOOKUP_BATCH):
+				part = [bytes.fromhex(k) for k in uniq[i:i + _LOOKUP_BATCH]]
+				placeholders = ','.join('?' * len(part))
+				rows.extend(self._conn.execute(
+					f"SELECT key, offset, dim FROM vectors WHERE key IN ({placeholders})", part
+				).fetchall())
+			if not rows:
+				return found
+			end = max((off + dim) * 4 for _, off, dim in rows)
+			mm = self._mapped(end)
+			if mm is None:
+				return found
+			view = memoryview(mm)
+			try:
+				for key, off, dim in rows:
+					found[key.hex()] = view[off * 4:(off + dim) * 4].cast('f').tolist()
+			finally:
+				view.release()
+		return found
+
+	def put_many(self, entries: List[Dict]) -> int:
+		"""[{'key': hex, 'model': str, 'vector': List[float]}] ekle; eklenen satır sayısı."""
+		if not entries:
+			return 0
+		with self._lock:
+			# BEGIN IMMEDIATE: diğer process'lerle yazma sırasını SQLite kilidi belirler
+			self._conn.execute("BEGIN IMMEDIATE")
+			try:
+				keys = [bytes.fromhex(e['key']) for e in entries]
+				existing = set()
+				for i in range(0, len(keys), _LOOKUP_BATCH):
+					part = keys[i:i + _LOOKUP_BATCH]
+					placeholders = ','.join('?' * len(part))
+					existing.update(r[0] for r in self._conn.execute(
+						f"SELECT key FROM vectors WHERE key IN ({placeholders})", part
+					))
+				buf = array('f')
+				rows = []
+				with open(self.vector_path, 'ab') as f:
+					pos = f.tell()
+					if pos % 4:
+						# Önceki yarım yazımdan kalan hizasız kuyruk: hizala
+						f.write(b'\0' * (4 - pos % 4))
+						pos += 4 - pos % 4
+					offset = pos // 4
+					for key, e in zip(keys, entries):
+						if key in existing:
+							continue
+						existing.add(key)
+						vec = e['vector']
+						rows.append((key, e.get('model'), offset + len(buf), len(vec)))
+						buf.extend(vec)
+					if sys.byteorder != 'little':  # pragma: no cover
+						buf.byteswap()
+					f.write(buf.tobytes())
+					f.flush()
+					os.fsync(f.fileno())
+				self._conn.executemany(
+					"INSERT INTO vectors(key, model, offset, dim) VALUES (?, ?, ?, ?)", rows
+				)
+				self._conn.execute("COMMIT")
+			except Exception:
+				self._conn.execute("ROLLBACK")
+				raise
+		return len(rows)
+
+	def migrate_jsonl(self, jsonl_path: str, batch_size: int = 1000) -> int:
+		"""Eski JSONL cache'i tek seferlik binary formata taşı.
+
+		Başarılı taşımadan sonra dosya `<ad>.migrated` olarak yeniden adlandırılır;
+		böylece sonraki açılışlarda tekrar okunmaz.
+		"""
+		if not os.path.exists(jsonl_path):
+			return 0
+		moved = 0
+		batch: List[Dict] = []
+		with open(jsonl_path, 'r', encoding='utf-8') as f:
 			for line in f:
 				line = line.strip()
 				if not line:
 					continue
 				try:
 					obj = json.loads(line)
-					_memory_cache[obj['key']] = obj['vector']
+					batch.append({'key': obj['key'], 'model': obj.get('model'), 'vector': obj['vector']})
 				except Exception:
 					continue
+				if len(batch) >= batch_size:
+					moved += self.put_many(batch)
+					batch = []
+		moved += self.put_many(batch)
+		os.replace(jsonl_path, jsonl_path + '.migrated')
+		return moved
+
+	def close(self) -> None:
+		with self._lock:
+			if self._mm is not None:
+				self._mm.close()
+				self._mm = None
+			self._conn.close()
+
+
+_DISK_CACHE: Optional[EmbeddingDiskCache] = None
+
+
+def get_disk_cache() -> EmbeddingDiskCache:
+	"""Process genelinde tek binary cache örneği (ilk açılışta JSONL migrasyonu)."""
+	global _DISK_CACHE
+	if _DISK_CACHE is None:
+		_ensure_cache_dir()
+		cache = EmbeddingDiskCache(_CACHE_DIR)
+		try:
+			cache.migrate_jsonl(_EMBED_CACHE_PATH)
+		except Exception:
+			pass
+		_DISK_CACHE = cache
+	return _DISK_CACHE
+
+
+def load_disk_cache() -> None:
+	"""Geriye uyumluluk: cache'i aç (idempotent). Vektörler belleğe yüklenmez."""
+	try:
+		get_disk_cache()
 	except Exception:
 		pass
 
@@ -55,10 +244,7 @@ def load_disk_cache() -> None:
 def append_disk_cache(entries: List[Dict]):
 	if not entries:
 		return
-	_ensure_cache_dir()
-	with open(_EMBED_CACHE_PATH, 'a', encoding='utf-8') as f:
-		for e in entries:
-			f.write(json.dumps(e, ensure_ascii=False) + '\n')
+	get_disk_cache().put_many(entries)
 
 
 def cosine_similarity(a: List[float], b: List[float]) -> float:
@@ -73,6 +259,27 @@ def cosine_similarity(a: List[float], b: List[float]) -> float:
 	return dot / (na * nb)
 
 
+def normalized_matrix(vectors, dim: int):
+	"""Vektörleri L2-normalize edilmiş float32 (n x dim) matrise çevir (NumPy gerekir).
+
+	Boyutu `dim` ile uyuşmayan veya sıfır normlu satırlar sıfır bırakılır;
+	böylece skorları `cosine_similarity` ile aynı şekilde 0.0 olur.
+	"""
+	try:
+		mat = np.array(vectors, dtype=np.float32)
+		if mat.ndim != 2 or mat.shape[1] != dim:
+			raise ValueError('boyut uyuşmazlığı')
+	except ValueError:
+		# Düzensiz (ragged) giriş: satır satır doldur
+		mat = np.zeros((len(vectors), dim), dtype=np.float32)
+		for i, v in enumerate(vectors):
+			if len(v) == dim:
+				mat[i] = v
+	norms = np.linalg.norm(mat, axis=1, keepdims=True)
+	np.divide(mat, norms, out=mat, where=norms > 0)
+	return np.ascontiguousarray(mat)
+
+
 def _fake_embed(text: str, dim: int = 8) -> List[float]:
 	"""Geçici düşük boyut deterministic vektör (placeholder)."""
 	# Deterministic pseudo-random: hash -> ints -> normalize
@@ -84,7 +291,137 @@ def _fake_embed(text: str, dim: int = 8) -> List[float]:
 	return [x / norm for x in arr]
 
 
-def embed_texts(texts: List[str], model: str = 'text-embedding-004', use_real: bool = False, retries: int = 3, backoff: float = 1.5) -> List[List[float]]:
+class _RateLimiter:
+	"""Thread-safe basit hız sınırlayıcı: istek başlangıçları arasında min aralık."""
+
+	def __init__(self, requests_per_sec: Optional[float]):
+		self.interval = (1.0 / requests_per_sec) if requests_per_sec and requests_per_sec > 0 else 0.0
+		self._lock = threading.Lock()
+		self._next_at = 0.0
+
+	def acquire(self) -> None:
+		if self.interval <= 0:
+			return
+		with self._lock:
+			now = time.monotonic()
+			wait = self._next_at - now
+			self._next_at = max(now, self._next_at) + self.interval
+		if wait > 0:
+			time.sleep(wait)
+
+
+class _SharedBackoff:
+	"""Tüm worker'ların paylaştığı 429 (rate limit) bekleme penceresi.
+
+	Bir worker 429 aldığında pencere ileri kayar; diğer worker'lar yeni istek
+	göndermeden önce aynı süreyi bekler. Ardışık 429'lar süreyi katlar.
+	"""
+
+	def __init__(self, base: float):
+		self.base = base
+		self._lock = threading.Lock()
+		self._resume_at = 0.0
+		self._strikes = 0
+
+	def wait(self) -> None:
+		with self._lock:
+			delay = self._resume_at - time.monotonic()
+		if delay > 0:
+			time.sleep(delay)
+
+	def hit_rate_limit(self) -> None:
+		with self._lock:
+			delay = self.base * (2 ** self._strikes)
+			self._strikes = min(self._strikes + 1, 6)
+			self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+	def success(self) -> None:
+		with self._lock:
+			self._strikes = 0
+
+
+def _is_rate_limit_error(exc: Exception) -> bool:
+	code = getattr(exc, 'code', None) or getattr(exc, 'status_code', None)
+	if code == 429:
+		return True
+	name = type(exc).__name__
+	return name in ('ResourceExhausted', 'TooManyRequests') or '429' in str(exc)
+
+
+def _parse_embedding_response(resp, expected: int) -> List[List[float]]:
+	"""embed_content yanıtını vektör listesine çevir (tekli ve batch formatları)."""
+	emb = resp
+	if isinstance(resp, dict):
+		emb = resp.get('embedding') or resp.get('data') or resp  # API varyasyon güvenliği
+	if isinstance(emb, dict) and 'embedding' in emb:
+		emb = emb['embedding']
+	if isinstance(emb, list) and emb and isinstance(emb[0], dict):
+		emb = [e.get('embedding') or e.get('values') for e in emb]
+	if isinstance(emb, list) and emb and isinstance(emb[0], (int, float)):
+		emb = [emb]
+	if not isinstance(emb, list) or len(emb) != expected or not all(isinstance(v, list) for v in emb):
+		raise ValueError('Embedding formatı beklenmedik.')
+	return emb
+
+
+def _embed_batches_concurrent(
+	client,
+	texts: List[str],
+	model: str,
+	*,
+	batch_size: int,
+	max_workers: int,
+	requests_per_sec: Optional[float],
+	retries: int,
+	backoff: float,
+) -> List[List[float]]:
+	"""Metinleri batch'lere bölüp sınırlı thread havuzunda gönder; sıra korunur.
+
+	Her batch için: rate limiter -> paylaşılan 429 bekleme -> embed_content.
+	Tüm denemeler başarısız olursa o batch'in metinleri fake vektöre düşer.
+	"""
+	batch_size = max(1, batch_size)
+	batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+	limiter = _RateLimiter(requests_per_sec)
+	shared = _SharedBackoff(backoff)
+
+	def run_batch(batch: List[str]) -> List[List[float]]:
+		for attempt in range(retries):
+			shared.wait()
+			limiter.acquire()
+			try:
+				content = batch if len(batch) > 1 else batch[0]
+				vecs = _parse_embedding_response(client.embed_content(model=model, content=content), len(batch))
+				shared.success()
+				return vecs
+			except Exception as e:
+				if _is_rate_limit_error(e):
+					shared.hit_rate_limit()
+				elif attempt < retries - 1:
+					time.sleep(backoff * (2 ** attempt))
+		# Son deneme de başarısız: fake fallback bu batch için
+		return [_fake_embed(t, dim=8) for t in batch]
+
+	workers = max(1, min(max_workers, len(batches)))
+	if workers == 1:
+		results = [run_batch(b) for b in batches]
+	else:
+		with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='embed') as pool:
+			results = list(pool.map(run_batch, batches))
+	return [vec for batch_vecs in results for vec in batch_vecs]
+
+
+def embed_texts(
+	texts: List[str],
+	model: str = 'text-embedding-004',
+	use_real: bool = False,
+	retries: int = 3,
+	backoff: float = 1.5,
+	batch_size: int = 100,
+	max_workers: int = 4,
+	requests_per_sec: Optional[float] = 10.0,
+	client=None,
+) -> List[List[float]]:
 	"""Metin listesi için embedding döndür.
 
 	Parametreler:
@@ -92,89 +429,108 @@ def embed_texts(texts: List[str], model: str = 'text-embedding-004', use_real: b
 	  model: gemini embedding modeli (varsayılan: text-embedding-004)
 	  use_real: True ise Gemini API çağrısı yapılır, aksi halde deterministik fake vektör
 	  retries: başarısız gerçek çağrı deneme sayısı
-	  backoff: exponential backoff tabanı (saniye)
+	  backoff: exponential backoff tabanı (saniye); 429'da tüm worker'lar için ortak
+	  batch_size: tek istekte gönderilen metin sayısı
+	  max_workers: eşzamanlı istek sayısı üst sınırı
+	  requests_per_sec: istek başlatma hızı sınırı (None/0 -> sınırsız)
+	  client: `embed_content(model=..., content=...)` sağlayan nesne (test için stub);
+	          verilmezse google.generativeai kullanılır
 
 	Hata / fallback stratejisi:
 	  - API key yoksa fake'e düş
-	  - API çağrısı 429/5xx veya diğer Exception üretirse retry, sonra fake kalanları doldur
+	  - Batch 429/5xx veya diğer Exception üretirse retry, sonra o batch'i fake ile doldur
+	  - Çıktı sırası giriş sırasıyla aynıdır
 	"""
-	vectors: List[List[float]] = []
 	if not use_real:
 		return [_fake_embed(t) for t in texts]
+	if not texts:
+		return []
 
-	api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-	if not api_key:
-		# Anahtar yok; sessiz fallback
-		return [_fake_embed(t) for t in texts]
+	if client is None:
+		api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+		if not api_key:
+			# Anahtar yok; sessiz fallback
+			return [_fake_embed(t) for t in texts]
+		try:
+			import google.generativeai as genai  # type: ignore
+			genai.configure(api_key=api_key)
+			client = genai
+		except Exception:
+			# Kütüphane yok veya yapılandırma hatası → fake
+			return [_fake_embed(t) for t in texts]
 
-	try:
-		import google.generativeai as genai  # type: ignore
-		genai.configure(api_key=api_key)
-	except Exception:
-		# Kütüphane yok veya yapılandırma hatası → fake
-		return [_fake_embed(t) for t in texts]
-
-	for text in texts:
-		success = False
-		for attempt in range(retries):
-			try:
-				resp = genai.embed_content(model=model, content=text)
-				emb = resp.get('embedding') or resp.get('data') or resp  # API varyasyon güvenliği
-				if isinstance(emb, dict) and 'embedding' in emb:
-					emb = emb['embedding']
-				if not isinstance(emb, list):
-					raise ValueError('Embedding formatı beklenmedik.')
-				vectors.append(emb)
-				success = True
-				break
-			except Exception:
-				if attempt < retries - 1:
-					time.sleep(backoff * (2 ** attempt))
-				else:
-					# Son deneme de başarısız: fake fallback bu metin için
-					vectors.append(_fake_embed(text, dim=8))
-		if not success:
-			# Fallback eklenmiş durumda; success False kalsa da ilerlenebilir
-			continue
-	return vectors
+	return _embed_batches_concurrent(
+		client,
+		texts,
+		model,
+		batch_size=batch_size,
+		max_workers=max_workers,
+		requests_per_sec=requests_per_sec,
+		retries=retries,
+		backoff=backoff,
+	)
 
 
 def get_or_compute_embeddings(chunks: List[Dict], model: str = 'text-embedding-004', use_real: bool = False) -> List[Dict]:
-	load_disk_cache()  # idempotent
-	new_entries = []
-	output = []
-	to_compute: List[str] = []
-	missing_indices: List[int] = []
-	for idx, ch in enumerate(chunks):
-		key = _hash_key(model, ch['text'])
-		if key in _memory_cache:
-			output.append({**ch, 'embedding': _memory_cache[key]})
-		else:
-			to_compute.append(ch['text'])
-			missing_indices.append(idx)
-			output.append(None)  # placeholder
-	if to_compute:
-		vectors = embed_texts(to_compute, model=model, use_real=use_real)
-		for local_i, vec in enumerate(vectors):
-			global_idx = missing_indices[local_i]
-			ch = chunks[global_idx]
-			key = _hash_key(model, ch['text'])
-			_memory_cache[key] = vec
-			entry = {
-				'key': key,
-				'model': model,
-				'text_sha': _hash_text(ch['text']),
-				'vector': vec,
-			}
-			new_entries.append(entry)
-			output[global_idx] = {**ch, 'embedding': vec}
+	cache = get_disk_cache()
+	keys = [_hash_key(model, ch['text']) for ch in chunks]
+	found = cache.get_many(keys)
+	# Cache'te olmayan benzersiz metinler (aynı metin iki kez hesaplanmaz)
+	missing: Dict[str, str] = {}
+	for key, ch in zip(keys, chunks):
+		if key not in found:
+			missing.setdefault(key, ch['text'])
+	if missing:
+		vectors = embed_texts(list(missing.values()), model=model, use_real=use_real)
+		new_entries = []
+		for key, vec in zip(missing.keys(), vectors):
+			vec = _as_float32(vec)
+			found[key] = vec
+			new_entries.append({'key': key, 'model': model, 'vector': vec})
 		append_disk_cache(new_entries)
-	# Filtre: placeholder kalmamalı
-	return [o for o in output if o is not None]
+	# Vektörü olmayan (embed edilemeyen) chunk'lar elenir
+	return [{**ch, 'embedding': found[key]} for key, ch in zip(keys, chunks) if key in found]
+
+
+def update_embeddings(
+	previous: List[Dict],
+	chunks: List[Dict],
+	model: str = 'text-embedding-004',
+	use_real: bool = False,
+) -> Dict[str, List[Dict]]:
+	"""Önceki embed edilmiş chunk'lara göre yalnız eklenen chunk'ları embed et.
+
+	`diff_chunks(previous, chunks)` ile içerik hash'i aynı kalan chunk'lar eski
+	vektörünü taşır; yalnız 'added' chunk'lar `get_or_compute_embeddings`'e
+	gider. previous aynı model ile üretilmiş olmalıdır (çağıran kontrol eder).
+
+	Dönen: {'embedded': yeni sırada chunk + embedding listesi,
+	        'added': embed edilen chunk'lar, 'removed': artık olmayan eski chunk'lar}
+	"""
+	from .chunking import diff_chunks  # local import
+
+	diff = diff_chunks(previous, chunks)
+	old_vectors = {ch.get('id'): ch.get('embedding') for ch in previous}
+	by_id: Dict[str, Dict] = {}
+	missing = list(diff['added'])
+	for ch in diff['kept']:
+		vec = old_vectors.get(ch.pop('previous_id'))
+		if vec is None:
+			missing.append(ch)
+		else:
+			by_id[ch['id']] = {**ch, 'embedding': vec}
+	for ch in get_or_compute_embeddings(missing, model=model, use_real=use_real):
+		by_id[ch['id']] = ch
+	embedded = [by_id[ch['id']] for ch in chunks if ch['id'] in by_id]
+	return {'embedded': embedded, 'added': missing, 'removed': diff['removed']}
 
 
 __all__ = [
 	'embed_texts',
 	'get_or_compute_embeddings',
-	'cosine_similarity'
+	'update_embeddings',
+	'cosine_similarity',
+	'normalized_matrix',
+	'EmbeddingDiskCache',
+	'get_disk_cache',
 ]
@@ -0,0 +1,185 @@
+"""Çok kelimeli, dile duyarlı filler (dolgu ifadesi) tespiti.
+
+`config/settings.yaml` > `filler_words` altındaki dil listeleri ("you know"
+gibi ifadeler dahil) token trie'sine derlenir. Transkriptin token dizisi tek
+geçişte taranır: her konumda trie en uzun ifadeye kadar yürünür (leftmost-
+longest, çakışmasız). Adım başına iş en uzun ifadenin kelime sayısıyla
+sınırlı olduğundan tarama O(n)'dir.
+
+Dil: çağıran verirse (ör. STT çıktısındaki `language`) o kullanılır; yoksa
+yaygın kelime sayımlarından tahmin edilir (`detect_language`).
+
+Çıktı (`analyze_fillers`): toplam / ifade bazında sayım, karakter konumları,
+dakika başına oran ve dakika kovaları (konuşma hızı sabit varsayımıyla).
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from .text_profile import TextProfile, WORD_RE, get_text_profile, lower_text
+
+DEFAULT_LANGUAGE = 'tr'
+
+DEFAULT_FILLER_WORDS: Dict[str, List[str]] = {
+    'tr': ['şey', 'yani', 'hani', 'aslında', 'işte', 'falan', 'gibi', 'efendim', 'ya', 'aynen', 'ee', 'eee', 'ıı'],
+    'en': ['um', 'uh', 'like', 'you know', 'so', 'actually', 'basically', 'well'],
+}
+
+# Dil tahmini için sık geçen kelimeler (profil sayaçları üzerinden, metin taranmaz)
+_STOPWORDS: Dict[str, Tuple[str, ...]] = {
+    'tr': ('ve', 'bir', 'bu', 'da', 'de', 'için', 'ile', 'çok', 'ne', 'olarak', 'daha', 'ama', 'şu', 'gibi', 'var', 'mi'),
+    'en': ('the', 'and', 'is', 'of', 'to', 'a', 'in', 'that', 'it', 'for', 'you', 'this', 'are', 'with', 'we', 'on'),
+}
+
+_END = ''  # trie'de ifade sonu anahtarı (token'lar boş olamaz)
+
+
+def get_filler_lists() -> Dict[str, List[str]]:
+    """settings.filler_words dil listeleri (tanımlı olmayan diller varsayılandan)."""
+    lists = {lang: list(words) for lang, words in DEFAULT_FILLER_WORDS.items()}
+    try:
+        from app.core.config import get_settings  # local import
+        cfg = get_settings().get('filler_words') or {}
+        if isinstance(cfg, dict):
+            for lang, words in cfg.items():
+                if isinstance(words, list):
+                    lists[str(lang).lower()] = [str(w) for w in words]
+    except Exception:
+        pass
+    return lists
+
+
+def _tokenize(phrase: str) -> Tuple[str, ...]:
+    return tuple(w.lower() for w in WORD_RE.findall(lower_text(phrase)))
+
+
+class FillerMatcher:
+    """Filler ifadelerinden derlenmiş token trie'si."""
+
+    def __init__(self, phrases: List[str]):
+        self.trie: Dict[str, Any] = {}
+        self.max_len = 0
+        for phrase in phrases:
+            toks = _tokenize(phrase)
+            if not toks:
+                continue
+            node = self.trie
+            for tok in toks:
+                node = node.setdefault(tok, {})
+            node[_END] = ' '.join(toks)
+            self.max_len = max(self.max_len, len(toks))
+
+    def match(self, tokens: List[str], start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int, str]]:
+        """tokens[start:end] içinde çakışmasız en uzun eşleşmeler: (ilk, son_hariç, ifade)."""
+        trie = self.trie
+        out: List[Tuple[int, int, str]] = []
+        n = len(tokens) if end is None else end
+        i = start
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            best_end, best = (i + 1, node[_END]) if _END in node else (i, None)
+            j = i + 1
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    best_end, best = j, node[_END]
+            if best is None:
+                i += 1
+                continue
+            out.append((i, best_end, best))
+            i = best_end
+        return out
+
+
+@lru_cache(maxsize=16)
+def _compiled(phrases: Tuple[str, ...]) -> FillerMatcher:
+    return FillerMatcher(list(phrases))
+
+
+def get_filler_matcher(phrases: List[str]) -> FillerMatcher:
+    """Aynı ifade listesi için süreç genelinde bir kez derlenen matcher."""
+    return _compiled(tuple(phrases))
+
+
+def detect_language(profile: TextProfile, languages: Optional[List[str]] = None) -> str:
+    """Sık kelime sayımlarına göre en olası dil (eşitlik/boş metinde DEFAULT_LANGUAGE)."""
+    best, best_hits = DEFAULT_LANGUAGE, 0
+    for lang in languages or list(_STOPWORDS):
+        words = _STOPWORDS.get(lang)
+        if not words:
+            continue
+        hits = sum(profile.counts.get(w, 0) for w in words)
+        if hits > best_hits:
+            best, best_hits = lang, hits
+    return best
+
+
+def analyze_fillers(
+    text: str = '',
+    duration_minutes: Optional[float] = None,
+    language: Optional[str] = None,
+    fillers: Optional[List[str]] = None,
+    profile: Optional[TextProfile] = None,
+    positions: bool = True,
+) -> Dict[str, Any]:
+    """Filler ifadelerini say, konumlarını ve dakika başı oranlarını çıkar.
+
+    fillers verilirse dil listesi yerine o kullanılır (language='custom').
+    duration_minutes yoksa oranlar hesaplanmaz (None).
+    """
+    prof = profile if profile is not None else get_text_profile(text)
+    if fillers is not None:
+        lang = 'custom'
+        phrases = list(fillers)
+    else:
+        lists = get_filler_lists()
+        lang = (language or '').lower().split('-')[0] or detect_language(prof, list(lists))
+        phrases = lists.get(lang) or lists.get(DEFAULT_LANGUAGE) or []
+    found = get_filler_matcher(phrases).match(prof.tokens)
+
+    counts: Dict[str, int] = {}
+    for _, _, phrase in found:
+        counts[phrase] = counts.get(phrase, 0) + 1
+    total = len(found)
+    words = prof.word_count
+    result: Dict[str, Any] = {
+        'language': lang,
+        'count': total,
+        'filler_words': sum(e - s for s, e, _ in found),
+        'counts': dict(sorted(counts.items(), key=lambda kv: -kv[1])),
+        'per_minute': None,
+        'by_minute': [],
+        'positions': [],
+    }
+    if duration_minutes and duration_minutes > 0:
+        result['per_minute'] = total / duration_minutes
+        # Kelime sırası -> zaman (sabit konuşma hızı varsayımı)
+        buckets = [0] * max(1, int(-(-duration_minutes // 1)))
+        for s, _, _ in found:
+            minute = int(s / words * duration_minutes) if words else 0
+            buckets[min(minute, len(buckets) - 1)] += 1
+        result['by_minute'] = buckets
+    if positions and found:
+        spans = prof.word_spans
+        result['positions'] = [
+            {'phrase': phrase, 'word_index': s, 'start': spans[s][0], 'end': spans[e - 1][1]}
+            for s, e, phrase in found
+        ]
+    return result
+
+
+__all__ = [
+    'FillerMatcher',
+    'analyze_fillers',
+    'detect_language',
+    'get_filler_lists',
+    'get_filler_matcher',
+    'DEFAULT_FILLER_WORDS',
+]
@@ -19,10 +19,26 @@ compare_runs(run_a, run_b) çıktısı:
       'avg_delta': 0.01
   }
 }
+
+compare_many(run_ids, baseline='first') çok sayıda run'ı tek seferde
+karşılaştırır: skorlar run × metrik matrisine çevrilir (eksik = NaN), delta,
+yön sayıları, sıralama (rank) değişimleri ve yüzdelikler numpy dizi
+işlemleriyle hesaplanır. Detaylar `storage.fetch_runs_details_bulk` ile küme
+sorgularıyla çekilir.
 """
 from __future__ import annotations
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+try:  # opsiyonel bağımlılık
+    import numpy as np  # type: ignore
+    _NUMPY = True
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+    _NUMPY = False
+
+_EPS = 1e-9
+BASELINES = ('first', 'previous', 'mean')
 
 
 def _index_metrics(run: Dict[str, Any]) -> Dict[tuple, Dict[str, Any]]:
@@ -98,4 +114,165 @@ def compare_runs(run_a: Dict[str, Any], run_b: Dict[str, Any]) -> Dict[str, Any]
     }
 
 
-__all__ = ['compare_runs']
+def _score_matrix(runs: List[Dict[str, Any]]):
+    """Run detaylarını (n_run × n_metrik) skor matrisine çevir; eksik hücre NaN."""
+    indexed = [_index_metrics(r) for r in runs]
+    keys = sorted({k for idx in indexed for k in idx}, key=lambda k: (str(k[0]), str(k[1])))
+    col = {k: j for j, k in enumerate(keys)}
+    mat = np.full((len(runs), len(keys)), np.nan, dtype=np.float64)
+    for i, idx in enumerate(indexed):
+        for k, m in idx.items():
+            mat[i, col[k]] = float(m['score'])
+    return keys, mat
+
+
+def _column_ranks(mat):
+    """Kolon bazında rank (1 = en yüksek skor, eşitlerde en iyi rank) ve yüzdelik.
+
+    Tüm kolonlar tek sıralı diziye (kolon ofsetli anahtarlar) yerleştirilip tek
+    searchsorted çağrısıyla çözülür; kolon başına döngü yok. Yüzdelik 'mean'
+    tanımıdır: 100 * (küçük + 0.5 * eşit) / geçerli_sayı. NaN hücre -> NaN.
+    """
+    n, m = mat.shape
+    valid = ~np.isnan(mat)
+    ranks = np.full(mat.shape, np.nan)
+    pct = np.full(mat.shape, np.nan)
+    if not valid.any():
+        return ranks, pct
+    lo = np.nanmin(mat)
+    span = float(np.nanmax(mat) - lo) + 1.0
+    keys = (mat - lo) + np.arange(m, dtype=np.float64) * span
+    counts = valid.sum(axis=0)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    vk = keys[valid]
+    sorted_keys = np.sort(vk)  # ofset sayesinde kolonlar ardışık bloklar
+    cols = np.nonzero(valid)[1]
+    less = np.searchsorted(sorted_keys, vk, side='left') - starts[cols]
+    less_eq = np.searchsorted(sorted_keys, vk, side='right') - starts[cols]
+    cnt = counts[cols]
+    ranks[valid] = cnt - less_eq + 1
+    pct[valid] = 100.0 * (less + 0.5 * (less_eq - less)) / cnt
+    return ranks, pct
+
+
+def _baseline_index(run_ids: List[int], baseline: Union[str, int]):
+    """Her run için baz run satır indeksi (-1: kolon ortalaması, 'mean')."""
+    n = len(run_ids)
+    if baseline == 'first':
+        return np.zeros(n, dtype=np.int64)
+    if baseline == 'previous':
+        return np.maximum(np.arange(n, dtype=np.int64) - 1, 0)
+    if baseline == 'mean':
+        return np.full(n, -1, dtype=np.int64)
+    if isinstance(baseline, int) and baseline in run_ids:
+        return np.full(n, run_ids.index(baseline), dtype=np.int64)
+    raise ValueError(f"Geçersiz baseline: {baseline!r} (first|previous|mean|run id)")
+
+
+def _nan_list(arr) -> List[Any]:
+    return [None if v != v else float(v) for v in arr.tolist()]
+
+
+def compare_many(
+    run_ids: Sequence[int],
+    baseline: Union[str, int] = 'first',
+    db_path: Optional[str] = None,
+    runs: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Birden çok run'ı tek çağrıda karşılaştır.
+
+    baseline:
+      - 'first'    : listedeki ilk run (varsayılan)
+      - 'previous' : her run bir önceki run'a göre (ilk run kendisine göre)
+      - 'mean'     : metrik başına tüm run'ların ortalaması
+      - <run id>   : listedeki belirli bir run
+
+    `runs` verilirse (fetch_runs_details_bulk çıktısı şekli) DB'ye gidilmez.
+    Bulunamayan run id'leri sessizce atlanır; sıralama run_ids sırasıdır.
+
+    Dönüş:
+    {
+      'run_ids': [...], 'baseline': ..., 'metrics': [{'category','name'}, ...],
+      'scores' / 'deltas' / 'ranks' / 'rank_changes' / 'percentiles':
+          run × metrik listeleri (eksik -> None),
+      'runs': [ {run_id, total_score, total_delta, total_rank, total_percentile,
+                 count_improved, count_declined, count_unchanged, avg_delta,
+                 metric_count}, ... ]
+    }
+    rank 1 = en yüksek skor; rank_change = baz rank - run rank (pozitif = yükseldi).
+    """
+    if not _NUMPY:
+        raise RuntimeError("compare_many için numpy gerekli")
+    if runs is None:
+        from app.core import storage  # local import (history saf yardımcı kalsın)
+        runs = storage.fetch_runs_details_bulk(list(run_ids), db_path=db_path)
+    by_id = {r.get('id'): r for r in runs}
+    ordered = [by_id[rid] for rid in dict.fromkeys(run_ids) if rid in by_id]
+    ids = [r.get('id') for r in ordered]
+    base_idx = _baseline_index(ids, baseline) if ids else np.zeros(0, dtype=np.int64)
+
+    keys, mat = _score_matrix(ordered)
+    totals = np.array(
+        [r.get('total_score') if isinstance(r.get('total_score'), (int, float)) else np.nan for r in ordered],
+        dtype=np.float64,
+    ).reshape(-1, 1)
+
+    # Skor + toplam kolonu birlikte sıralanır
+    ranks_all, pct_all = _column_ranks(np.hstack([mat, totals]) if ids else np.zeros((0, len(keys) + 1)))
+    ranks, total_rank = ranks_all[:, :-1], ranks_all[:, -1]
+    pct, total_pct = pct_all[:, :-1], pct_all[:, -1]
+
+    use_mean = base_idx < 0
+    safe_idx = np.where(use_mean, 0, base_idx)
+    with np.errstate(all='ignore'):
+        col_mean = np.nanmean(mat, axis=0) if ids else np.zeros(len(keys))
+        total_mean = np.nanmean(totals[:, 0]) if ids else np.nan
+    if ids:
+        base_scores = np.where(use_mean[:, None], col_mean[None, :], mat[safe_idx])
+        base_total = np.where(use_mean, total_mean, totals[safe_idx, 0])
+        base_ranks = np.where(use_mean[:, None], np.nan, ranks[safe_idx])
+    else:
+        base_scores = mat
+        base_total = totals[:, 0]
+        base_ranks = ranks
+    deltas = mat - base_scores
+    total_delta = totals[:, 0] - base_total
+    rank_changes = base_ranks - ranks
+
+    present = ~np.isnan(deltas)
+    improved = (deltas > _EPS).sum(axis=1)
+    declined = (deltas < -_EPS).sum(axis=1)
+    metric_count = present.sum(axis=1)
+    unchanged = metric_count - improved - declined
+    with np.errstate(all='ignore'):
+        avg_delta = np.where(metric_count > 0, np.nansum(deltas, axis=1) / np.maximum(metric_count, 1), 0.0)
+
+    run_rows: List[Dict[str, Any]] = []
+    for i, rid in enumerate(ids):
+        tot = totals[i, 0]
+        run_rows.append({
+            'run_id': rid,
+            'total_score': None if tot != tot else float(tot),
+            'total_delta': None if total_delta[i] != total_delta[i] else float(total_delta[i]),
+            'total_rank': None if total_rank[i] != total_rank[i] else int(total_rank[i]),
+            'total_percentile': None if total_pct[i] != total_pct[i] else float(total_pct[i]),
+            'count_improved': int(improved[i]),
+            'count_declined': int(declined[i]),
+            'count_unchanged': int(unchanged[i]),
+            'avg_delta': float(avg_delta[i]),
+            'metric_count': int(metric_count[i]),
+        })
+    return {
+        'run_ids': ids,
+        'baseline': baseline,
+        'metrics': [{'category': k[0], 'name': k[1]} for k in keys],
+        'scores': [_nan_list(row) for row in mat],
+        'deltas': [_nan_list(row) for row in deltas],
+        'ranks': [_nan_list(row) for row in ranks],
+        'rank_changes': [_nan_list(row) for row in rank_changes],
+        'percentiles': [_nan_list(row) for row in pct],
+        'runs': run_rows,
+    }
+
+
+__all__ = ['compare_runs', 'compare_many', 'BASELINES']
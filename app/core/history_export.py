@@ -0,0 +1,227 @@
+"""Run geçmişinin kolon bazlı (Parquet / Arrow IPC) dışa aktarımı.
+
+SQLite'daki runs / topics / metrics tabloları id sırasıyla sabit boyutlu
+partiler halinde okunur ve pyarrow.dataset ile ay + materyal bölümlü
+(hive: month=YYYY-MM/material=...) dosyalara akıtılır. Bellek kullanımı
+toplam geçmişten değil parti boyundan etkilenir.
+
+Çıktı düzeni:
+  <out_dir>/runs/month=2025-01/material=ders.pdf/part-0.parquet
+  <out_dir>/topics/...
+  <out_dir>/metrics/...
+
+Loader fonksiyonları aynı dosyalardan doğrudan pandas DataFrame üretir;
+çok yıllık analizler SQLite'a hiç dokunmaz.
+
+pyarrow opsiyoneldir; yoksa fonksiyonlar RuntimeError fırlatır.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import storage
+
+try:  # opsiyonel bağımlılık
+    import pyarrow as pa  # type: ignore
+    import pyarrow.dataset as ds  # type: ignore
+    _ARROW = True
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    ds = None  # type: ignore
+    _ARROW = False
+
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}
+PARTITION_COLS = ["month", "material"]
+
+# Ay/materyal kolonları runs + materials join'i ile her tabloya eklenir
+_PARTITION_SELECT = (
+    "COALESCE(strftime('%Y-%m', r.created_at), 'unknown') AS month, "
+    "COALESCE(m.filename, '') AS material"
+)
+_RUN_JOIN = "LEFT JOIN materials m ON m.id = r.material_id"
+
+_TABLES: Dict[str, Dict[str, Any]] = {
+    "runs": {
+        "sql": (
+            "SELECT r.id, r.material_id, r.created_at, r.coverage_score, r.delivery_score, "
+            "r.pedagogy_score, r.total_score, r.weights_json, " + _PARTITION_SELECT + " "
+            "FROM runs r " + _RUN_JOIN
+        ),
+        "key": "r.id",
+        "fields": [
+            ("id", "int64"), ("material_id", "int64"), ("created_at", "string"),
+            ("coverage_score", "float64"), ("delivery_score", "float64"),
+            ("pedagogy_score", "float64"), ("total_score", "float64"), ("weights_json", "string"),
+        ],
+    },
+    "topics": {
+        "sql": (
+            "SELECT t.id, t.run_id, t.topic, t.status, t.similarity, " + _PARTITION_SELECT + " "
+            "FROM topics t JOIN runs r ON r.id = t.run_id " + _RUN_JOIN
+        ),
+        "key": "t.id",
+        "fields": [
+            ("id", "int64"), ("run_id", "int64"), ("topic", "string"),
+            ("status", "string"), ("similarity", "float64"),
+        ],
+    },
+    "metrics": {
+        "sql": (
+            "SELECT x.id, x.run_id, x.category, x.name, x.raw_value, x.score, x.extra_json, "
+            + _PARTITION_SELECT + " "
+            "FROM metrics x JOIN runs r ON r.id = x.run_id " + _RUN_JOIN
+        ),
+        "key": "x.id",
+        "fields": [
+            ("id", "int64"), ("run_id", "int64"), ("category", "string"), ("name", "string"),
+            ("raw_value", "float64"), ("score", "float64"), ("extra_json", "string"),
+        ],
+    },
+}
+
+
+def _require_arrow() -> None:
+    if not _ARROW:
+        raise RuntimeError("pyarrow kurulu değil (pip install pyarrow)")
+
+
+def _schema(table: str):
+    fields = _TABLES[table]["fields"] + [("month", "string"), ("material", "string")]
+    return pa.schema([(name, getattr(pa, typ)()) for name, typ in fields])
+
+
+def _iter_batches(table: str, batch_size: int, since_month: Optional[str], db_path: Optional[str]) -> Iterator[Any]:
+    """Tabloyu id keyset'i ile parti parti okuyup RecordBatch üret."""
+    spec = _TABLES[table]
+    schema = _schema(table)
+    conn = storage.get_engine(db_path).connection()
+    cond = f"{spec['key']} > ?"
+    if since_month:
+        cond += " AND strftime('%Y-%m', r.created_at) >= ?"
+    sql = f"{spec['sql']} WHERE {cond} ORDER BY {spec['key']} LIMIT ?"
+    last_id = 0
+    while True:
+        params: List[Any] = [last_id]
+        if since_month:
+            params.append(since_month)
+        params.append(batch_size)
+        rows = conn.execute(sql, params).fetchall()
+        if not rows:
+            return
+        cols = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(cols, schema)],
+            schema=schema,
+        )
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1][0]
+
+
+def export_history(
+    out_dir: str,
+    fmt: str = "parquet",
+    batch_size: int = 5000,
+    since_month: Optional[str] = None,
+    tables: Optional[List[str]] = None,
+    db_path: Optional[str] = None,
+) -> Dict[str, int]:
+    """runs/topics/metrics tablolarını bölümlü kolon dosyalarına aktar.
+
+    since_month ('YYYY-MM') verilirse yalnız o ay ve sonrası yazılır; yazılan
+    bölümler tamamen yenilenir (delete_matching), diğerlerine dokunulmaz.
+    Dönüş: tablo başına aktarılan satır sayısı.
+    """
+    _require_arrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Geçersiz format: {fmt}")
+    batch_size = max(1, int(batch_size))
+    counts: Dict[str, int] = {}
+    for table in tables or list(_TABLES):
+        schema = _schema(table)
+        counter = {"rows": 0}
+
+        def _counted(batches):
+            for b in batches:
+                counter["rows"] += b.num_rows
+                yield b
+
+        batches = _counted(_iter_batches(table, batch_size, since_month, db_path))
+        ds.write_dataset(
+            batches,
+            f"{out_dir}/{table}",
+            schema=schema,
+            format=FORMATS[fmt],
+            partitioning=ds.partitioning(
+                pa.schema([("month", pa.string()), ("material", pa.string())]), flavor="hive"
+            ),
+            basename_template="part-{i}." + ("parquet" if fmt == "parquet" else "arrow"),
+            existing_data_behavior="delete_matching",
+            max_rows_per_group=batch_size,
+        )
+        counts[table] = counter["rows"]
+    return counts
+
+
+def _load(
+    table: str,
+    base_dir: str,
+    fmt: str,
+    material: Optional[str],
+    since_month: Optional[str],
+    columns: Optional[List[str]],
+):
+    _require_arrow()
+    dataset = ds.dataset(
+        f"{base_dir}/{table}",
+        format=FORMATS[fmt],
+        partitioning=ds.partitioning(
+            pa.schema([("month", pa.string()), ("material", pa.string())]), flavor="hive"
+        ),
+    )
+    flt = None
+    if material is not None:
+        flt = ds.field("material") == material
+    if since_month:
+        cond = ds.field("month") >= since_month
+        flt = cond if flt is None else (flt & cond)
+    return dataset.to_table(columns=columns, filter=flt).to_pandas()
+
+
+def load_runs_dataframe(
+    base_dir: str,
+    fmt: str = "parquet",
+    material: Optional[str] = None,
+    since_month: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+):
+    """Dışa aktarılmış runs dosyalarından DataFrame (id sıralı).
+
+    Bölüm filtresi (material / since_month) dosya düzeyinde uygulanır; eşleşmeyen
+    bölümler okunmaz. `filename` kolonu fetch_recent_runs çıktısıyla uyum için eklenir.
+    """
+    df = _load("runs", base_dir, fmt, material, since_month, columns)
+    if "material" in df.columns and "filename" not in df.columns:
+        df["filename"] = df["material"]
+    if "id" in df.columns:
+        df = df.sort_values("id").reset_index(drop=True)
+    return df
+
+
+def load_metrics_dataframe(
+    base_dir: str,
+    fmt: str = "parquet",
+    material: Optional[str] = None,
+    since_month: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+):
+    """Dışa aktarılmış metrics dosyalarından DataFrame (uzun format)."""
+    return _load("metrics", base_dir, fmt, material, since_month, columns)
+
+
+__all__ = [
+    "export_history",
+    "load_runs_dataframe",
+    "load_metrics_dataframe",
+    "FORMATS",
+]
@@ -3,6 +3,7 @@ PDF/TXT okuma, normalize etme ve temel meta üretimi.
 
 Fonksiyonlar:
 	read_pdf(file_bytes: bytes) -> str
+	iter_pdf_pages(file_bytes: bytes, max_workers=None) -> Iterator[(page_no, text)]
 	read_txt(file_bytes: bytes) -> str
 	normalize_text(text: str) -> str
 	basic_text_stats(text: str) -> dict
@@ -12,39 +13,206 @@ Not: Chunking bu modülde değil; ayrı adımda (chunking & index) eklenecek.
 
 from __future__ import annotations
 
-from io import BytesIO
-from typing import Dict
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+from typing import Dict, Iterator, List, Optional, Tuple
 import re
 
 
-def read_pdf(file_bytes: bytes) -> str:
-	"""Önce pdfminer.six ile dene; hata durumunda PyPDF2 fallback.
-	Dönen değer ham (normalize edilmemiş) metindir.
+_PDF_CACHE_DIR = os.path.join('.cache', 'pdf_text')
+_PAGES_PER_TASK = 8
+_PARALLEL_MIN_PAGES = 16
+
+# Process pool worker'ında tutulan PDF bytes (initializer ile bir kez aktarılır)
+_WORKER_PDF: Optional[bytes] = None
+
+
+def compute_document_hash(file_bytes: bytes) -> str:
+	return hashlib.sha256(file_bytes).hexdigest()
+
+
+def _pdfminer_pages(file_bytes: bytes, page_numbers: Optional[List[int]] = None) -> Iterator[Tuple[int, str]]:
+	"""Dokümanı tek kez parse edip sayfa sayfa (page_no, text) üret.
+
+	page_numbers verilirse sadece o sayfalar (doküman sırasıyla) işlenir.
 	"""
-	text = ""
-	bio = BytesIO(file_bytes)
-	# pdfminer
+	from pdfminer.converter import TextConverter  # type: ignore
+	from pdfminer.layout import LAParams  # type: ignore
+	from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager  # type: ignore
+	from pdfminer.pdfpage import PDFPage  # type: ignore
+
+	wanted = sorted(set(page_numbers)) if page_numbers is not None else None
+	rsrc = PDFResourceManager()
+	laparams = LAParams()
+	pages = PDFPage.get_pages(BytesIO(file_bytes), set(wanted) if wanted is not None else None)
+	for i, page in enumerate(pages):
+		page_no = wanted[i] if wanted is not None else i
+		out = StringIO()
+		device = TextConverter(rsrc, out, laparams=laparams)
+		try:
+			PDFPageInterpreter(rsrc, device).process_page(page)
+			text = out.getvalue()
+		except Exception:
+			text = ""
+		finally:
+			device.close()
+		yield page_no, text.rstrip("\x0c")
+
+
+def _pypdf2_page(reader, page_no: int) -> str:
+	try:
+		return reader.pages[page_no].extract_text() or ""
+	except Exception:
+		return ""
+
+
+def _open_pypdf2(file_bytes: bytes):
+	try:
+		import PyPDF2  # type: ignore
+		return PyPDF2.PdfReader(BytesIO(file_bytes))
+	except Exception:
+		return None
+
+
+def _extract_pages(file_bytes: bytes, page_numbers: Optional[List[int]] = None) -> Iterator[Tuple[int, str]]:
+	"""pdfminer ile sayfa sayfa çıkar; boş/hatalı sayfalar için PyPDF2 fallback (sayfa bazlı)."""
+	reader = None
+	done = set()
 	try:
-		from pdfminer.high_level import extract_text  # type: ignore
-		text = extract_text(bio) or ""
+		for page_no, text in _pdfminer_pages(file_bytes, page_numbers):
+			if not text.strip():
+				if reader is None:
+					reader = _open_pypdf2(file_bytes)
+				if reader is not None:
+					text = _pypdf2_page(reader, page_no)
+			done.add(page_no)
+			yield page_no, text
+		return
 	except Exception:
-		text = ""
-	if not text.strip():
-		# Fallback PyPDF2
+		# pdfminer yok veya dokümanı açamadı: kalan sayfalar PyPDF2 ile
+		pass
+	reader = reader or _open_pypdf2(file_bytes)
+	if reader is None:
+		return
+	numbers = page_numbers if page_numbers is not None else range(len(reader.pages))
+	for page_no in numbers:
+		if page_no not in done:
+			yield page_no, _pypdf2_page(reader, page_no)
+
+
+def count_pdf_pages(file_bytes: bytes) -> int:
+	reader = _open_pypdf2(file_bytes)
+	if reader is not None:
 		try:
-			import PyPDF2  # type: ignore
-			bio.seek(0)
-			reader = PyPDF2.PdfReader(bio)
-			pages = []
-			for page in reader.pages:
+			return len(reader.pages)
+		except Exception:
+			pass
+	try:
+		from pdfminer.pdfpage import PDFPage  # type: ignore
+		return sum(1 for _ in PDFPage.get_pages(BytesIO(file_bytes)))
+	except Exception:
+		return 0
+
+
+def _init_worker(file_bytes: bytes) -> None:
+	global _WORKER_PDF
+	_WORKER_PDF = file_bytes
+
+
+def _extract_range_worker(page_numbers: List[int]) -> List[str]:
+	texts = dict(_extract_pages(_WORKER_PDF or b"", page_numbers))
+	return [texts.get(p, "") for p in page_numbers]
+
+
+def _cache_path(doc_hash: str) -> str:
+	return os.path.join(_PDF_CACHE_DIR, f"{doc_hash}.json")
+
+
+def _load_cached_pages(doc_hash: str) -> Optional[List[str]]:
+	path = _cache_path(doc_hash)
+	if not os.path.exists(path):
+		return None
+	try:
+		with open(path, 'r', encoding='utf-8') as f:
+			pages = json.load(f)
+		return pages if isinstance(pages, list) else None
+	except Exception:
+		return None
+
+
+def _store_cached_pages(doc_hash: str, pages: List[str]) -> None:
+	try:
+		os.makedirs(_PDF_CACHE_DIR, exist_ok=True)
+		tmp = _cache_path(doc_hash) + '.tmp'
+		with open(tmp, 'w', encoding='utf-8') as f:
+			json.dump(pages, f, ensure_ascii=False)
+		os.replace(tmp, _cache_path(doc_hash))
+	except Exception:
+		pass
+
+
+def iter_pdf_pages(
+	file_bytes: bytes,
+	max_workers: Optional[int] = None,
+	use_cache: bool = True,
+) -> Iterator[Tuple[int, str]]:
+	"""PDF sayfalarını sırayla (page_no, text) olarak üret.
+
+	- Doküman hash'i cache'te varsa sayfalar diskten anında döner.
+	- max_workers > 1 ve sayfa sayısı yeterliyse sayfa aralıkları process
+	  havuzuna dağıtılır; sonuçlar yine sayfa sırasıyla, hazır oldukça yield edilir.
+	- Aksi halde doküman tek parse ile seri olarak akıtılır.
+	Hata veren aralık seri olarak yeniden denenir; yine başarısızsa sayfalar boş
+	döner. Tüm sayfalar bittiğinde sonuç cache'e yazılır (yarım sonuç cache'lenmez).
+	"""
+	doc_hash = compute_document_hash(file_bytes)
+	if use_cache:
+		cached = _load_cached_pages(doc_hash)
+		if cached is not None:
+			yield from enumerate(cached)
+			return
+
+	pages: List[str] = []
+	failed = False
+	n_pages = count_pdf_pages(file_bytes) if max_workers and max_workers > 1 else 0
+	if n_pages >= _PARALLEL_MIN_PAGES:
+		ranges = [list(range(i, min(i + _PAGES_PER_TASK, n_pages))) for i in range(0, n_pages, _PAGES_PER_TASK)]
+		with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(file_bytes,)) as pool:
+			futures = [pool.submit(_extract_range_worker, r) for r in ranges]
+			for rng, fut in zip(ranges, futures):
 				try:
-					pages.append(page.extract_text() or "")
+					texts = fut.result()
 				except Exception:
-					continue
-			text = "\n".join(pages)
-		except Exception:
-			return ""
-	return text or ""
+					# worker çöktü: aralık bu süreçte seri olarak yeniden denenir
+					try:
+						got = dict(_extract_pages(file_bytes, rng))
+						texts = [got.get(p, "") for p in rng]
+					except Exception:
+						texts = [""] * len(rng)
+						failed = True
+				for page_no, text in zip(rng, texts):
+					pages.append(text)
+					yield page_no, text
+	else:
+		for page_no, text in _extract_pages(file_bytes):
+			pages.append(text)
+			yield page_no, text
+
+	if use_cache and not failed and any(p.strip() for p in pages):
+		_store_cached_pages(doc_hash, pages)
+
+
+def read_pdf(file_bytes: bytes, max_workers: Optional[int] = None) -> str:
+	"""PDF metnini sayfa bazlı pipeline ile çıkar (pdfminer, sayfa bazlı PyPDF2 fallback).
+	Dönen değer ham (normalize edilmemiş) metindir; sayfalar newline ile birleştirilir.
+	"""
+	try:
+		return "\n".join(text for _, text in iter_pdf_pages(file_bytes, max_workers=max_workers))
+	except Exception:
+		return ""
 
 
 def read_txt(file_bytes: bytes) -> str:
@@ -0,0 +1,251 @@
+"""Canlı ders için artımlı (streaming) delivery + pedagogy metrikleri.
+
+`StreamingTranscriber` her commit'te yalnız yeni metni (`new_text`) verir.
+`compute_*_metrics`'i her seferinde tüm transkript üzerinde çalıştırmak uzun
+derste karesel maliyet demektir. `LiveMetrics` delta'ları tüketir ve şu
+durumu tutar:
+
+ - kelime sayısı + token sayaçları (unique kelime kümesi `counts` anahtarları)
+ - açık cümle tamponu; tamamlanan cümle sayısı ve pause işaretleri
+ - filler eşleşmeleri (`FillerMatcher`, ifade sınırını aşan son token'lar taşınır)
+ - pedagogy kategori sayaçları (`PatternMatcher`, yalnız tamamlanan cümleler)
+
+Commit noktası delta'daki son boşluk dizisinin başıdır: yarım kelime ve
+bitişindeki boşluklar bir sonraki delta'ya kalır; böylece kelime, '...' ve
+boş satır işaretleri parçalara bölünmez. feed() maliyeti O(delta + en uzun
+filler ifadesi + açık cümle) kadardır.
+
+`delivery()` / `pedagogy()` o ana kadarki metnin skorlarını
+`compute_delivery_metrics` / `compute_pedagogy_metrics` ile aynı dict
+yapısında döndürür (ortak `score_*` fonksiyonları). Commit edilmemiş kuyruk
+ve açık cümle durumu değiştirmeden hesaba katılır; sonuç aynı metin üzerinde
+toplu hesapla aynıdır (dil tahmini hariç, bkz. LiveMetrics).
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .delivery import resolve_config as resolve_delivery_config, score_delivery
+from .fillers import DEFAULT_LANGUAGE, FillerMatcher, detect_language, get_filler_lists, get_filler_matcher
+from .pedagogy import get_matcher, resolve_config as resolve_pedagogy_config, score_pedagogy
+from .text_profile import _NEWLINES_RE, _PAUSE_RE, SENT_SPLIT_RE, WORD_RE, lower_text
+
+# Dil verilmediyse bu kadar kelime commit edilince tahmin edilip sabitlenir
+_DETECT_MIN_WORDS = 50
+
+
+def _commit_point(text: str) -> int:
+    """Son boşluk dizisinin başlangıcı (0: commit edilecek bir şey yok)."""
+    i = len(text)
+    while i and not text[i - 1].isspace():
+        i -= 1
+    while i and text[i - 1].isspace():
+        i -= 1
+    return i
+
+
+def _pause_count(text: str) -> int:
+    return len(_PAUSE_RE.findall(text)) + text.count('\n\n')
+
+
+def _scan(chunk: str, last: str, open_: str) -> Tuple[List[str], List[str], str]:
+    """chunk'ın token'ları, tamamladığı cümleler ve yeni açık cümle metni.
+
+    last: önceki parçanın son karakteri (cümle ayracının lookbehind'i için).
+    """
+    tokens = WORD_RE.findall(lower_text(chunk))
+    sentences: List[str] = []
+    shift = len(last)
+    pos = 0
+    for m in SENT_SPLIT_RE.finditer(last + chunk):
+        piece = (open_ + chunk[pos:m.start() - shift]).strip()
+        if piece:
+            sentences.append(_NEWLINES_RE.sub(' ', piece))
+        open_ = ''
+        pos = m.end() - shift
+    return tokens, sentences, open_ + chunk[pos:]
+
+
+def _match_stream(matcher: FillerMatcher, tokens: List[str], final: bool) -> Tuple[List[Tuple[int, int, str]], int]:
+    """Kesinleşen filler eşleşmeleri ve tüketilen token sayısı.
+
+    final değilse son max_len-1 konumdan başlayan eşleşmeler gelecek token'larla
+    uzayabilir; bu konumlar (ve üzerlerine taşan eşleşme sonrası) taşınır.
+    """
+    n = len(tokens)
+    limit = n if final else n - max(matcher.max_len - 1, 0)
+    if limit <= 0:
+        return [], 0
+    found = [m for m in matcher.match(tokens) if m[0] < limit]
+    return found, max(limit, found[-1][1]) if found else limit
+
+
+class LiveTextProfile:
+    """TextProfile'ın artımlı karşılığı: yalnız sayımlar (metin saklanmaz)."""
+
+    __slots__ = ('word_count', 'counts', 'sentence_count', 'pause_markers', '_pending', '_open', '_last')
+
+    def __init__(self):
+        self.word_count = 0
+        self.counts: Counter = Counter()
+        self.sentence_count = 0
+        self.pause_markers = 0
+        self._pending = ''  # commit edilmemiş kuyruk: son boşluk dizisi + yarım kelime
+        self._open = ''     # açık cümlenin commit edilmiş kısmı
+        self._last = ''     # commit edilen son karakter
+
+    @property
+    def unique_words(self) -> int:
+        return len(self.counts)
+
+    def feed(self, delta: str) -> Tuple[List[str], List[str]]:
+        """delta'yı ekle; commit edilen (token'lar, tamamlanan cümleler)."""
+        text = self._pending + (delta or '')
+        cut = _commit_point(text)
+        if cut <= 0:
+            self._pending = text
+            return [], []
+        chunk, self._pending = text[:cut], text[cut:]
+        tokens, sentences, self._open = _scan(chunk, self._last, self._open)
+        self._last = chunk[-1]
+        self.word_count += len(tokens)
+        self.counts.update(tokens)
+        self.sentence_count += len(sentences)
+        self.pause_markers += _pause_count(chunk)
+        return tokens, sentences
+
+    def tail(self) -> Tuple[List[str], List[str], int]:
+        """Kuyruğun katkısı (durum değişmez): token'lar, cümleler (açık cümle dahil), pause işaretleri."""
+        tokens, sentences, rest = _scan(self._pending, self._last, self._open)
+        rest = rest.strip()
+        if rest:
+            sentences.append(_NEWLINES_RE.sub(' ', rest))
+        return tokens, sentences, _pause_count(self._pending)
+
+
+class LiveMetrics:
+    """Commit edilen transkript delta'larından canlı delivery / pedagogy skorları.
+
+    language verilmezse filler dili ilk `_DETECT_MIN_WORDS` kelimeden tahmin
+    edilip sabitlenir (toplu hesap tüm metinden tahmin eder). fillers verilirse
+    dil listesi yerine o kullanılır.
+    """
+
+    def __init__(
+        self,
+        delivery_config: Optional[Dict] = None,
+        pedagogy_config: Optional[Dict] = None,
+        language: Optional[str] = None,
+        fillers: Optional[List[str]] = None,
+    ):
+        self.delivery_cfg = resolve_delivery_config(delivery_config)
+        self.pedagogy_cfg = resolve_pedagogy_config(pedagogy_config)
+        self.profile = LiveTextProfile()
+        self._filler_lists = get_filler_lists()
+        self.language: Optional[str] = None
+        self._filler_matcher: Optional[FillerMatcher] = None
+        if fillers:
+            self._set_language('custom', list(fillers))
+        elif language:
+            self._set_language(language.lower().split('-')[0])
+        self._carry: List[str] = []  # filler taraması kesinleşmemiş token'lar
+        self._carry_start = 0        # _carry[0]'ın kelime indeksi
+        self.filler_counts: Counter = Counter()
+        self.filler_words = 0
+        self._filler_starts: List[int] = []
+        self._pattern_matcher = get_matcher(self.pedagogy_cfg.get('patterns'))
+        self.category_counts: Dict[str, int] = {k: 0 for k in self.pedagogy_cfg['targets']}
+
+    def _phrases(self, lang: str) -> List[str]:
+        lists = self._filler_lists
+        return lists.get(lang) or lists.get(DEFAULT_LANGUAGE) or []
+
+    def _set_language(self, lang: str, phrases: Optional[List[str]] = None) -> None:
+        self.language = lang
+        self._filler_matcher = get_filler_matcher(phrases if phrases is not None else self._phrases(lang))
+
+    def _count_categories(self, sentences: List[str], into: Dict[str, int]) -> None:
+        if not sentences:
+            return
+        lower = [lower_text(s) for s in sentences]
+        hits, _ = self._pattern_matcher.classify(lower)
+        questions = hits.setdefault('questions', set())
+        questions.update(i for i, s in enumerate(lower) if s.endswith('?'))
+        for k in into:
+            into[k] += len(hits.get(k, ()))
+
+    def feed(self, delta: str) -> None:
+        """Commit edilmiş yeni metni (ör. StreamingTranscriber `new_text`) tüket."""
+        tokens, sentences = self.profile.feed(delta)
+        self._count_categories(sentences, self.category_counts)
+        if not tokens:
+            return
+        self._carry.extend(tokens)
+        if self._filler_matcher is None:
+            if self.profile.word_count < _DETECT_MIN_WORDS:
+                return
+            self._set_language(detect_language(self.profile, list(self._filler_lists)))  # type: ignore[arg-type]
+        found, consumed = _match_stream(self._filler_matcher, self._carry, final=False)  # type: ignore[arg-type]
+        for s, e, phrase in found:
+            self.filler_counts[phrase] += 1
+            self.filler_words += e - s
+            self._filler_starts.append(self._carry_start + s)
+        del self._carry[:consumed]
+        self._carry_start += consumed
+
+    def delivery(self, duration_minutes: Optional[float] = None) -> Dict[str, Any]:
+        """O ana kadarki metin için compute_delivery_metrics yapısında sonuç (mode='live').
+
+        duration_minutes yoksa (ör. kayıt süresi bilinmiyorsa) 150 WPM varsayılır.
+        """
+        prof = self.profile
+        tail_tokens, tail_sents, tail_pauses = prof.tail()
+        word_count = prof.word_count + len(tail_tokens)
+        unique_words = prof.unique_words + sum(1 for t in set(tail_tokens) if t not in prof.counts)
+        if not duration_minutes or duration_minutes <= 0:
+            duration_minutes = word_count / 150.0 if word_count else 0.0
+
+        matcher, lang = self._filler_matcher, self.language
+        if matcher is None:
+            lang = detect_language(prof, list(self._filler_lists))  # type: ignore[arg-type]
+            matcher = get_filler_matcher(self._phrases(lang))
+        found, _ = _match_stream(matcher, self._carry + tail_tokens, final=True)
+        counts = Counter(self.filler_counts)
+        for _, _, phrase in found:
+            counts[phrase] += 1
+        starts = self._filler_starts + [self._carry_start + s for s, _, _ in found]
+        total = len(starts)
+        filler_info: Dict[str, Any] = {
+            'language': lang,
+            'count': total,
+            'filler_words': self.filler_words + sum(e - s for s, e, _ in found),
+            'counts': dict(sorted(counts.items(), key=lambda kv: -kv[1])),
+            'per_minute': None,
+            'by_minute': [],
+            'positions': [],  # canlı modda metin saklanmaz; yalnız sayımlar
+        }
+        if duration_minutes > 0:
+            filler_info['per_minute'] = total / duration_minutes
+            buckets = [0] * max(1, int(-(-duration_minutes // 1)))
+            for s in starts:
+                minute = int(s / word_count * duration_minutes) if word_count else 0
+                buckets[min(minute, len(buckets) - 1)] += 1
+            filler_info['by_minute'] = buckets
+        return score_delivery(
+            self.delivery_cfg, word_count, unique_words, duration_minutes, filler_info,
+            prof.sentence_count + len(tail_sents), prof.pause_markers + tail_pauses, mode='live',
+        )
+
+    def pedagogy(self) -> Dict[str, Any]:
+        """O ana kadarki metin için compute_pedagogy_metrics yapısında sonuç."""
+        _, tail_sents, _ = self.profile.tail()
+        counters = dict(self.category_counts)
+        self._count_categories(tail_sents, counters)
+        return score_pedagogy(self.pedagogy_cfg, self.profile.sentence_count + len(tail_sents), counters)
+
+    def snapshot(self, duration_minutes: Optional[float] = None) -> Dict[str, Any]:
+        return {'delivery': self.delivery(duration_minutes), 'pedagogy': self.pedagogy()}
+
+
+__all__ = ['LiveMetrics', 'LiveTextProfile']
@@ -0,0 +1,276 @@
+"""Analiz veritabanı bakım işi: saklama (retention), arşivleme, sıkıştırma.
+
+`data/app.db` her kayıtta onlarca metrics/topics satırı ile büyür. Bu modül
+tablo bazında yapılandırılabilir saklama süreleri uygular:
+
+ - topics  : N günden eski run'ların topic satırları silinir
+ - metrics : N günden eski run'larda yalnız `keep_metrics` listesindeki özet
+             metrikler kalır (downsample); diğer detay satırları silinir
+ - runs    : N günden eski run'lar (topics/metrics/run_scores cascade) silinir;
+             detaysız kalan materyaller (run'ı ve chunk'ı olmayan) da temizlenir
+
+Detay kaybeden her run önce tam haliyle (fetch_runs_details_bulk çıktısı +
+filename) gzip JSONL arşiv dosyasına yazılır ve `runs.archived_at` işaretlenir;
+aynı run ikinci kez arşivlenmez. `run_rollups` değerlerine dokunulmaz; arşivlenen
+run'ların kovaları dondurulur (`storage.freeze_rollups`), böylece trend grafikleri
+arşivlenmiş dönemleri göstermeye devam eder ve `rebuild_rollups` bu kovaları
+silinmiş run'lar olmadan yeniden yazmaz.
+
+Son adımda boş sayfalar `PRAGMA incremental_vacuum` ile dosyadan atılır. DB
+auto_vacuum=INCREMENTAL değilse bir kereliğine tam VACUUM ile dönüştürülür.
+Rapor: silinen/arşivlenen sayılar, dosya boyutu (önce/sonra/kazanılan) ve
+örnek sorgu gecikmeleri (önce/sonra, ms).
+
+Ayarlar `config/settings.yaml` > `app.maintenance` altından okunur.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core import storage
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+RETENTION_TABLES = ('runs', 'metrics', 'topics')
+
+DEFAULT_MAINTENANCE_CONFIG: Dict[str, Any] = {
+    'archive_dir': 'data/archive',
+    # gün; None/0 -> o tablo için saklama kuralı kapalı
+    'retention_days': {'runs': None, 'metrics': 90, 'topics': 180},
+    'keep_metrics': ['coverage_ratio', 'delivery_score', 'pedagogy_score'],
+    'vacuum': True,
+    'batch_size': 500,
+}
+
+_TS_FMT = '%Y-%m-%d %H:%M:%S'  # CURRENT_TIMESTAMP biçimi (UTC)
+
+
+def get_maintenance_config() -> Dict[str, Any]:
+    """config/settings.yaml > app.maintenance ayarlarını varsayılanlarla birleştir."""
+    cfg = dict(DEFAULT_MAINTENANCE_CONFIG)
+    cfg['retention_days'] = dict(DEFAULT_MAINTENANCE_CONFIG['retention_days'])
+    try:
+        from app.core.config import get_settings  # local import
+        section = ((get_settings().get('app') or {}).get('maintenance')) or {}
+        if isinstance(section, dict):
+            for k, v in section.items():
+                if k == 'retention_days' and isinstance(v, dict):
+                    cfg['retention_days'].update(v)
+                elif v is not None:
+                    cfg[k] = v
+    except Exception:
+        pass
+    return cfg
+
+
+def _cutoff(days: Optional[float], now: datetime) -> Optional[str]:
+    if not days:
+        return None
+    return (now - timedelta(days=float(days))).strftime(_TS_FMT)
+
+
+def _db_bytes(db_path: str) -> int:
+    """DB + WAL dosyalarının toplam boyutu."""
+    total = 0
+    for suffix in ('', '-wal'):
+        try:
+            total += os.path.getsize(db_path + suffix)
+        except OSError:
+            pass
+    return total
+
+
+def _checkpoint(conn) -> None:
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+
+def measure_latency(db_path: Optional[str] = None, repeat: int = 5) -> Dict[str, float]:
+    """Arayüzün sık kullandığı sorguların medyan gecikmesi (ms)."""
+    def _timed(fn) -> float:
+        samples = []
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - t0) * 1000.0)
+        return statistics.median(samples)
+
+    recent_ids = [r['id'] for r in storage.fetch_recent_runs(limit=20, db_path=db_path)]
+    return {
+        'fetch_recent_runs': _timed(lambda: storage.fetch_recent_runs(limit=50, db_path=db_path)),
+        'fetch_runs_details_bulk': _timed(lambda: storage.fetch_runs_details_bulk(recent_ids, db_path=db_path)),
+        'fetch_rollups': _timed(lambda: storage.fetch_rollups('day', db_path=db_path)),
+    }
+
+
+def _archive_runs(conn, run_ids: List[int], archive_path: str, stamp: str, db_path: Optional[str]) -> int:
+    """Run'ları tam detaylarıyla gzip JSONL'e ekle ve archived_at işaretle."""
+    if not run_ids:
+        return 0
+    details = storage.fetch_runs_details_bulk(run_ids, db_path=db_path)
+    filenames: Dict[int, Any] = {}
+    for part in storage._chunked(sorted({d['material_id'] for d in details if d.get('material_id') is not None})):
+        filenames.update(conn.execute(
+            f"SELECT id, filename FROM materials WHERE id IN ({','.join('?' * len(part))})", part
+        ).fetchall())
+    os.makedirs(os.path.dirname(archive_path) or '.', exist_ok=True)
+    # 'at': her parti ayrı gzip üyesi olarak eklenir; gzip.open okurken birleştirir
+    with gzip.open(archive_path, 'at', encoding='utf-8') as fh:
+        for d in details:
+            rec = dict(d, filename=filenames.get(d.get('material_id')), archived_at=stamp)
+            fh.write(json.dumps(rec, ensure_ascii=False, default=str) + '\n')
+    conn.executemany("UPDATE runs SET archived_at = ? WHERE id = ?", [(stamp, d['id']) for d in details])
+    storage.freeze_rollups(conn)
+    return len(details)
+
+
+def iter_archive(path: str) -> Iterator[Dict[str, Any]]:
+    """Arşiv dosyasındaki run kayıtlarını sırayla oku."""
+    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _vacuum(conn) -> str:
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode != 2:  # 0 = none, 1 = full, 2 = incremental
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return 'full'
+    # execute() pragma'yı tek adım çalıştırır (tek sayfa); executescript tamamına kadar yürütür
+    conn.executescript("PRAGMA incremental_vacuum;")
+    return 'incremental'
+
+
+def run_maintenance(
+    db_path: Optional[str] = None,
+    retention_days: Optional[Dict[str, Optional[float]]] = None,
+    keep_metrics: Optional[List[str]] = None,
+    archive_dir: Optional[str] = None,
+    vacuum: Optional[bool] = None,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Saklama kurallarını uygula, arşivle, vacuum yap ve rapor döndür.
+
+    Parametre verilmeyen ayarlar `get_maintenance_config()`'ten alınır.
+    dry_run=True: yalnız etkilenecek satır sayıları hesaplanır, hiçbir şey yazılmaz.
+    """
+    cfg = get_maintenance_config()
+    retention = dict(cfg.get('retention_days') or {})
+    retention.update(retention_days or {})
+    unknown = set(retention) - set(RETENTION_TABLES)
+    if unknown:
+        raise ValueError(f"Bilinmeyen retention tablosu: {sorted(unknown)}")
+    keep = list(keep_metrics if keep_metrics is not None else cfg.get('keep_metrics') or [])
+    archive_dir = archive_dir or cfg.get('archive_dir') or 'data/archive'
+    vacuum = cfg.get('vacuum', True) if vacuum is None else vacuum
+    batch_size = max(1, int(cfg.get('batch_size') or 500))
+    now = now or datetime.now(timezone.utc)
+    cutoffs = {t: _cutoff(retention.get(t), now) for t in RETENTION_TABLES}
+
+    storage.init_db(db_path)
+    eng = storage.get_engine(db_path)
+    conn = eng.connection()
+    path = eng.db_path
+    _checkpoint(conn)
+    report: Dict[str, Any] = {
+        'dry_run': dry_run,
+        'cutoffs': cutoffs,
+        'bytes_before': _db_bytes(path),
+        'latency_before_ms': measure_latency(db_path),
+    }
+
+    keep_sql = f"name NOT IN ({','.join('?' * len(keep))})" if keep else "1 = 1"
+    detail_sql = {
+        # (etkilenen run koşulu, silinecek satır sayısı sorgusu, silme sorgusu)
+        'topics': (
+            "SELECT COUNT(*) FROM topics WHERE run_id IN (SELECT id FROM runs WHERE created_at < ?)",
+            "DELETE FROM topics WHERE run_id IN (SELECT id FROM runs WHERE created_at < ?)",
+            [],
+        ),
+        'metrics': (
+            f"SELECT COUNT(*) FROM metrics WHERE {keep_sql} AND run_id IN (SELECT id FROM runs WHERE created_at < ?)",
+            f"DELETE FROM metrics WHERE {keep_sql} AND run_id IN (SELECT id FROM runs WHERE created_at < ?)",
+            keep,
+        ),
+    }
+    active = [c for c in cutoffs.values() if c]
+    oldest_cutoff = max(active) if active else None  # en geniş etkilenen aralık
+
+    archived = 0
+    archive_path = None
+    stamp = now.strftime(_TS_FMT)
+    if oldest_cutoff:
+        pending = [r[0] for r in conn.execute(
+            "SELECT id FROM runs WHERE archived_at IS NULL AND created_at < ? ORDER BY id", (oldest_cutoff,)
+        )]
+        report['runs_to_archive'] = len(pending)
+        if pending and not dry_run:
+            archive_path = os.path.join(archive_dir, f"runs-{now.strftime('%Y%m%dT%H%M%S')}.jsonl.gz")
+            for i in range(0, len(pending), batch_size):
+                with eng.transaction():
+                    archived += _archive_runs(conn, pending[i:i + batch_size], archive_path, stamp, db_path)
+    report['archived_runs'] = archived
+    report['archive_file'] = archive_path
+
+    deleted: Dict[str, int] = {'topics': 0, 'metrics': 0, 'runs': 0, 'materials': 0}
+    with eng.transaction():
+        for table in ('topics', 'metrics'):
+            if not cutoffs[table]:
+                continue
+            count_sql, delete_sql, extra = detail_sql[table]
+            params = list(extra) + [cutoffs[table]]
+            if dry_run:
+                deleted[table] = conn.execute(count_sql, params).fetchone()[0]
+            else:
+                deleted[table] = conn.execute(delete_sql, params).rowcount
+        if cutoffs['runs']:
+            if dry_run:
+                deleted['runs'] = conn.execute(
+                    "SELECT COUNT(*) FROM runs WHERE created_at < ?", (cutoffs['runs'],)
+                ).fetchone()[0]
+            else:
+                # Arşivlenmemiş run silinmez (arşiv yazımı yarıda kaldıysa)
+                deleted['runs'] = conn.execute(
+                    "DELETE FROM runs WHERE created_at < ? AND archived_at IS NOT NULL", (cutoffs['runs'],)
+                ).rowcount
+                deleted['materials'] = conn.execute(
+                    """
+                    DELETE FROM materials WHERE id NOT IN (SELECT material_id FROM runs WHERE material_id IS NOT NULL)
+                    AND id NOT IN (SELECT material_id FROM chunks)
+                    """
+                ).rowcount
+    report['deleted'] = deleted
+
+    report['vacuum'] = None
+    if vacuum and not dry_run:
+        report['freelist_pages'] = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        report['vacuum'] = _vacuum(conn)
+        conn.execute("PRAGMA optimize")
+    _checkpoint(conn)
+    report['bytes_after'] = _db_bytes(path)
+    report['bytes_reclaimed'] = report['bytes_before'] - report['bytes_after']
+    report['latency_after_ms'] = measure_latency(db_path)
+    logger.info(
+        "DB bakımı: arşiv=%s silinen=%s kazanılan=%d bayt",
+        archived, deleted, report['bytes_reclaimed'],
+    )
+    return report
+
+
+__all__ = [
+    'run_maintenance',
+    'measure_latency',
+    'iter_archive',
+    'get_maintenance_config',
+    'RETENTION_TABLES',
+]
@@ -1,11 +1,21 @@
 """Pedagogy metrikleri hesaplama modülü.
 Heuristik dayalı oran çıkarımı ve normalizasyon.
+Cümleler ortak `TextProfile`'dan (app/core/text_profile.py) okunur.
+
+Pattern setleri kategori başına tek alternation regex'e (her pattern bir
+named group) derlenir (`PatternMatcher`); tüm cümleler tek metin üzerinde
+kategori başına bir tarama ile sınıflandırılır. Setler konfigten
+(`metrics.pedagogy.patterns`) okunabilir, süreç içinde bir kez derlenir.
 """
 from __future__ import annotations
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 import re
 import math
 
+from .text_profile import TextProfile, get_text_profile, SENT_SPLIT_RE  # noqa: F401
+
 DEFAULT_CONFIG = {
 	'targets': {
 		'examples': 0.15,
@@ -35,16 +45,123 @@ SIGNPOST_PATTERNS = [
 DEFINITION_PATTERNS = [r"tanımı", r"nedir", r"olarak tanımlanır", r"ifade edilir", r"diyebiliriz", r"denir"]
 SUMMARY_PATTERNS = [r"özetle", r"kısaca", r"toparlarsak", r"sonuç olarak", r"tekrar edelim", r"genel olarak"]
 
-SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+DEFAULT_PATTERNS = {
+	'examples': EXAMPLE_PATTERNS,
+	'questions': QUESTION_PATTERNS,
+	'signposting': SIGNPOST_PATTERNS,
+	'definitions': DEFINITION_PATTERNS,
+	'summary': SUMMARY_PATTERNS,
+}
+
+
+def _first_chars(patterns: List[str]) -> Optional[str]:
+	"""Tüm pattern'lerin olası ilk karakterleri; biri belirsizse None (ön filtre yok).
+
+	Yalnız baştaki '\\b' atlanır; sonrasındaki ilk karakter harf/rakam ve
+	ardından niceleyici gelmiyorsa kesin literaldir. '|' veya '(' içeren
+	pattern'lerde (alternation, grup, inline flag) ilk karakter belirsizdir.
+	"""
+	chars: Set[str] = set()
+	for pat in patterns:
+		if '|' in pat or '(' in pat:
+			return None
+		p = pat[2:] if pat.startswith('\\b') else pat
+		if not p or not p[0].isalnum() or (len(p) > 1 and p[1] in '?*{'):
+			return None
+		chars.add(p[0])
+	return ''.join(sorted(chars))
+
+
+class PatternMatcher:
+	"""Kategori -> pattern listesi setlerini derlenmiş alternation regex'lerine çevirir.
+
+	Her kategori tek regex'tir: (?P<p0>...)|(?P<p1>...)|... ; eşleşen grup adı
+	hangi pattern'in tuttuğunu verir. Cümleler '\n' ile birleştirilmiş tek metin
+	üzerinde taranır (MULTILINE: ^/$ cümle sınırına denk gelir), eşleşme başlangıcı
+	ikili arama ile cümle indeksine çevrilir. Sınırı aşan eşleşme (konfigten gelen
+	\\s / [^..] içeren pattern'ler) atılır, o cümle içinde (endpos ile) yeniden aranır.
+	"""
+
+	def __init__(self, pattern_sets: Dict[str, List[str]]):
+		self.patterns = {cat: list(pats) for cat, pats in pattern_sets.items()}
+		self.regexes = {}
+		for cat, pats in self.patterns.items():
+			if not pats:
+				continue
+			body = '|'.join(f"(?P<p{i}>{p})" for i, p in enumerate(pats))
+			first = _first_chars(pats)
+			if first:
+				# Olası ilk karakter lookahead'i: alternatifler yalnız bu konumlarda denenir
+				body = f"(?=[{re.escape(first)}])(?:{body})"
+			self.regexes[cat] = re.compile(body, re.MULTILINE)
+
+	def classify(
+		self,
+		sentences_lower: List[str],
+		positions: bool = False,
+	) -> Tuple[Dict[str, Set[int]], List[Dict[str, Any]]]:
+		"""Tüm cümleleri tek geçişte sınıflandır.
 
+		Dönüş: ({kategori: eşleşen cümle indeksleri}, eşleşmeler). positions=False iken
+		bir cümlede ilk eşleşmeden sonra sonraki cümleye atlanır ve eşleşme listesi boştur;
+		True iken her eşleşme {category, pattern, sentence, start, end, text} olarak döner
+		(start/end cümle metni içinde).
+		"""
+		joined = '\n'.join(sentences_lower)
+		starts: List[int] = []
+		ends: List[int] = []
+		pos = 0
+		for sent in sentences_lower:
+			starts.append(pos)
+			ends.append(pos + len(sent))
+			pos += len(sent) + 1
+		hits: Dict[str, Set[int]] = {cat: set() for cat in self.patterns}
+		matches: List[Dict[str, Any]] = []
+		for cat, rx in self.regexes.items():
+			found = hits[cat]
+			pats = self.patterns[cat]
+			pos = 0
+			while True:
+				m = rx.search(joined, pos)
+				if m is None:
+					break
+				idx = bisect_right(starts, m.start()) - 1
+				if m.end() > ends[idx]:
+					# eşleşme cümle sınırını aşıyor (\s, [^..], DOTALL '.'): yalnız bu cümlede yeniden ara
+					m = rx.search(joined, max(pos, starts[idx]), ends[idx])
+					if m is None:
+						pos = ends[idx] + 1
+						continue
+				found.add(idx)
+				if not positions:
+					pos = ends[idx] + 1
+					continue
+				matches.append({
+					'category': cat,
+					'pattern': pats[int(m.lastgroup[1:])] if m.lastgroup else None,
+					'sentence': idx,
+					'start': m.start() - starts[idx],
+					'end': m.end() - starts[idx],
+					'text': m.group(),
+				})
+				pos = m.end() if m.end() > m.start() else m.end() + 1
+		if positions:
+			matches.sort(key=lambda x: (x['sentence'], x['start']))
+		return hits, matches
 
-def _sentences(text: str) -> List[str]:
-	t = text.strip()
-	if not t:
-		return []
-	t = re.sub(r"[\r\n]+", " ", t)
-	parts = SENT_SPLIT_RE.split(t)
-	return [p.strip() for p in parts if p.strip()]
+
+@lru_cache(maxsize=32)
+def _compiled(frozen: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> PatternMatcher:
+	return PatternMatcher({cat: list(pats) for cat, pats in frozen})
+
+
+def get_matcher(patterns: Optional[Dict[str, List[str]]] = None) -> PatternMatcher:
+	"""Varsayılan setler + konfig override'ları için süreç genelinde önbellekli matcher."""
+	merged = dict(DEFAULT_PATTERNS)
+	for cat, pats in (patterns or {}).items():
+		if pats is not None:
+			merged[cat] = [pats] if isinstance(pats, str) else list(pats)
+	return _compiled(tuple(sorted((cat, tuple(pats)) for cat, pats in merged.items())))
 
 
 def _norm_score(ratio: float, target: float) -> float:
@@ -61,48 +178,27 @@ def _norm_score(ratio: float, target: float) -> float:
 	return max(0.0, 1.0 - penalty)
 
 
-def _count_matches(sent: str, patterns: List[str]) -> bool:
-	low = sent.lower()
-	for pat in patterns:
-		if re.search(pat, low):
-			return True
-	return False
-
-
-def compute_pedagogy_metrics(
-	transcript: str,
-	config: Optional[Dict] = None,
-) -> Dict:
-	cfg = DEFAULT_CONFIG.copy()
+def resolve_config(config: Optional[Dict] = None) -> Dict:
+	"""DEFAULT_CONFIG + override (iç içe dict'ler kopyalanır; DEFAULT_CONFIG değişmez)."""
+	cfg = {k: (dict(v) if isinstance(v, dict) else v) for k, v in DEFAULT_CONFIG.items()}
 	if config:
 		for k, v in config.items():
 			if isinstance(v, dict) and k in cfg:
 				cfg[k].update(v)  # type: ignore
 			else:
 				cfg[k] = v
+	return cfg
+
+
+def score_pedagogy(cfg: Dict, sent_count: int, counters: Dict[str, int]) -> Dict:
+	"""Kategori sayaçlarından pedagogy sonuç dict'i (compute_pedagogy_metrics ve canlı akümülatör ortak).
 
+	Cümle sayısı `min_sentences` altındaysa sayaçlar sıfırlanır (yetersiz veri).
+	"""
 	targets = cfg['targets']
 	weights = cfg['weights']
-
-	sents = _sentences(transcript)
-	sent_count = len(sents)
 	insufficient = sent_count < cfg['min_sentences']
-
-	counters = {k: 0 for k in targets.keys()}
-
-	if not insufficient:
-		for s in sents:
-			if _count_matches(s, EXAMPLE_PATTERNS):
-				counters['examples'] += 1
-			if _count_matches(s, QUESTION_PATTERNS) or s.strip().endswith('?'):
-				counters['questions'] += 1
-			if _count_matches(s, SIGNPOST_PATTERNS):
-				counters['signposting'] += 1
-			if _count_matches(s, DEFINITION_PATTERNS):
-				counters['definitions'] += 1
-			if _count_matches(s, SUMMARY_PATTERNS):
-				counters['summary'] += 1
-
+	counters = {k: (0 if insufficient else int(counters.get(k, 0))) for k in targets.keys()}
 	ratios = {k: (counters[k] / sent_count if sent_count else 0.0) for k in counters}
 
 	scores = {k: 0.0 for k in counters}
@@ -128,7 +224,7 @@ def compute_pedagogy_metrics(
 		pedagogy_score = min(1.0, base_sum + bonus)
 	scores['pedagogy_score'] = pedagogy_score
 
-	return {
+	result = {
 		'raw': {
 			'sentence_count': sent_count,
 			'counts': counters,
@@ -139,5 +235,45 @@ def compute_pedagogy_metrics(
 		'weights': weights,
 		'config_used': cfg,
 	}
+	return result
+
+
+def compute_pedagogy_metrics(
+	transcript: str,
+	config: Optional[Dict] = None,
+	profile: Optional[TextProfile] = None,
+	return_matches: bool = False,
+) -> Dict:
+	"""profile verilirse transkript yeniden taranmaz (transcript yok sayılır).
 
-__all__ = ['compute_pedagogy_metrics']
+	config['patterns'] kategori bazında varsayılan pattern listelerini değiştirir.
+	return_matches=True ise sonuçta vurgulama için 'matches' listesi de döner.
+	"""
+	cfg = resolve_config(config)
+	targets = cfg['targets']
+
+	prof = profile if profile is not None else get_text_profile(transcript)
+	sent_count = prof.sentence_count
+	insufficient = sent_count < cfg['min_sentences']
+
+	counters = {k: 0 for k in targets.keys()}
+	matches: List[Dict[str, Any]] = []
+
+	if not insufficient:
+		sents = prof.sentences_lower
+		hits, matches = get_matcher(cfg.get('patterns')).classify(sents, positions=return_matches)
+		# Soru işaretiyle biten cümleler pattern'den bağımsız soru sayılır
+		questions = hits.setdefault('questions', set())
+		questions.update(i for i, s in enumerate(sents) if s.endswith('?'))
+		for k in counters:
+			counters[k] = len(hits.get(k, ()))
+
+	result = score_pedagogy(cfg, sent_count, counters)
+	if return_matches:
+		result['matches'] = matches
+	return result
+
+__all__ = [
+	'compute_pedagogy_metrics', 'score_pedagogy', 'resolve_config',
+	'PatternMatcher', 'get_matcher', 'DEFAULT_PATTERNS',
+]
@@ -10,25 +10,91 @@ from __future__ import annotations
 from typing import List, Dict, Any, Optional, Tuple
 import re
 
-from .embeddings import cosine_similarity, embed_texts
+from .embeddings import cosine_similarity, embed_texts, normalized_matrix, _NUMPY, np
 
 
 class VectorIndex:
-    """In-memory basit vektör indeks.
+    """In-memory vektör indeks.
 
     entries: List[{'id': str, 'text': str, 'embedding': List[float]}]
+
+    NumPy varsa embedding'ler önceden normalize edilmiş, bitişik (contiguous)
+    float32 bir matriste (n x dim) tutulur; sorgu tek matris-vektör çarpımı +
+    argpartition ile top-k'ya indirgenir. Entry sözlükleri ayrı listede kalır ve
+    sonuç dict'i sadece kazanan satırlar için üretilir. NumPy yoksa eski saf
+    Python taramasına düşülür.
     """
     def __init__(self, entries: List[Dict[str, Any]]):
         self.entries = [e for e in entries if e.get('embedding')]
         self.dim = len(self.entries[0]['embedding']) if self.entries else 0
+        self._matrix = None
+        if _NUMPY and self.entries:
+            self._matrix = normalized_matrix([e['embedding'] for e in self.entries], self.dim)
+
+    @classmethod
+    def from_matrix(cls, entries: List[Dict[str, Any]], matrix: Any, normalized: bool = False) -> 'VectorIndex':
+        """Hazır (n x dim) float32 matristen indeks kur (storage.load_index).
+
+        Entry'lerde 'embedding' listesi tutulmaz; skorlar doğrudan matristen gelir.
+        normalized=True: satırlar zaten L2-normalize; float32 C-contiguous matris
+        kopyalanmadan kullanılır (salt okunur `frombuffer` görünümü de olabilir).
+        """
+        idx = cls.__new__(cls)
+        idx.entries = list(entries)
+        idx.dim = int(matrix.shape[1]) if len(idx.entries) else 0
+        if not idx.entries:
+            idx._matrix = None
+        elif normalized:
+            idx._matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        else:
+            idx._matrix = normalized_matrix(matrix, idx.dim)
+        return idx
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _materialize(self, idx: List[int], sims: List[float]) -> List[Dict[str, Any]]:
+        return [dict(self.entries[i], similarity=float(s)) for i, s in zip(idx, sims)]
 
     def search(self, query_vec: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
-        scored = []
-        for e in self.entries:
-            sim = cosine_similarity(query_vec, e['embedding'])
-            scored.append((sim, e))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [dict(e[1], similarity=e[0]) for e in scored[:top_k]]
+        if not self.entries or top_k <= 0:
+            return []
+        if self._matrix is None:
+            scored = []
+            for e in self.entries:
+                sim = cosine_similarity(query_vec, e['embedding'])
+                scored.append((sim, e))
+            scored.sort(key=lambda x: x[0], reverse=True)
+            return [dict(e[1], similarity=e[0]) for e in scored[:top_k]]
+        return self.search_many([query_vec], top_k=top_k)[0]
+
+    def search_many(self, query_matrix: Any, top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Birden çok sorgu vektörünü tek seferde ara.
+
+        query_matrix: (m x dim) liste-listesi veya ndarray. Dönen: her sorgu için
+        `search` ile aynı formatta sonuç listesi (sorgu sırası korunur).
+        """
+        if self._matrix is None:
+            return [self.search(list(q), top_k=top_k) for q in query_matrix]
+        n_queries = len(query_matrix)
+        if n_queries == 0:
+            return []
+        if top_k <= 0:
+            return [[] for _ in range(n_queries)]
+        queries = normalized_matrix(query_matrix, self.dim)
+        # (m x dim) @ (dim x n) -> (m x n) cosine skorları
+        scores = queries @ self._matrix.T
+        k = min(top_k, scores.shape[1])
+        out: List[List[Dict[str, Any]]] = []
+        for row in scores:
+            if k < row.shape[0]:
+                cand = np.argpartition(-row, k - 1)[:k]
+            else:
+                cand = np.arange(row.shape[0])
+            # Eşit skorlarda ekleme sırasını koru (eski stable sort davranışı)
+            order = cand[np.lexsort((cand, -row[cand]))]
+            out.append(self._materialize(order.tolist(), row[order].tolist()))
+        return out
 
 
 def build_index(chunks_with_embeddings: List[Dict[str, Any]]) -> VectorIndex:
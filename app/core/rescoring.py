@@ -0,0 +1,334 @@
+"""Geçmiş run'ları yeni ağırlıklarla toplu yeniden skorlama.
+
+Analiz hattını (transcript, embedding ...) yeniden çalıştırmadan, `metrics`
+tablosunda zaten saklı ham değerlerden skorları yeniden hesaplar:
+
+- delivery: wpm, filler_ratio, unique_words/words, avg_sentence_len ve
+  pause_density ham değerlerine delivery normalizasyonları (vektörize) ve
+  `metrics.delivery` ağırlıkları uygulanır. words < 20 ise skor 0 (insufficient).
+- pedagogy: ham oran (raw_value) saklıysa hedeflere göre yeniden normalize
+  edilir, eski kayıtlarda saklı alt skorlar kullanılır; ağırlıklı toplam +
+  balance bonus (alt skor std < 0.25) yeniden hesaplanır. Tüm alt skorları ve
+  bonusu 0 olan run insufficient kabul edilir.
+- ham / alt skor satırları bakımda silinmiş run'larda (bkz. maintenance
+  `keep_metrics`) saklı delivery_score / pedagogy_score olduğu gibi kullanılır;
+  bu run'larda yalnız modül ağırlıkları değişiklikten etkilenir.
+- coverage: coverage_ratio.
+- toplam: `aggregate_scores` ile aynı kurallar (normalize ağırlıklar, eksik modül = 0).
+
+Tüm run'lar tek sorguda okunur, run x metrik matrisine pivotlanır ve skorlar
+NumPy dizi işlemleriyle tek geçişte hesaplanır. Sonuçlar `score_versions` /
+`run_scores` tablolarına yeni bir versiyon olarak yazılır; `persist=False`
+(what-if) hiçbir şey yazmadan aynı sonucu döndürür.
+
+NumPy gereklidir; yoksa RuntimeError fırlatılır.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+from . import storage
+from .delivery import DEFAULT_CONFIG as DELIVERY_DEFAULTS
+from .pedagogy import DEFAULT_CONFIG as PEDAGOGY_DEFAULTS
+from .scoring import DEFAULT_WEIGHTS
+
+try:  # opsiyonel bağımlılık
+    import numpy as np  # type: ignore
+    _NUMPY = True
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+    _NUMPY = False
+
+DELIVERY_SUBSCORES = ['wpm', 'filler', 'repetition', 'sentence_length', 'pause']
+PEDAGOGY_SUBSCORES = ['examples', 'questions', 'signposting', 'definitions', 'summary']
+
+# (category, name, alan) -> pivot kolonları
+_COLUMNS = (
+    [('coverage', 'coverage_ratio', 'raw_value')]
+    + [('delivery', n, 'raw_value') for n in ['wpm', 'filler_ratio', 'words', 'unique_words', 'avg_sentence_len', 'pause_density']]
+    + [('pedagogy', n, f) for n in PEDAGOGY_SUBSCORES for f in ('raw_value', 'score')]
+    + [('pedagogy', 'balance_bonus', 'score')]
+    # bakım (maintenance) eski run'larda yalnız özet skorları bırakır -> fallback
+    + [('delivery', 'delivery_score', 'score'), ('pedagogy', 'pedagogy_score', 'score')]
+)
+
+
+def _merge(defaults: Dict[str, Any], override: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    cfg = {k: (dict(v) if isinstance(v, dict) else v) for k, v in defaults.items()}
+    for k, v in (override or {}).items():
+        if isinstance(v, dict) and isinstance(cfg.get(k), dict):
+            cfg[k].update(v)
+        else:
+            cfg[k] = v
+    return cfg
+
+
+def resolve_config(
+    weights: Optional[Dict[str, float]] = None,
+    delivery: Optional[Dict[str, Any]] = None,
+    pedagogy: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Geçerli settings + verilen override'lar -> yeniden skorlama konfigürasyonu."""
+    try:
+        from .config import get_settings
+        settings = get_settings()
+    except Exception:
+        settings = {}
+    metrics_cfg = settings.get('metrics') or {}
+    w = dict(DEFAULT_WEIGHTS)
+    w.update(settings.get('weights') or {})
+    w.update(weights or {})
+    return {
+        'weights': w,
+        'delivery': _merge(_merge(DELIVERY_DEFAULTS, metrics_cfg.get('delivery')), delivery),
+        'pedagogy': _merge(_merge(PEDAGOGY_DEFAULTS, metrics_cfg.get('pedagogy')), pedagogy),
+    }
+
+
+def load_metric_matrix(run_ids: Optional[List[int]] = None, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """metrics tablosunu tek sorguda run x kolon float matrisine pivotla (eksik = NaN)."""
+    if not _NUMPY:
+        raise RuntimeError("numpy kurulu değil")
+    eng = storage.get_engine(db_path)
+    with eng.snapshot() as conn:
+        if run_ids is None:
+            ids = [r[0] for r in conn.execute("SELECT id FROM runs ORDER BY id")]
+            rows = conn.execute(
+                "SELECT run_id, category, name, raw_value, score FROM metrics "
+                "WHERE category IN ('coverage', 'delivery', 'pedagogy')"
+            ).fetchall()
+            totals = conn.execute("SELECT id, total_score FROM runs").fetchall()
+        else:
+            ids = sorted(set(int(r) for r in run_ids))
+            rows, totals = [], []
+            for part in storage._chunked(ids):
+                marks = ",".join("?" * len(part))
+                rows += conn.execute(
+                    "SELECT run_id, category, name, raw_value, score FROM metrics "
+                    f"WHERE run_id IN ({marks}) AND category IN ('coverage', 'delivery', 'pedagogy')",
+                    part,
+                ).fetchall()
+                totals += conn.execute(f"SELECT id, total_score FROM runs WHERE id IN ({marks})", part).fetchall()
+            existing = {r[0] for r in totals}
+            ids = [i for i in ids if i in existing]
+    run_ids_arr = np.asarray(ids, dtype=np.int64)
+    col_index = {key: j for j, key in enumerate(_COLUMNS)}
+    mat = np.full((len(ids), len(_COLUMNS)), np.nan, dtype=np.float64)
+    if rows and len(ids):
+        r_run = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        pos = np.searchsorted(run_ids_arr, r_run)
+        pos = np.clip(pos, 0, len(ids) - 1)
+        valid = run_ids_arr[pos] == r_run
+        for field, fi in (('raw_value', 3), ('score', 4)):
+            cols = np.fromiter((col_index.get((r[1], r[2], field), -1) for r in rows), dtype=np.int64, count=len(rows))
+            vals = np.fromiter(
+                (np.nan if r[fi] is None else float(r[fi]) for r in rows), dtype=np.float64, count=len(rows)
+            )
+            m = valid & (cols >= 0)
+            mat[pos[m], cols[m]] = vals[m]
+    old_total = np.full(len(ids), np.nan)
+    if totals and len(ids):
+        t_ids = np.asarray([t[0] for t in totals], dtype=np.int64)
+        t_vals = np.asarray([np.nan if t[1] is None else t[1] for t in totals], dtype=np.float64)
+        old_total[np.searchsorted(run_ids_arr, t_ids)] = t_vals
+    return {
+        'run_ids': run_ids_arr,
+        'columns': {key: mat[:, j] for key, j in col_index.items()},
+        'old_total': old_total,
+    }
+
+
+# -- vektörize normalizasyonlar (delivery.py / pedagogy.py skaler sürümleriyle aynı) --
+
+def _band(x, lo, hi):
+    """Alt sınırın altı 0.7 ölçekli, aralık 1.0, üst sınır üstü doğrusal ceza (wpm / cümle uzunluğu)."""
+    out = np.select(
+        [x <= 0, x < lo, x > hi],
+        [0.0, np.clip(x / lo * 0.7, 0.0, 1.0), np.maximum(0.0, 1 - (x - hi) / hi)],
+        default=1.0,
+    )
+    return np.where(np.isnan(x), np.nan, out)
+
+
+def _tolerance(x, tol):
+    """0 -> 1.0, tol -> 0.5, 2*tol ve üstü -> 0 (filler / pause)."""
+    out = np.select(
+        [x <= 0, x >= 2 * tol, x <= tol],
+        [1.0, 0.0, 1 - 0.5 * (x / tol)],
+        default=np.maximum(0.0, 0.5 * (1 - (x - tol) / tol)),
+    )
+    return np.where(np.isnan(x), np.nan, out)
+
+
+def _diversity(x, target):
+    out = np.select([x <= 0, x >= target], [0.0, 1.0], default=x / target)
+    return np.where(np.isnan(x), np.nan, out)
+
+
+def _norm_ratio(x, target):
+    if target <= 0:
+        return np.where(np.isnan(x), np.nan, 0.0)
+    excess_pen = np.minimum(0.4, (x - 2 * target) / (2 * target))
+    out = np.select(
+        [x <= 0, x <= target, x <= 2 * target],
+        [0.0, np.minimum(1.0, x / target), 1.0],
+        default=np.maximum(0.0, 1.0 - excess_pen),
+    )
+    return np.where(np.isnan(x), np.nan, out)
+
+
+def _delivery_scores(cols: Dict[Any, Any], cfg: Dict[str, Any]):
+    c = lambda n: cols[('delivery', n, 'raw_value')]  # noqa: E731
+    words = c('words')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        diversity = np.where(words > 0, c('unique_words') / words, 0.0)
+    diversity = np.where(np.isnan(words), np.nan, diversity)
+    subs = {
+        'wpm': _band(c('wpm'), cfg['ideal_wpm_min'], cfg['ideal_wpm_max']),
+        'filler': _tolerance(c('filler_ratio'), cfg['filler_tolerance']),
+        'repetition': _diversity(diversity, cfg['diversity_target']),
+        'sentence_length': _band(c('avg_sentence_len'), cfg['sentence_len_min'], cfg['sentence_len_max']),
+        'pause': _tolerance(c('pause_density'), cfg['pause_tolerance']),
+    }
+    w = cfg['weights']
+    total = sum(np.nan_to_num(subs[k]) * w.get(k, 0.0) for k in DELIVERY_SUBSCORES)
+    present = ~np.isnan(c('wpm'))
+    insufficient = np.nan_to_num(words) < 20
+    stored = cols[('delivery', 'delivery_score', 'score')]
+    return np.where(present, np.where(insufficient, 0.0, total), stored)
+
+
+def _pedagogy_scores(cols: Dict[Any, Any], cfg: Dict[str, Any]):
+    targets = cfg['targets']
+    w = cfg['weights']
+    subs = []
+    stored_sum = 0.0
+    for n in PEDAGOGY_SUBSCORES:
+        ratio = cols[('pedagogy', n, 'raw_value')]
+        stored = cols[('pedagogy', n, 'score')]
+        subs.append(np.where(np.isnan(ratio), stored, _norm_ratio(ratio, targets.get(n, 0.0))))
+        stored_sum = stored_sum + np.nan_to_num(stored)
+    sub_mat = np.nan_to_num(np.vstack(subs))  # (5 x n)
+    bonus_stored = cols[('pedagogy', 'balance_bonus', 'score')]
+    std = sub_mat.std(axis=0)
+    bonus = np.where(std < 0.25, w.get('balance_bonus', 0.0), 0.0)
+    base = sum(sub_mat[i] * w.get(n, 0.0) for i, n in enumerate(PEDAGOGY_SUBSCORES))
+    score = np.minimum(1.0, base + bonus)
+    insufficient = (stored_sum == 0) & (np.nan_to_num(bonus_stored) == 0)
+    present = ~np.isnan(bonus_stored) | ~np.all(np.isnan(np.vstack(subs)), axis=0)
+    stored_total = cols[('pedagogy', 'pedagogy_score', 'score')]
+    return np.where(present, np.where(insufficient, 0.0, score), stored_total)
+
+
+def compute_scores(matrix: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """load_metric_matrix çıktısı + config -> skor dizileri (tek geçiş, vektörize)."""
+    cols = matrix['columns']
+    cov = cols[('coverage', 'coverage_ratio', 'raw_value')]
+    # np.select tüm dalları hesaplar; NaN / sıfıra bölme uyarıları sonuçta maskelenir
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dlv = _delivery_scores(cols, config['delivery'])
+        ped = _pedagogy_scores(cols, config['pedagogy'])
+    w = dict(config['weights'])
+    total_w = sum(w.values()) or 1.0
+    total = (
+        np.nan_to_num(cov) * w.get('coverage', 0.0)
+        + np.nan_to_num(dlv) * w.get('delivery', 0.0)
+        + np.nan_to_num(ped) * w.get('pedagogy', 0.0)
+    ) / total_w
+    return {'coverage_score': cov, 'delivery_score': dlv, 'pedagogy_score': ped, 'total_score': total}
+
+
+def _nan_none(v: float) -> Optional[float]:
+    return None if v != v else float(v)
+
+
+def rescore_runs(
+    weights: Optional[Dict[str, float]] = None,
+    delivery: Optional[Dict[str, Any]] = None,
+    pedagogy: Optional[Dict[str, Any]] = None,
+    run_ids: Optional[List[int]] = None,
+    persist: bool = True,
+    note: Optional[str] = None,
+    db_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run'ları (varsayılan: hepsi) yeni ağırlık / eşiklerle yeniden skorla.
+
+    persist=False -> what-if: yalnız sonuç döner, DB'ye yazılmaz.
+    Dönüş: {'version', 'config', 'runs': [{run_id, coverage_score, delivery_score,
+    pedagogy_score, total_score, old_total_score, delta}], 'summary': {...}}
+    """
+    config = resolve_config(weights, delivery, pedagogy)
+    matrix = load_metric_matrix(run_ids, db_path=db_path)
+    scores = compute_scores(matrix, config)
+    ids = matrix['run_ids']
+    old = matrix['old_total']
+    delta = scores['total_score'] - old
+    version = None
+    if persist and len(ids):
+        cols = [scores[k] for k in ('coverage_score', 'delivery_score', 'pedagogy_score', 'total_score')]
+        rows = [
+            (int(rid), *(_nan_none(c[i]) for c in cols))
+            for i, rid in enumerate(ids.tolist())
+        ]
+        with storage.get_engine(db_path).transaction() as conn:
+            cur = conn.execute(
+                "INSERT INTO score_versions(weights_json, config_json, note, run_count) VALUES (?, ?, ?, ?)",
+                (json.dumps(config['weights']), json.dumps(config), note, len(rows)),
+            )
+            version = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO run_scores(version, run_id, coverage_score, delivery_score, pedagogy_score, total_score) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(version, *r) for r in rows],
+            )
+    runs = [
+        {
+            'run_id': int(rid),
+            'coverage_score': _nan_none(scores['coverage_score'][i]),
+            'delivery_score': _nan_none(scores['delivery_score'][i]),
+            'pedagogy_score': _nan_none(scores['pedagogy_score'][i]),
+            'total_score': float(scores['total_score'][i]),
+            'old_total_score': _nan_none(old[i]),
+            'delta': _nan_none(delta[i]),
+        }
+        for i, rid in enumerate(ids.tolist())
+    ]
+    finite = delta[~np.isnan(delta)]
+    summary = {
+        'count': int(len(ids)),
+        'mean_delta': float(finite.mean()) if finite.size else 0.0,
+        'count_up': int((finite > 1e-9).sum()),
+        'count_down': int((finite < -1e-9).sum()),
+    }
+    return {'version': version, 'config': config, 'runs': runs, 'summary': summary}
+
+
+def fetch_score_versions(db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    rows = storage.get_engine(db_path).query(
+        "SELECT version, created_at, weights_json, note, run_count FROM score_versions ORDER BY version"
+    )
+    return [
+        {'version': v, 'created_at': c, 'weights': json.loads(w) if w else None, 'note': n, 'run_count': rc}
+        for v, c, w, n, rc in rows
+    ]
+
+
+def fetch_run_scores(version: int, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    rows = storage.get_engine(db_path).query(
+        "SELECT run_id, coverage_score, delivery_score, pedagogy_score, total_score "
+        "FROM run_scores WHERE version = ? ORDER BY run_id",
+        (version,),
+    )
+    cols = ['run_id', 'coverage_score', 'delivery_score', 'pedagogy_score', 'total_score']
+    return [dict(zip(cols, r)) for r in rows]
+
+
+__all__ = [
+    'rescore_runs',
+    'resolve_config',
+    'load_metric_matrix',
+    'compute_scores',
+    'fetch_score_versions',
+    'fetch_run_scores',
+]
@@ -6,15 +6,24 @@ Tablolar:
   topics: Coverage sonucu konu bazlı durumlar
   metrics: Ayrıntılı metrik değerleri (raw + skor)
 
-Not: Şimdilik çok-kullanıcılı eşzamanlı erişim senaryosu hedeflenmiyor.
+Bağlantılar `StorageEngine` üzerinden yönetilir: her thread için tek, uzun
+ömürlü bağlantı (WAL + ayarlı pragmalar). WAL sayesinde bir oturum yazarken
+diğer oturumlar geçmişi okumaya devam edebilir.
 """
 
 from __future__ import annotations
 
+import hashlib
+import math
 import os
 import sqlite3
+import sys
 import json
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from array import array
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 DEFAULT_DB_PATH = os.path.join("data", "app.db")
 
@@ -26,6 +35,7 @@ def _ensure_dir(path: str) -> None:
 
 
 def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """Tek seferlik ham bağlantı (geriye uyumluluk). Yeni kod `get_engine` kullanmalı."""
     path = db_path or DEFAULT_DB_PATH
     _ensure_dir(path)
     conn = sqlite3.connect(path)
@@ -33,9 +43,201 @@ def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
     return conn
 
 
+# ---------------------------------------------------------------------------
+# Bağlantı motoru
+
+class StorageEngine:
+    """Thread-local, uzun ömürlü SQLite bağlantıları yöneten motor.
+
+    - Her thread ilk erişimde kendi bağlantısını açar ve tekrar kullanır.
+    - journal_mode=WAL: okuyucular yazarı, yazar okuyucuları bloklamaz.
+    - synchronous=NORMAL: WAL ile güvenli; her commit'te fsync yapılmaz.
+    - Bağlantılar autocommit modda açılır; yazma işlemleri `transaction()`
+      ile açık BEGIN/COMMIT bloğunda yapılır. İç içe `transaction()` dış
+      işleme katılır.
+    - SQL metinleri sabit tutulduğu için sqlite3 statement cache
+      (`cached_statements`) hazırlanmış ifadeleri yeniden kullanır.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        *,
+        synchronous: str = "NORMAL",
+        cache_kib: int = 16000,
+        busy_timeout_ms: int = 5000,
+        statement_cache: int = 256,
+    ):
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.synchronous = synchronous
+        self.cache_kib = int(cache_kib)
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self.statement_cache = int(statement_cache)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # thread ident -> (thread weakref, bağlantı); kapanış ve ölü thread temizliği için
+        self._conns: Dict[int, Tuple[Any, sqlite3.Connection]] = {}
+        self._file_id: Optional[Tuple[int, int]] = None
+        self.closed = False
+        _ensure_dir(self.db_path)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            isolation_level=None,
+            check_same_thread=False,  # thread başına kullanım motor tarafından garanti edilir
+            cached_statements=self.statement_cache,
+        )
+        # Yeni (boş) DB dosyaları artımlı vacuum ile oluşur; mevcutlarda bakım işinin
+        # VACUUM'u dönüştürür. WAL'a geçmeden önce ayarlanmalı.
+        if conn.execute("PRAGMA page_count;").fetchone()[0] == 0:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous};")
+        conn.execute(f"PRAGMA cache_size = -{self.cache_kib};")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms};")
+        conn.execute("PRAGMA foreign_keys = ON;")
+        return conn
+
+    def _register(self, conn: sqlite3.Connection) -> None:
+        th = threading.current_thread()
+        with self._lock:
+            # Ölmüş thread'lerin bağlantılarını kapat (Streamlit oturumları gelip gider)
+            for ident, (ref, c) in list(self._conns.items()):
+                t = ref()
+                if t is None or not t.is_alive():
+                    try:
+                        c.close()
+                    except Exception:
+                        pass
+                    self._conns.pop(ident, None)
+            self._conns[th.ident or 0] = (weakref.ref(th), conn)
+            if self._file_id is None:
+                try:
+                    st = os.stat(self.db_path)
+                    self._file_id = (st.st_dev, st.st_ino)
+                except OSError:
+                    pass
+
+    def connection(self) -> sqlite3.Connection:
+        """Bu thread'e ait bağlantı (yoksa açılır)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.depth = 0
+            self._register(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Yazma işlemi bloğu (BEGIN IMMEDIATE ... COMMIT, hata olursa ROLLBACK)."""
+        conn = self.connection()
+        depth = self._local.depth
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                conn.rollback()
+            raise
+        self._local.depth = depth
+        if depth == 0:
+            conn.commit()
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Okuma bloğu: içindeki tüm sorgular aynı commit'lenmiş anı görür.
+
+        WAL'da BEGIN (deferred) ile açılan okuma işlemi ilk sorguda sabitlenir;
+        arka planda yazan thread'lerin commit'leri blok bitene kadar görünmez.
+        """
+        conn = self.connection()
+        depth = self._local.depth
+        if depth == 0:
+            conn.execute("BEGIN")
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                conn.commit()
+
+    def query(self, sql: str, params: Any = ()) -> List[tuple]:
+        return self.connection().execute(sql, params).fetchall()
+
+    def is_valid(self) -> bool:
+        """DB dosyası silinip yeniden oluşturulduysa motor geçersizdir."""
+        if self.closed:
+            return False
+        if self._file_id is None:
+            return True
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return False
+        return (st.st_dev, st.st_ino) == self._file_id
+
+    def close(self) -> None:
+        with self._lock:
+            self.closed = True
+            for _, c in self._conns.values():
+                try:
+                    c.close()
+                except Exception:
+                    pass
+            self._conns.clear()
+        self._local = threading.local()
+
+
+_ENGINES: Dict[str, StorageEngine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(db_path: Optional[str] = None) -> StorageEngine:
+    """DB yolu başına süreç genelinde paylaşılan motor."""
+    path = os.path.abspath(db_path or DEFAULT_DB_PATH)
+    with _ENGINES_LOCK:
+        eng = _ENGINES.get(path)
+        if eng is not None and not eng.is_valid():
+            eng.close()
+            eng = None
+        if eng is None:
+            eng = StorageEngine(path)
+            _ENGINES[path] = eng
+        return eng
+
+
+def close_engines() -> None:
+    """Tüm motorların bağlantılarını kapat (süreç kapanışı / testler)."""
+    with _ENGINES_LOCK:
+        for eng in _ENGINES.values():
+            eng.close()
+        _ENGINES.clear()
+
+
 def init_db(db_path: Optional[str] = None) -> None:
-    conn = get_connection(db_path)
-    cur = conn.cursor()
+    with get_engine(db_path).transaction() as conn:
+        _create_schema(conn.cursor())
+        # Rollup tablosu sonradan eklendiyse mevcut geçmişten bir kez doldur
+        has_rollups = conn.execute("SELECT EXISTS(SELECT 1 FROM run_rollups)").fetchone()[0]
+        if not has_rollups and conn.execute("SELECT EXISTS(SELECT 1 FROM runs)").fetchone()[0]:
+            _apply_rollups(conn)
+
+
+def _ensure_column(cur: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+    cols = {row[1] for row in cur.execute(f"PRAGMA table_info({table})")}
+    if column not in cols:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _create_schema(cur: sqlite3.Cursor) -> None:
     # materials
     cur.execute(
         """
@@ -46,7 +248,8 @@ def init_db(db_path: Optional[str] = None) -> None:
             chars INTEGER,
             words INTEGER,
             approx_tokens INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            text_hash TEXT
         );
         """
     )
@@ -94,35 +297,121 @@ def init_db(db_path: Optional[str] = None) -> None:
         );
         """
     )
+    # chunks / chunk_embeddings: RAG indeksinin kalıcı hali (vektörler packed float32 BLOB)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chunks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            material_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            chunk_key TEXT,
+            text TEXT,
+            token_count INTEGER,
+            content_hash TEXT,
+            UNIQUE(material_id, position),
+            FOREIGN KEY(material_id) REFERENCES materials(id) ON DELETE CASCADE
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chunk_embeddings (
+            chunk_id INTEGER NOT NULL,
+            model TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vector BLOB NOT NULL,
+            UNIQUE(chunk_id, model),
+            FOREIGN KEY(chunk_id) REFERENCES chunks(id) ON DELETE CASCADE
+        );
+        """
+    )
+    # score_versions / run_scores: ağırlık değişikliği sonrası yeniden skorlama sonuçları
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS score_versions (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            weights_json TEXT,
+            config_json TEXT,
+            note TEXT,
+            run_count INTEGER
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_scores (
+            version INTEGER NOT NULL,
+            run_id INTEGER NOT NULL,
+            coverage_score REAL,
+            delivery_score REAL,
+            pedagogy_score REAL,
+            total_score REAL,
+            PRIMARY KEY(version, run_id),
+            FOREIGN KEY(version) REFERENCES score_versions(version) ON DELETE CASCADE,
+            FOREIGN KEY(run_id) REFERENCES runs(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """
+    )
+    # run_rollups: materyal (filename) x periyot (day|week) x kova x skor özetleri
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_rollups (
+            material TEXT NOT NULL,
+            period TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            sum REAL NOT NULL,
+            min REAL,
+            max REAL,
+            last REAL,
+            last_run_id INTEGER,
+            archived INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY(material, period, bucket, metric)
+        ) WITHOUT ROWID;
+        """
+    )
+    # Sonradan eklenen kolonlar (eski DB dosyaları için)
+    _ensure_column(cur, "materials", "text_hash", "TEXT")
+    _ensure_column(cur, "runs", "archived_at", "TIMESTAMP")  # bakım işi (maintenance.py)
+    _ensure_column(cur, "run_rollups", "archived", "INTEGER NOT NULL DEFAULT 0")  # dondurulmuş kova
     # indeksler (basit)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_materials_text_hash ON materials(text_hash);")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_runs_material ON runs(material_id);")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_topics_run ON topics(run_id);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics(run_id);")
-    conn.commit()
-    conn.close()
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at);")
+    # (run_id, category, name) bileşik indeksi tek başına run_id aramalarını da karşılar
+    cur.execute("DROP INDEX IF EXISTS idx_metrics_run;")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_metrics_run_cat_name ON metrics(run_id, category, name);")
+
+
+_METRIC_INSERT_SQL = """
+    INSERT INTO metrics(run_id, category, name, raw_value, score, extra_json)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_TOPIC_INSERT_SQL = "INSERT INTO topics(run_id, topic, status, similarity) VALUES (?, ?, ?, ?)"
 
 
 def insert_material(source_meta: Dict[str, Any], db_path: Optional[str] = None) -> int:
-    conn = get_connection(db_path)
-    cur = conn.cursor()
     stats = source_meta.get("stats", {}) or {}
-    cur.execute(
-        """
-        INSERT INTO materials(filename, size_mb, chars, words, approx_tokens)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (
-            source_meta.get("filename"),
-            source_meta.get("size_mb"),
-            stats.get("chars"),
-            stats.get("words"),
-            stats.get("approx_tokens"),
-        ),
-    )
-    mid = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return mid
+    with get_engine(db_path).transaction() as conn:
+        cur = conn.execute(
+            """
+            INSERT INTO materials(filename, size_mb, chars, words, approx_tokens, text_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                source_meta.get("filename"),
+                source_meta.get("size_mb"),
+                stats.get("chars"),
+                stats.get("words"),
+                stats.get("approx_tokens"),
+                source_meta.get("text_hash"),
+            ),
+        )
+        return cur.lastrowid
 
 
 def insert_run(
@@ -133,39 +422,35 @@ def insert_run(
     pedagogy: Optional[Dict[str, Any]] = None,
     db_path: Optional[str] = None,
 ) -> int:
-    conn = get_connection(db_path)
-    cur = conn.cursor()
     coverage_score = (coverage or {}).get("summary", {}).get("coverage_ratio")
     delivery_score = (delivery or {}).get("scores", {}).get("delivery_score")
     pedagogy_score = (pedagogy or {}).get("scores", {}).get("pedagogy_score")
     total_score = scoring.get("total_score") if scoring else None
     weights_json = json.dumps(scoring.get("weights_used")) if scoring else None
-    cur.execute(
-        """
-        INSERT INTO runs(material_id, coverage_score, delivery_score, pedagogy_score, total_score, weights_json)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (
-            material_id,
-            coverage_score,
-            delivery_score,
-            pedagogy_score,
-            total_score,
-            weights_json,
-        ),
-    )
-    rid = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return rid
+    with get_engine(db_path).transaction() as conn:
+        cur = conn.execute(
+            """
+            INSERT INTO runs(material_id, coverage_score, delivery_score, pedagogy_score, total_score, weights_json)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                material_id,
+                coverage_score,
+                delivery_score,
+                pedagogy_score,
+                total_score,
+                weights_json,
+            ),
+        )
+        rid = cur.lastrowid
+        _apply_rollups(conn, run_id=rid)
+        return rid
 
 
 def bulk_insert_topics(run_id: int, coverage: Dict[str, Any], db_path: Optional[str] = None) -> int:
     topics = (coverage or {}).get("topics") or []
     if not topics:
         return 0
-    conn = get_connection(db_path)
-    cur = conn.cursor()
     rows = [
         (
             run_id,
@@ -175,13 +460,9 @@ def bulk_insert_topics(run_id: int, coverage: Dict[str, Any], db_path: Optional[
         )
         for t in topics
     ]
-    cur.executemany(
-        "INSERT INTO topics(run_id, topic, status, similarity) VALUES (?, ?, ?, ?)", rows
-    )
-    conn.commit()
-    n = cur.rowcount
-    conn.close()
-    return n
+    with get_engine(db_path).transaction() as conn:
+        cur = conn.executemany(_TOPIC_INSERT_SQL, rows)
+        return cur.rowcount
 
 
 def insert_metric(
@@ -193,71 +474,458 @@ def insert_metric(
     extra: Optional[Dict[str, Any]] = None,
     db_path: Optional[str] = None,
 ) -> int:
-    conn = get_connection(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO metrics(run_id, category, name, raw_value, score, extra_json)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (
-            run_id,
-            category,
-            name,
-            raw_value,
-            score,
-            json.dumps(extra) if extra else None,
-        ),
-    )
-    mid = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return mid
+    with get_engine(db_path).transaction() as conn:
+        cur = conn.execute(
+            _METRIC_INSERT_SQL,
+            (
+                run_id,
+                category,
+                name,
+                raw_value,
+                score,
+                json.dumps(extra) if extra else None,
+            ),
+        )
+        return cur.lastrowid
 
 
-def insert_coverage_metrics(run_id: int, coverage: Dict[str, Any], db_path: Optional[str] = None) -> None:
+def _coverage_metric_rows(run_id: int, coverage: Optional[Dict[str, Any]]) -> List[tuple]:
     if not coverage:
-        return
+        return []
     summary = coverage.get("summary", {})
-    for name in ["covered", "partial", "missing"]:
-        insert_metric(run_id, "coverage", name, summary.get(name), None, db_path=db_path)
-    insert_metric(run_id, "coverage", "coverage_ratio", summary.get("coverage_ratio"), summary.get("coverage_ratio"), db_path=db_path)
+    rows = [(run_id, "coverage", name, summary.get(name), None, None) for name in ["covered", "partial", "missing"]]
+    rows.append((run_id, "coverage", "coverage_ratio", summary.get("coverage_ratio"), summary.get("coverage_ratio"), None))
+    return rows
 
 
-def insert_delivery_metrics(run_id: int, delivery: Dict[str, Any], db_path: Optional[str] = None) -> None:
+def _delivery_metric_rows(run_id: int, delivery: Optional[Dict[str, Any]]) -> List[tuple]:
     if not delivery:
-        return
+        return []
     raw = delivery.get("raw", {})
     scores = delivery.get("scores", {})
-    for k, v in raw.items():
-        if k == "insufficient_data":
-            continue
-        insert_metric(run_id, "delivery", k, v, scores.get(k), db_path=db_path)
+    rows = [
+        (run_id, "delivery", k, v, scores.get(k), None)
+        for k, v in raw.items()
+        if k != "insufficient_data"
+    ]
     # toplam skor
     if "delivery_score" in scores:
-        insert_metric(run_id, "delivery", "delivery_score", None, scores.get("delivery_score"), db_path=db_path)
+        rows.append((run_id, "delivery", "delivery_score", None, scores.get("delivery_score"), None))
+    return rows
 
 
-def insert_pedagogy_metrics(run_id: int, pedagogy: Dict[str, Any], db_path: Optional[str] = None) -> None:
+def _pedagogy_metric_rows(run_id: int, pedagogy: Optional[Dict[str, Any]]) -> List[tuple]:
     if not pedagogy:
-        return
+        return []
     raw = pedagogy.get("raw", {})
     scores = pedagogy.get("scores", {})
-    for name, score_val in scores.items():
-        if name == "pedagogy_score":
-            continue
-        # raw karşılığı varsa al
-        rv = raw.get(name)
-        insert_metric(run_id, "pedagogy", name, rv, score_val, db_path=db_path)
+    # raw karşılığı varsa al; yoksa oranı (ratios) sakla -> yeniden skorlama hedefleri uygulayabilir
+    ratios = raw.get("ratios") or {}
+    rows = [
+        (run_id, "pedagogy", name, raw.get(name, ratios.get(name)), score_val, None)
+        for name, score_val in scores.items()
+        if name != "pedagogy_score"
+    ]
     if "pedagogy_score" in scores:
-        insert_metric(run_id, "pedagogy", "pedagogy_score", None, scores.get("pedagogy_score"), db_path=db_path)
+        rows.append((run_id, "pedagogy", "pedagogy_score", None, scores.get("pedagogy_score"), None))
+    return rows
 
 
-def fetch_recent_runs(limit: int = 10, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
-    conn = get_connection(db_path)
-    cur = conn.cursor()
-    cur.execute(
+def _insert_metric_rows(rows: List[tuple], db_path: Optional[str]) -> int:
+    if not rows:
+        return 0
+    with get_engine(db_path).transaction() as conn:
+        conn.executemany(_METRIC_INSERT_SQL, rows)
+    return len(rows)
+
+
+def insert_coverage_metrics(run_id: int, coverage: Dict[str, Any], db_path: Optional[str] = None) -> None:
+    _insert_metric_rows(_coverage_metric_rows(run_id, coverage), db_path)
+
+
+def insert_delivery_metrics(run_id: int, delivery: Dict[str, Any], db_path: Optional[str] = None) -> None:
+    _insert_metric_rows(_delivery_metric_rows(run_id, delivery), db_path)
+
+
+def insert_pedagogy_metrics(run_id: int, pedagogy: Dict[str, Any], db_path: Optional[str] = None) -> None:
+    _insert_metric_rows(_pedagogy_metric_rows(run_id, pedagogy), db_path)
+
+
+def save_run(
+    source_meta: Optional[Dict[str, Any]],
+    scoring: Dict[str, Any],
+    coverage: Optional[Dict[str, Any]] = None,
+    delivery: Optional[Dict[str, Any]] = None,
+    pedagogy: Optional[Dict[str, Any]] = None,
+    db_path: Optional[str] = None,
+    material_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Material + run + topics + tüm metrikleri tek işlemde kaydet.
+
+    Herhangi bir adım hata verirse hiçbir satır yazılmaz (yarım run kalmaz).
+    material_id verilirse (ör. ensure_material ile) yeni material satırı açılmaz.
+    Dönüş: {'material_id', 'run_id', 'counts': {'materials', 'runs', 'topics', 'metrics'}}
+    """
+    source_meta = source_meta or {"filename": "bilinmiyor.txt", "size_mb": None, "stats": {}}
+    eng = get_engine(db_path)
+    n_materials = 0 if material_id else 1
+    with eng.transaction():
+        if not material_id:
+            material_id = insert_material(source_meta, db_path=db_path)
+        run_id = insert_run(material_id, scoring, coverage=coverage, delivery=delivery, pedagogy=pedagogy, db_path=db_path)
+        n_topics = bulk_insert_topics(run_id, coverage, db_path=db_path) if coverage else 0
+        metric_rows = (
+            _coverage_metric_rows(run_id, coverage)
+            + _delivery_metric_rows(run_id, delivery)
+            + _pedagogy_metric_rows(run_id, pedagogy)
+        )
+        n_metrics = _insert_metric_rows(metric_rows, db_path)
+    return {
+        "material_id": material_id,
+        "run_id": run_id,
+        "counts": {"materials": n_materials, "runs": 1, "topics": n_topics, "metrics": n_metrics},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Chunk + embedding kalıcılığı (RAG)
+
+def _pack_vector(vec: Any) -> bytes:
+    """Vektörü little-endian float32 BLOB'a çevir."""
+    arr = array("f", vec)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def find_material(text_hash: str, db_path: Optional[str] = None) -> Optional[int]:
+    """Metin hash'ine sahip ilk material id'si (yoksa None)."""
+    rows = get_engine(db_path).query(
+        "SELECT id FROM materials WHERE text_hash = ? ORDER BY id LIMIT 1", (text_hash,)
+    )
+    return rows[0][0] if rows else None
+
+
+def chunk_count(material_id: int, model: Optional[str] = None, db_path: Optional[str] = None) -> int:
+    """Materyal için embedding'i kayıtlı chunk sayısı (vektör okumadan)."""
+    sql = "SELECT COUNT(*) FROM chunks c JOIN chunk_embeddings e ON e.chunk_id = c.id WHERE c.material_id = ?"
+    if model:
+        return get_engine(db_path).query(sql + " AND e.model = ?", (material_id, model))[0][0]
+    return get_engine(db_path).query(sql, (material_id,))[0][0]
+
+
+def ensure_material(source_meta: Dict[str, Any], text_hash: str, db_path: Optional[str] = None) -> int:
+    """Aynı metin hash'ine sahip material varsa id'sini döndür, yoksa oluştur."""
+    eng = get_engine(db_path)
+    with eng.transaction():
+        mid = find_material(text_hash, db_path=db_path)
+        if mid is not None:
+            return mid
+        return insert_material({**source_meta, "text_hash": text_hash}, db_path=db_path)
+
+
+def _normalize_vector(vec: Any) -> List[float]:
+    """L2-normalize (sıfır vektör olduğu gibi); kayıtlı vektörler indekse kopyasız girer."""
+    norm = math.sqrt(sum(float(x) * float(x) for x in vec))
+    return [float(x) / norm for x in vec] if norm > 0 else [float(x) for x in vec]
+
+
+def _chunk_identity(text: Optional[str], content_hash: Optional[str]) -> str:
+    return content_hash or "text:" + hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def save_chunks(
+    material_id: int,
+    chunks: List[Dict[str, Any]],
+    model: str,
+    db_path: Optional[str] = None,
+) -> int:
+    """Materyalin chunk + embedding listesini (get_or_compute_embeddings çıktısı) `model` için kaydet.
+
+    Tek işlemde: içeriği (content_hash, yoksa metin) eşleşen mevcut chunk satırları
+    yeni sıralarına taşınarak yeniden kullanılır, yeniler eklenir; yalnız `model`'in
+    embedding'leri değiştirilir. Diğer modellerin vektörleri korunur; listede
+    olmayan ve başka modelin embedding'ini taşımayan chunk'lar silinir.
+    Vektörler L2-normalize edilmiş olarak saklanır. Embedding'i olmayan chunk'lar
+    yalnız metin olarak saklanır. Dönüş: yazılan chunk sayısı.
+    """
+    with get_engine(db_path).transaction() as conn:
+        existing: Dict[str, List[int]] = {}
+        for cid, text, content_hash in conn.execute(
+            "SELECT id, text, content_hash FROM chunks WHERE material_id = ? ORDER BY position", (material_id,)
+        ):
+            existing.setdefault(_chunk_identity(text, content_hash), []).append(cid)
+        conn.execute(
+            "DELETE FROM chunk_embeddings WHERE model = ? AND chunk_id IN (SELECT id FROM chunks WHERE material_id = ?)",
+            (model, material_id),
+        )
+        # UNIQUE(material_id, position) çakışmasın diye eski sıralar önce negatife alınır
+        conn.execute("UPDATE chunks SET position = -position - 1 WHERE material_id = ?", (material_id,))
+        emb_rows = []
+        for pos, ch in enumerate(chunks):
+            ids = existing.get(_chunk_identity(ch.get("text"), ch.get("content_hash")))
+            if ids:
+                cid = ids.pop(0)
+                conn.execute(
+                    "UPDATE chunks SET position = ?, chunk_key = ?, token_count = ? WHERE id = ?",
+                    (pos, ch.get("id"), ch.get("token_count"), cid),
+                )
+            else:
+                cid = conn.execute(
+                    """
+                    INSERT INTO chunks(material_id, position, chunk_key, text, token_count, content_hash)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (material_id, pos, ch.get("id"), ch.get("text"), ch.get("token_count"), ch.get("content_hash")),
+                ).lastrowid
+            vec = ch.get("embedding")
+            if vec is not None and len(vec):
+                emb_rows.append((cid, model, len(vec), _pack_vector(_normalize_vector(vec))))
+        conn.executemany(
+            "INSERT INTO chunk_embeddings(chunk_id, model, dim, vector) VALUES (?, ?, ?, ?)", emb_rows
+        )
+        # Kullanılmayan eski chunk'lar: başka modelin embedding'i yoksa sil, varsa sona taşı
+        leftover = [cid for ids in existing.values() for cid in ids]
+        pos = len(chunks)
+        for cid in leftover:
+            if conn.execute("SELECT 1 FROM chunk_embeddings WHERE chunk_id = ? LIMIT 1", (cid,)).fetchone():
+                conn.execute("UPDATE chunks SET position = ? WHERE id = ?", (pos, cid))
+                pos += 1
+            else:
+                conn.execute("DELETE FROM chunks WHERE id = ?", (cid,))
+    return len(chunks)
+
+
+def _chunk_rows(material_id: int, model: Optional[str], db_path: Optional[str]) -> List[tuple]:
+    sql = """
+        SELECT c.chunk_key, c.text, c.token_count, c.content_hash, e.model, e.dim, e.vector
+        FROM chunks c JOIN chunk_embeddings e ON e.chunk_id = c.id
+        WHERE c.material_id = ?{model_cond}
+        ORDER BY c.position
+    """
+    if model:
+        return get_engine(db_path).query(sql.format(model_cond=" AND e.model = ?"), (material_id, model))
+    return get_engine(db_path).query(sql.format(model_cond=""), (material_id,))
+
+
+def _chunk_entry(row: tuple) -> Dict[str, Any]:
+    key, text, token_count, content_hash, model, _dim, _vec = row
+    entry = {"id": key, "text": text, "token_count": token_count, "model": model}
+    if content_hash:
+        entry["content_hash"] = content_hash
+    return entry
+
+
+def _unpack_vector(blob: bytes) -> List[float]:
+    arr = array("f")
+    arr.frombytes(blob)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tolist()
+
+
+def load_chunks(material_id: int, model: Optional[str] = None, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Kayıtlı chunk'ları 'embedding' listeleriyle döndür (session_state['embedded_chunks'] şekli)."""
+    out = []
+    for row in _chunk_rows(material_id, model, db_path):
+        entry = _chunk_entry(row)
+        entry["embedding"] = _unpack_vector(row[6])
+        out.append(entry)
+    return out
+
+
+def load_index(material_id: int, model: Optional[str] = None, db_path: Optional[str] = None):
+    """Kayıtlı embedding BLOB'larından doğrudan VectorIndex kur.
+
+    NumPy varsa BLOB'lar tek bir tampona birleştirilip `np.frombuffer` ile
+    (n x dim) float32 matris olarak görülür; satır satır Python listesi üretilmez.
+    `save_chunks` vektörleri normalize saklar; matris kopyalanmadan indekse girer
+    (eski, normalize edilmemiş kayıtlarda bir kez normalize edilir).
+    Materyalde birden çok model kayıtlıysa `model` verilmelidir (ValueError).
+    """
+    from .rag import VectorIndex
+    from .embeddings import _NUMPY, np
+
+    rows = _chunk_rows(material_id, model, db_path)
+    if not rows:
+        return VectorIndex([])
+    models = {r[4] for r in rows}
+    if len(models) > 1:
+        raise ValueError(f"Materyalde birden çok embedding modeli var, model belirtin: {sorted(models)}")
+    dim = rows[0][5]
+    rows = [r for r in rows if r[5] == dim]
+    if not _NUMPY:
+        return VectorIndex([{**_chunk_entry(r), "embedding": _unpack_vector(r[6])} for r in rows])
+    matrix = np.frombuffer(b"".join(r[6] for r in rows), dtype="<f4").reshape(len(rows), dim)
+    norms = np.einsum("ij,ij->i", matrix, matrix)
+    normalized = bool(np.all((np.abs(norms - 1.0) < 1e-4) | (norms == 0)))
+    return VectorIndex.from_matrix([_chunk_entry(r) for r in rows], matrix, normalized=normalized)
+
+
+# ---------------------------------------------------------------------------
+# Rollup'lar (trend dashboard)
+
+ROLLUP_METRICS = ["total_score", "coverage_score", "delivery_score", "pedagogy_score"]
+ROLLUP_PERIODS = {"day": "%Y-%m-%d", "week": "%Y-W%W"}
+
+_ROLLUP_VALUES_SQL = " UNION ALL ".join(
+    f"""
+    SELECT COALESCE(m.filename, '') AS material, r.id AS run_id, r.created_at AS created_at,
+           '{col}' AS metric, r.{col} AS value
+    FROM runs r LEFT JOIN materials m ON m.id = r.material_id
+    WHERE r.{col} IS NOT NULL AND {{where}}
+    """
+    for col in ROLLUP_METRICS
+)
+
+_ROLLUP_BUCKETS_SQL = " UNION ALL ".join(
+    f"SELECT material, '{period}' AS period, strftime('{fmt}', created_at) AS bucket, metric, run_id, value FROM vals"
+    for period, fmt in ROLLUP_PERIODS.items()
+)
+
+# Tek SQL hem tek run (artımlı) hem tüm geçmiş (rebuild) için kullanılır.
+# last: kovadaki en büyük run_id'nin değeri (ROW_NUMBER ile seçilir).
+_ROLLUP_UPSERT_SQL = f"""
+    WITH vals AS ({_ROLLUP_VALUES_SQL}),
+    b AS (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY material, period, bucket, metric ORDER BY run_id DESC
+        ) AS rn
+        FROM ({_ROLLUP_BUCKETS_SQL})
+    )
+    INSERT INTO run_rollups(material, period, bucket, metric, count, sum, min, max, last, last_run_id)
+    SELECT material, period, bucket, metric, COUNT(*), SUM(value), MIN(value), MAX(value),
+           MAX(CASE WHEN rn = 1 THEN value END), MAX(run_id)
+    FROM b
+    WHERE {{frozen}}
+    GROUP BY material, period, bucket, metric
+    ON CONFLICT(material, period, bucket, metric) DO UPDATE SET
+        count = count + excluded.count,
+        sum = sum + excluded.sum,
+        min = MIN(min, excluded.min),
+        max = MAX(max, excluded.max),
+        last = CASE WHEN excluded.last_run_id >= last_run_id THEN excluded.last ELSE last END,
+        last_run_id = MAX(last_run_id, excluded.last_run_id)
+"""
+
+
+_ROLLUP_RUN_SQL = _ROLLUP_UPSERT_SQL.replace("{where}", "r.id = ?").replace("{frozen}", "true")
+# Rebuild dondurulmuş (archived=1) satırları yeniden hesaplamaz
+_ROLLUP_ALL_SQL = _ROLLUP_UPSERT_SQL.replace("{where}", "1 = 1").replace(
+    "{frozen}",
+    """NOT EXISTS (
+        SELECT 1 FROM run_rollups f WHERE f.archived = 1 AND f.material = b.material
+        AND f.period = b.period AND f.bucket = b.bucket AND f.metric = b.metric
+    )""",
+)
+
+_PERIOD_FMT_SQL = "CASE run_rollups.period " + " ".join(
+    f"WHEN '{period}' THEN '{fmt}'" for period, fmt in ROLLUP_PERIODS.items()
+) + " END"
+
+# Arşivlenmiş (maintenance) run içeren kovalar dondurulur
+_ROLLUP_FREEZE_SQL = f"""
+    UPDATE run_rollups SET archived = 1
+    WHERE archived = 0 AND EXISTS (
+        SELECT 1 FROM runs r LEFT JOIN materials m ON m.id = r.material_id
+        WHERE r.archived_at IS NOT NULL AND COALESCE(m.filename, '') = run_rollups.material
+        AND strftime({_PERIOD_FMT_SQL}, r.created_at) = run_rollups.bucket
+    )
+"""
+
+
+def _apply_rollups(conn: sqlite3.Connection, run_id: Optional[int] = None) -> None:
+    """run_id verilirse yalnız o run'ı rollup'lara ekler; yoksa tüm runs tablosunu."""
+    if run_id is None:
+        conn.execute(_ROLLUP_ALL_SQL)
+    else:
+        conn.execute(_ROLLUP_RUN_SQL, (run_id,) * len(ROLLUP_METRICS))
+
+
+def freeze_rollups(conn: sqlite3.Connection) -> int:
+    """Arşivlenmiş run içeren kovaları dondur (archived=1). Dönüş: yeni dondurulan satır sayısı.
+
+    Bakım arşivlenen run'ları silebilir; dondurulmuş satırlar `rebuild_rollups`
+    tarafından silinmez ve yeniden hesaplanmaz, trend geçmişi korunur.
+    """
+    return conn.execute(_ROLLUP_FREEZE_SQL).rowcount
+
+
+def rebuild_rollups(db_path: Optional[str] = None) -> int:
+    """Rollup tablosunu ham runs verisinden yeniden hesapla. Dönüş: satır sayısı.
+
+    Arşivlenmiş run içeren (dondurulmuş) kovalar olduğu gibi korunur; bakımda
+    silinen run'lar ham veride olmadığından bu kovalar yeniden hesaplanamaz.
+    """
+    with get_engine(db_path).transaction() as conn:
+        freeze_rollups(conn)
+        conn.execute("DELETE FROM run_rollups WHERE archived = 0")
+        _apply_rollups(conn)
+        return conn.execute("SELECT COUNT(*) FROM run_rollups").fetchone()[0]
+
+
+def fetch_rollups(
+    period: str = "day",
+    material: Optional[str] = None,
+    since: Optional[str] = None,
+    metrics: Optional[List[str]] = None,
+    db_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Trend sorguları için rollup satırları (bucket sıralı).
+
+    material None ise tüm materyaller kova bazında birleştirilir (count/sum toplanır,
+    min/max genişletilir, last en son run'dan alınır).
+    Satır: {period, bucket, material, metric, count, mean, min, max, last, last_run_id}
+    """
+    if period not in ROLLUP_PERIODS:
+        raise ValueError(f"Geçersiz periyot: {period}")
+    where = ["period = ?"]
+    params: List[Any] = [period]
+    if material is not None:
+        where.append("material = ?")
+        params.append(material)
+    if since:
+        where.append("bucket >= ?")
+        params.append(since)
+    if metrics:
+        where.append(f"metric IN ({','.join('?' * len(metrics))})")
+        params.extend(metrics)
+    cond = " AND ".join(where)
+    rows = get_engine(db_path).query(
         f"""
+        SELECT bucket, metric, SUM(count), SUM(sum), MIN(min), MAX(max),
+               MAX(CASE WHEN rn = 1 THEN last END), MAX(last_run_id)
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY bucket, metric ORDER BY last_run_id DESC
+            ) AS rn
+            FROM run_rollups WHERE {cond}
+        )
+        GROUP BY bucket, metric
+        ORDER BY bucket, metric
+        """,
+        params,
+    )
+    return [
+        {
+            "period": period,
+            "bucket": bucket,
+            "material": material,
+            "metric": metric,
+            "count": cnt,
+            "mean": (total / cnt) if cnt else None,
+            "min": mn,
+            "max": mx,
+            "last": last,
+            "last_run_id": last_id,
+        }
+        for bucket, metric, cnt, total, mn, mx, last, last_id in rows
+    ]
+
+
+def fetch_recent_runs(limit: int = 10, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    rows = get_engine(db_path).query(
+        """
         SELECT r.id, r.created_at, m.filename, r.coverage_score, r.delivery_score, r.pedagogy_score, r.total_score
         FROM runs r
         LEFT JOIN materials m ON r.material_id = m.id
@@ -266,50 +934,141 @@ def fetch_recent_runs(limit: int = 10, db_path: Optional[str] = None) -> List[Di
         """,
         (limit,),
     )
-    rows = cur.fetchall()
-    conn.close()
     cols = ["id", "created_at", "filename", "coverage_score", "delivery_score", "pedagogy_score", "total_score"]
     return [dict(zip(cols, row)) for row in rows]
 
 
-def fetch_run_details(run_id: int, db_path: Optional[str] = None) -> Dict[str, Any]:
-    conn = get_connection(db_path)
-    cur = conn.cursor()
-    cur.execute("SELECT id, material_id, coverage_score, delivery_score, pedagogy_score, total_score, weights_json, created_at FROM runs WHERE id=?", (run_id,))
-    run_row = cur.fetchone()
-    if not run_row:
-        conn.close()
-        return {}
-    cur.execute("SELECT topic, status, similarity FROM topics WHERE run_id=?", (run_id,))
-    topics = [
-        {"topic": t, "status": s, "similarity": sim}
-        for (t, s, sim) in cur.fetchall()
-    ]
-    cur.execute("SELECT category, name, raw_value, score, extra_json FROM metrics WHERE run_id=?", (run_id,))
-    metrics_rows = cur.fetchall()
-    metrics = [
-        {
-            "category": c,
-            "name": n,
-            "raw_value": rv,
-            "score": sc,
-            "extra": json.loads(ej) if ej else None,
-        }
-        for (c, n, rv, sc, ej) in metrics_rows
-    ]
-    conn.close()
-    cols = ["id", "material_id", "coverage_score", "delivery_score", "pedagogy_score", "total_score", "weights_json", "created_at"]
-    run_obj = dict(zip(cols, run_row))
+_RUN_COLS = ["id", "material_id", "coverage_score", "delivery_score", "pedagogy_score", "total_score", "weights_json", "created_at"]
+_RUN_SELECT_SQL = "SELECT " + ", ".join(_RUN_COLS) + " FROM runs"
+
+# SQLite parametre limiti (eski sürümlerde 999) altında kalmak için IN listesi parça boyu
+_IN_CHUNK = 900
+
+
+def _chunked(ids: List[int], size: int = _IN_CHUNK) -> Iterator[List[int]]:
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def _run_obj(row: tuple) -> Dict[str, Any]:
+    run_obj = dict(zip(_RUN_COLS, row))
     if run_obj.get("weights_json"):
         try:
             run_obj["weights"] = json.loads(run_obj["weights_json"])
         except Exception:
             run_obj["weights"] = None
-    run_obj["topics"] = topics
-    run_obj["metrics"] = metrics
+    run_obj["topics"] = []
+    run_obj["metrics"] = []
     return run_obj
 
 
+def _attach_children(conn: sqlite3.Connection, runs: Dict[int, Dict[str, Any]]) -> None:
+    """topics + metrics satırlarını run başına tek sorgu yerine küme sorgularıyla bağla."""
+    ids = list(runs.keys())
+    for part in _chunked(ids):
+        marks = ",".join("?" * len(part))
+        for rid, t, s, sim in conn.execute(
+            f"SELECT run_id, topic, status, similarity FROM topics WHERE run_id IN ({marks}) ORDER BY run_id, id",
+            part,
+        ):
+            runs[rid]["topics"].append({"topic": t, "status": s, "similarity": sim})
+        for rid, c, n, rv, sc, ej in conn.execute(
+            f"SELECT run_id, category, name, raw_value, score, extra_json FROM metrics WHERE run_id IN ({marks}) ORDER BY run_id, id",
+            part,
+        ):
+            runs[rid]["metrics"].append({
+                "category": c,
+                "name": n,
+                "raw_value": rv,
+                "score": sc,
+                "extra": json.loads(ej) if ej else None,
+            })
+
+
+def fetch_runs_details_bulk(run_ids: List[int], db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Birden çok run'ın detayını (fetch_run_details şekli) küme sorgularıyla getir.
+
+    Sorgu sayısı run adedinden bağımsızdır (900'lük parçalar başına 3 sorgu).
+    Dönüş run_ids sırasındadır; bulunamayan id'ler atlanır.
+    """
+    ids = list(dict.fromkeys(int(r) for r in run_ids if r is not None))
+    if not ids:
+        return []
+    runs: Dict[int, Dict[str, Any]] = {}
+    # runs + topics + metrics aynı anlık görüntüden okunur (eşzamanlı yazıcı varken yarım run görünmez)
+    with get_engine(db_path).snapshot() as conn:
+        for part in _chunked(ids):
+            marks = ",".join("?" * len(part))
+            for row in conn.execute(f"{_RUN_SELECT_SQL} WHERE id IN ({marks})", part):
+                runs[row[0]] = _run_obj(row)
+        _attach_children(conn, runs)
+    return [runs[i] for i in ids if i in runs]
+
+
+def fetch_run_details(run_id: int, db_path: Optional[str] = None) -> Dict[str, Any]:
+    res = fetch_runs_details_bulk([run_id], db_path=db_path)
+    return res[0] if res else {}
+
+
+def iter_runs(
+    since: Optional[str] = None,
+    material: Optional[Any] = None,
+    page_size: int = 500,
+    with_details: bool = False,
+    db_path: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Run'ları kronolojik sırada sayfa sayfa (keyset pagination) dolaş.
+
+    - since: 'YYYY-MM-DD[ HH:MM:SS]' ve sonrası created_at
+    - material: material_id (int) veya filename (str)
+    - with_details: True ise her sayfanın topics/metrics'i toplu yüklenir
+    OFFSET kullanılmaz; her sayfa (created_at, id) anahtarından devam eder ve
+    kendi içinde tutarlı bir anlık görüntüden okunur.
+    """
+    eng = get_engine(db_path)
+    conn = eng.connection()
+    where: List[str] = []
+    params: List[Any] = []
+    if since:
+        where.append("created_at >= ?")
+        params.append(since)
+    if isinstance(material, int):
+        where.append("material_id = ?")
+        params.append(material)
+    elif material:
+        where.append("material_id IN (SELECT id FROM materials WHERE filename = ?)")
+        params.append(material)
+    page_size = max(1, int(page_size))
+    last: Optional[Tuple[Any, int]] = None
+    while True:
+        clauses = list(where)
+        args = list(params)
+        if last is not None:
+            clauses.append("(created_at, id) > (?, ?)")
+            args.extend(last)
+        sql = _RUN_SELECT_SQL
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at, id LIMIT ?"
+        with eng.snapshot():
+            rows = conn.execute(sql, args + [page_size]).fetchall()
+            page = {row[0]: _run_obj(row) for row in rows}
+            if with_details and page:
+                _attach_children(conn, page)
+        if not rows:
+            return
+        for row in rows:
+            run_obj = page[row[0]]
+            if not with_details:
+                run_obj.pop("topics", None)
+                run_obj.pop("metrics", None)
+            yield run_obj
+        if len(rows) < page_size:
+            return
+        last_row = rows[-1]
+        last = (last_row[7], last_row[0])
+
+
 __all__ = [
     "init_db",
     "insert_material",
@@ -319,7 +1078,23 @@ __all__ = [
     "insert_coverage_metrics",
     "insert_delivery_metrics",
     "insert_pedagogy_metrics",
+    "save_run",
     "fetch_recent_runs",
     "fetch_run_details",
+    "fetch_runs_details_bulk",
+    "iter_runs",
+    "find_material",
+    "ensure_material",
+    "chunk_count",
+    "save_chunks",
+    "load_chunks",
+    "load_index",
+    "ROLLUP_METRICS",
+    "rebuild_rollups",
+    "freeze_rollups",
+    "fetch_rollups",
     "get_connection",
+    "StorageEngine",
+    "get_engine",
+    "close_engines",
 ]
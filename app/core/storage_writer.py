@@ -0,0 +1,267 @@
+"""Storage için arka plan yazıcı (write-behind kuyruğu).
+
+Amaç: "Run Kaydet" gibi yazma işlemlerinin Streamlit script thread'ini
+bloklamaması.
+ - Sınırlı kuyruk (max_queue) + tek yazıcı thread (SQLite tek yazar kabul eder)
+ - Kuyruktaki işler `batch_max` adete kadar gruplanıp tek transaction'da
+   commit edilir; her iş kendi SAVEPOINT'i içinde çalışır, hata veren iş
+   yalnızca kendisini geri alır
+ - submit(...) / save_run(...) -> concurrent.futures.Future; sonuç ancak
+   ilgili batch commit edildikten sonra (kalıcı olduğunda) set edilir
+ - on_commit(info) callback'i her commit'ten sonra çağrılır (durability bildirimi)
+ - flush() bekleyen tüm işler commit edilene kadar bekler; close() flush + durdur
+ - Kuyruk doluyken davranış (on_full): block (block_timeout kadar bekle, sonra
+   queue.Full), raise (hemen queue.Full), sync (işi çağıran thread'de hemen yaz)
+
+Okumalar yazıcıdan bağımsız olarak WAL anlık görüntüsünden yapılır
+(`StorageEngine.snapshot`); yarım batch hiçbir zaman görünmez. Kendi yazdığını
+okumak isteyen çağıran önce `flush()` çağırmalıdır.
+
+Şema (`storage.init_db`) yazıcı thread'inin ilk işi olarak bir kez hazırlanır;
+çağıranın init_db çağırması gerekmez.
+
+Ayarlar `config/settings.yaml` > `app.storage_writer` altından okunur.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core import storage
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+DEFAULT_WRITER_CONFIG: Dict[str, Any] = {
+    'enabled': True,
+    'max_queue': 64,
+    'batch_max': 32,
+    'on_full': 'block',
+    'block_timeout': 5.0,
+}
+
+ON_FULL_POLICIES = ('block', 'raise', 'sync')
+
+
+def get_writer_config() -> Dict[str, Any]:
+    """config/settings.yaml > app.storage_writer ayarlarını varsayılanlarla birleştir."""
+    cfg = dict(DEFAULT_WRITER_CONFIG)
+    try:
+        from app.core.config import get_settings  # local import
+        writer = ((get_settings().get('app') or {}).get('storage_writer')) or {}
+        if isinstance(writer, dict):
+            cfg.update({k: v for k, v in writer.items() if v is not None})
+    except Exception:
+        pass
+    return cfg
+
+
+class StorageWriter:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        *,
+        max_queue: Optional[int] = None,
+        batch_max: Optional[int] = None,
+        on_full: Optional[str] = None,
+        block_timeout: Optional[float] = None,
+        on_commit: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        cfg = get_writer_config()
+        self.db_path = db_path
+        self.max_queue = max(1, int(max_queue or cfg.get('max_queue') or 64))
+        self.batch_max = max(1, int(batch_max or cfg.get('batch_max') or 32))
+        self.on_full = on_full or cfg.get('on_full') or 'block'
+        if self.on_full not in ON_FULL_POLICIES:
+            raise ValueError(f"Geçersiz on_full: {self.on_full}")
+        bt = cfg.get('block_timeout') if block_timeout is None else block_timeout
+        self.block_timeout = float(bt) if bt is not None else None
+        self.on_commit = on_commit
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_queue)
+        self._cond = threading.Condition()
+        self._pending = 0  # kuyrukta + işlenen batch'te, henüz commit edilmemiş iş
+        self._committed = 0
+        self._failed = 0
+        self._batches = 0
+        self._closed = False
+        self._ready = threading.Event()  # şema (init_db) yazıcı thread'inde hazırlandı
+        self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+        self._thread.start()
+
+    # -- yazıcı thread -----------------------------------------------------
+    def _run(self) -> None:
+        # init_db (DDL, kolon ekleme, rollup backfill) çağıranın thread'inde değil, burada bir kez
+        try:
+            storage.init_db(self.db_path)
+        except Exception as e:  # işler kendi hatalarıyla düşer
+            logger.error("Storage şeması hazırlanamadı: %s", e)
+        finally:
+            self._ready.set()
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            batch = [job]
+            stop = False
+            while len(batch) < self.batch_max:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Any]) -> None:
+        t0 = time.perf_counter()
+        outcomes: List[Any] = []
+        eng = storage.get_engine(self.db_path)
+        try:
+            with eng.transaction() as conn:
+                for fut, fn, args, kwargs in batch:
+                    if not fut.set_running_or_notify_cancel():
+                        outcomes.append(None)
+                        continue
+                    conn.execute("SAVEPOINT write_job")
+                    try:
+                        res = fn(*args, **kwargs)
+                        conn.execute("RELEASE write_job")
+                        outcomes.append(('ok', res))
+                    except BaseException as e:  # yalnız bu iş geri alınır
+                        conn.execute("ROLLBACK TO write_job")
+                        conn.execute("RELEASE write_job")
+                        outcomes.append(('err', e))
+        except BaseException as e:  # commit başarısız: batch'teki hiçbir iş kalıcı değil
+            logger.error("Storage batch commit başarısız: %s", e)
+            outcomes = [None if o is None else ('err', e) for o in outcomes]
+            outcomes += [('err', e)] * (len(batch) - len(outcomes))
+        ok = failed = 0
+        for (fut, _fn, _a, _kw), out in zip(batch, outcomes):
+            if out is None:
+                continue
+            if out[0] == 'ok':
+                ok += 1
+                fut.set_result(out[1])
+            else:
+                failed += 1
+                logger.error("Storage yazma işi başarısız: %s", out[1])
+                fut.set_exception(out[1])
+        info = {
+            'jobs': len(batch),
+            'committed': ok,
+            'failed': failed,
+            'latency_ms': (time.perf_counter() - t0) * 1000.0,
+        }
+        with self._cond:
+            self._committed += ok
+            self._failed += failed
+            self._batches += 1
+            self._pending -= len(batch)
+            self._cond.notify_all()
+        if self.on_commit is not None:
+            try:
+                self.on_commit(info)
+            except Exception as e:  # callback hatası yazıcıyı durdurmasın
+                logger.warning("on_commit callback hatası: %s", e)
+
+    # -- API ----------------------------------------------------------------
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Yazma işini kuyruğa ekle. fn yazıcı thread'inde, açık transaction içinde çalışır.
+
+        fn storage fonksiyonlarını (insert_*, save_run ...) çağırabilir; bunlar
+        iç içe transaction olarak batch'e katılır. `db_path` argümanı yazıcınınkiyle
+        aynı olmalıdır.
+        """
+        if self._closed:
+            raise RuntimeError("StorageWriter kapatıldı.")
+        fut: Future = Future()
+        job = (fut, fn, args, kwargs)
+        with self._cond:
+            self._pending += 1
+        try:
+            if self.on_full == 'block':
+                self._queue.put(job, block=True, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(job)
+        except queue.Full:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+            if self.on_full != 'sync':
+                raise
+            # Backpressure: kuyruk dolu -> çağıran thread'de senkron yaz
+            self._ready.wait()
+            if fut.set_running_or_notify_cancel():
+                try:
+                    with storage.get_engine(self.db_path).transaction():
+                        res = fn(*args, **kwargs)
+                    fut.set_result(res)
+                except BaseException as e:
+                    fut.set_exception(e)
+        return fut
+
+    def save_run(self, *args: Any, **kwargs: Any) -> Future:
+        """storage.save_run'ı arka planda çalıştır (Future -> save_run dönüşü)."""
+        kwargs.setdefault('db_path', self.db_path)
+        return self.submit(storage.save_run, *args, **kwargs)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Şu ana kadar gönderilen tüm işler commit edilene kadar bekle."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(timeout)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'queued': self._queue.qsize(),
+                'pending': self._pending,
+                'committed': self._committed,
+                'failed': self._failed,
+                'batches': self._batches,
+                'max_queue': self.max_queue,
+                'on_full': self.on_full,
+            }
+
+
+_WRITERS: Dict[str, StorageWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_storage_writer(db_path: Optional[str] = None) -> StorageWriter:
+    """DB yolu başına process genelinde paylaşılan yazıcı (Streamlit session'ları arasında)."""
+    key = db_path or storage.DEFAULT_DB_PATH
+    with _WRITERS_LOCK:
+        w = _WRITERS.get(key)
+        if w is None or w._closed:
+            w = StorageWriter(db_path)
+            _WRITERS[key] = w
+        return w
+
+
+__all__ = ['StorageWriter', 'get_storage_writer', 'get_writer_config']
@@ -1,18 +1,24 @@
-"""Basit (yarı) streaming STT katmanı.
+"""Streaming STT katmanı.
 
-Gerçek zamanlı model desteğimiz (faster-whisper incremental) olmadığından
-heuristik bir yaklaşım uygularız:
- - Küçük PCM/audio parçaları bir buffer'da biriktirilir
- - Toplam süre (tahmini) veya byte eşiği aşıldığında tam transcribe çağrılır
- - Yeni transcribe metni öncekiyle diff alınarak 'partial' güncellemesi üretir
+İki mod:
+ - mode='full' (varsayılan, eski davranış): buffer'ın tamamı her aralıkta yeniden
+   transcribe edilir ve önceki metinle prefix diff alınır.
+ - mode='incremental': sadece commit noktasından sonraki ses, kısa ve kayan bir
+   pencerede (en fazla `max_window_sec`) transcribe edilir. Ardışık iki hipotezde
+   aynı kalan kelimeler (local agreement) commit edilir; pencere, tamamen commit
+   edilmiş segmentlerin sonuna kaydırılır. Güncelleme maliyeti kayıt süresinden
+   bağımsızdır. Commit ve partial metin ayrı event'ler olarak döner.
 
-Bu yaklaşım düşük latency gerektiren durumlar için ideal değildir, ancak
-demo amaçlı "canlı akıyor" hissi verir.
+Incremental modda gelen bytes ham PCM kabul edilir (sample_rate, sample_width,
+channels) ve her pencere WAV konteynerine sarılarak modele verilir.
 """
 from __future__ import annotations
 from typing import Optional, Dict, Any, List
+import io
+import re
 import time
 import threading
+import wave
 
 from app.core.stt import transcribe_audio
 from app.core.logger import get_logger
@@ -30,6 +36,12 @@ class StreamingTranscriber:
         min_interval_sec: float = 4.0,
         min_bytes: int = 32_000,  # ~ birkaç sn PCM
         max_buffer_bytes: int = 2_000_000,
+        mode: str = 'full',
+        sample_rate: int = 16000,
+        sample_width: int = 2,
+        channels: int = 1,
+        max_window_sec: float = 15.0,
+        context_sec: float = 1.0,
     ) -> None:
         self.model_size = model_size
         self.use_real = use_real
@@ -42,6 +54,18 @@ class StreamingTranscriber:
         self._last_emit_time = 0.0
         self._lock = threading.Lock()
         self._closed = False
+        # incremental mod durumu
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self.max_window_sec = max_window_sec
+        self.context_sec = context_sec
+        self._pending_bytes = 0          # son güncellemeden beri gelen bytes
+        self._window_committed = 0       # penceredeki commit edilmiş kelime sayısı
+        self._prev_hyp: List[str] = []   # önceki hipotezin commit edilmemiş kısmı
+        self._committed: List[str] = []  # tüm commit edilmiş kelimeler
+        self._dedupe_next = False        # zorunlu kaydırma sonrası tekrar kontrolü
 
     def feed(self, chunk: bytes) -> Optional[Dict[str, Any]]:
         """Yeni audio bytes parçası besle.
@@ -59,6 +83,8 @@ class StreamingTranscriber:
         if self._closed:
             return None
         now = time.time()
+        if self.mode == 'incremental':
+            return self._feed_incremental(chunk, now)
         with self._lock:
             self._buffer.extend(chunk)
             # Çok büyümüşse kırp (en eski kısmı at) - basit halka buffer
@@ -95,11 +121,146 @@ class StreamingTranscriber:
             'cached': res.get('cached'),
         }
 
+    # --- incremental mod -------------------------------------------------
+    @property
+    def _bytes_per_sec(self) -> int:
+        return self.sample_rate * self.sample_width * self.channels
+
+    def _window_seconds(self) -> float:
+        return len(self._buffer) / float(self._bytes_per_sec or 1)
+
+    def _wav(self, pcm: bytes) -> bytes:
+        buf = io.BytesIO()
+        with wave.open(buf, 'wb') as w:
+            w.setnchannels(self.channels)
+            w.setsampwidth(self.sample_width)
+            w.setframerate(self.sample_rate)
+            w.writeframes(pcm)
+        return buf.getvalue()
+
+    def _drop_seconds(self, seconds: float) -> None:
+        frame = self.sample_width * self.channels
+        n = int(seconds * self._bytes_per_sec) // frame * frame
+        del self._buffer[:max(0, min(n, len(self._buffer)))]
+
+    def _commit(self, words: List[str]) -> List[str]:
+        if self._dedupe_next and words and self._committed:
+            words = _drop_repeated_prefix(self._committed, words)
+            self._dedupe_next = False
+        self._committed.extend(words)
+        return words
+
+    def _trim_window(self, segments: List[Dict[str, Any]], hyp_new: List[str]) -> List[str]:
+        """Pencere üst sınırı aşıldıysa commit edilmiş segmentleri pencereden çıkar.
+
+        Dönen: zorunlu kaydırmada commit edilen ek kelimeler.
+        """
+        if self._window_seconds() <= self.max_window_sec:
+            return []
+        cum = 0
+        cut_sec = None
+        cut_words = 0
+        for seg in segments:
+            cum += len((seg.get('text') or '').split())
+            if cum > self._window_committed:
+                break
+            cut_sec, cut_words = float(seg.get('end', 0.0)), cum
+        if cut_sec:
+            self._drop_seconds(cut_sec)
+            self._window_committed -= cut_words
+            return []
+        # Segment bilgisi yok / hiçbir segment tam commit değil: hipotezi commit et,
+        # sadece kısa bir bağlam bırakıp pencereyi kaydır.
+        forced = self._commit(hyp_new)
+        self._drop_seconds(self._window_seconds() - self.context_sec)
+        self._window_committed = 0
+        self._prev_hyp = []
+        self._dedupe_next = True
+        return forced
+
+    def _feed_incremental(self, chunk: bytes, now: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._buffer.extend(chunk)
+            self._pending_bytes += len(chunk)
+            if (now - self._last_emit_time) < self.min_interval_sec or self._pending_bytes < self.min_bytes:
+                return None
+            self._pending_bytes = 0
+            window = bytes(self._buffer)
+        res = transcribe_audio(
+            self._wav(window), lang=self.lang, model_size=self.model_size,
+            use_real=self.use_real, use_cache=False,
+        )
+        hyp = (res.get('text') or '').split()
+        with self._lock:
+            committed_before = len(self._committed)
+            hyp_new = hyp[self._window_committed:]
+            agreed = _common_prefix_len(self._prev_hyp, hyp_new)
+            committed_now = self._commit(hyp_new[:agreed])
+            self._window_committed += agreed
+            self._prev_hyp = hyp_new[agreed:]
+            committed_now += self._trim_window(res.get('segments') or [], self._prev_hyp)
+            partial = ' '.join(self._prev_hyp)
+            committed_text = ' '.join(self._committed)
+            self._last_full_text = (committed_text + ' ' + partial).strip()
+            self._last_emit_time = now
+            window_sec = self._window_seconds()
+        events: List[Dict[str, Any]] = []
+        if committed_now:
+            events.append({'type': 'commit', 'text': ' '.join(committed_now)})
+        events.append({'type': 'partial', 'text': partial})
+        new_text = ' '.join(committed_now)
+        if new_text and committed_before:
+            new_text = ' ' + new_text
+        return {
+            'events': events,
+            'committed_text': committed_text,
+            'partial_text': partial,
+            'full_text': self._last_full_text,
+            'new_text': new_text,
+            'window_seconds': window_sec,
+            'duration_seconds': res.get('duration_seconds'),
+            'model': res.get('model'),
+            'cached': res.get('cached'),
+        }
+
     def close(self) -> str:
-        """Akışı kapat ve son full text'i döndür."""
+        """Akışı kapat ve son full text'i döndür.
+
+        Incremental modda commit edilmemiş son hipotez de commit edilir.
+        """
         with self._lock:
             self._closed = True
+            if self.mode == 'incremental':
+                self._commit(self._prev_hyp)
+                self._prev_hyp = []
+                self._last_full_text = ' '.join(self._committed)
             return self._last_full_text
 
 
+_WORD_NORM_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def _norm(word: str) -> str:
+    return _WORD_NORM_RE.sub('', word.lower())
+
+
+def _common_prefix_len(a: List[str], b: List[str]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if _norm(x) != _norm(y):
+            break
+        n += 1
+    return n
+
+
+def _drop_repeated_prefix(committed: List[str], words: List[str], max_words: int = 12) -> List[str]:
+    """words başında, commit edilmiş metnin sonunu tekrarlayan kelimeleri at."""
+    tail = [_norm(w) for w in committed[-max_words:]]
+    head = [_norm(w) for w in words[:max_words]]
+    for k in range(min(len(tail), len(head)), 0, -1):
+        if tail[-k:] == head[:k]:
+            return words[k:]
+    return words
+
+
 __all__ = ['StreamingTranscriber']
@@ -12,6 +12,7 @@ from __future__ import annotations
 import hashlib
 import io
 import os
+import threading
 from typing import Any, Dict, List, Optional
 
 from app.core.logger import get_logger
@@ -20,6 +21,7 @@ logger = get_logger(__name__)
 
 _TRANSCRIPT_CACHE: Dict[str, Dict[str, Any]] = {}
 _MODEL_STORE: Dict[str, Any] = {}
+_MODEL_LOCK = threading.Lock()
 
 try:  # pragma: no cover (import branch)
     from faster_whisper import WhisperModel  # type: ignore
@@ -53,21 +55,57 @@ def _estimate_duration(data: bytes) -> float:
         return 0.0
 
 
-def _load_model(model_size: str = 'small'):
-    if not _FASTER_AVAILABLE:
-        return None
-    if model_size in _MODEL_STORE:
-        return _MODEL_STORE[model_size]
-    # device / compute_type heuristics
-    device = "cpu"
-    compute_type = "int8"
+DEFAULT_WORKER_CONFIG: Dict[str, Any] = {
+    'device': 'cpu',
+    'compute_type': 'int8',
+    'cpu_threads': 0,     # 0 -> CTranslate2 varsayılanı
+    'num_workers': 1,     # aynı model üzerinde eşzamanlı transcribe sayısı
+    'pool_size': 1,       # transcription service worker thread sayısı
+    'max_queue': 16,      # bekleyen iş üst sınırı
+}
+
+
+def get_worker_config() -> Dict[str, Any]:
+    """config/settings.yaml > stt.worker ayarlarını varsayılanlarla birleştir."""
+    cfg = dict(DEFAULT_WORKER_CONFIG)
     try:
-        m = WhisperModel(model_size, device=device, compute_type=compute_type)  # type: ignore
-        _MODEL_STORE[model_size] = m
-        return m
-    except Exception as e:
-        logger.error("WhisperModel yüklenemedi: %s", e)
+        from app.core.config import get_settings  # local import
+        worker = ((get_settings().get('stt') or {}).get('worker')) or {}
+        if isinstance(worker, dict):
+            cfg.update({k: v for k, v in worker.items() if v is not None})
+    except Exception:
+        pass
+    return cfg
+
+
+def _load_model(model_size: str = 'small', **overrides: Any):
+    if not _FASTER_AVAILABLE:
         return None
+    cfg = get_worker_config()
+    cfg.update({k: v for k, v in overrides.items() if v is not None})
+    device = str(cfg.get('device') or 'cpu')
+    compute_type = str(cfg.get('compute_type') or 'int8')
+    cpu_threads = int(cfg.get('cpu_threads') or 0)
+    num_workers = max(1, int(cfg.get('num_workers') or 1))
+    key = f"{model_size}|{device}|{compute_type}|{cpu_threads}|{num_workers}"
+    if key in _MODEL_STORE:
+        return _MODEL_STORE[key]
+    with _MODEL_LOCK:
+        if key in _MODEL_STORE:
+            return _MODEL_STORE[key]
+        try:
+            m = WhisperModel(  # type: ignore
+                model_size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+            )
+            _MODEL_STORE[key] = m
+            return m
+        except Exception as e:
+            logger.error("WhisperModel yüklenemedi: %s", e)
+            return None
 
 
 def _fake_result(duration: float, data_len: int) -> Dict[str, Any]:
@@ -117,15 +155,29 @@ def _openai_whisper_transcribe(data: bytes, lang: Optional[str]) -> Optional[Dic
         return None
 
 
-def transcribe_audio(data: bytes, *, lang: Optional[str] = None, model_size: str = 'small', use_real: bool = True) -> Dict[str, Any]:
+def transcribe_audio(
+    data: bytes,
+    *,
+    lang: Optional[str] = None,
+    model_size: str = 'small',
+    use_real: bool = True,
+    model_options: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
     """Ses bytes -> transcript sözlüğü döndür.
 
     Dönen sözlük anahtarları:
       text, segments(list), duration_seconds, language, model, cached
+
+    model_options: WhisperModel için device/compute_type/cpu_threads/num_workers
+    override'ları (verilmezse settings.yaml > stt.worker).
+    use_cache=False: sonuç hash cache'ine yazılmaz/okunmaz (streaming pencereleri gibi
+    tekrar etmeyecek kısa parçalar için; cache'in sınırsız büyümesini engeller).
     """
     file_hash = compute_file_hash(data)
-    if file_hash in _TRANSCRIPT_CACHE:
-        cached = _TRANSCRIPT_CACHE[file_hash].copy()
+    cache: Dict[str, Dict[str, Any]] = _TRANSCRIPT_CACHE if use_cache else {}
+    if file_hash in cache:
+        cached = cache[file_hash].copy()
         cached['cached'] = True
         return cached
 
@@ -143,25 +195,25 @@ def transcribe_audio(data: bytes, *, lang: Optional[str] = None, model_size: str
 
     if not use_real:
         res = _fake_result(duration, len(data))
-        _TRANSCRIPT_CACHE[file_hash] = res
+        cache[file_hash] = res
         return res
 
     if stt_provider == 'openai':
         res_openai = _openai_whisper_transcribe(data, lang)
         if res_openai:
-            _TRANSCRIPT_CACHE[file_hash] = res_openai
+            cache[file_hash] = res_openai
             return res_openai
         # OpenAI başarısızsa faster’a düşer
 
     if not _FASTER_AVAILABLE:
         res = _fake_result(duration, len(data))
-        _TRANSCRIPT_CACHE[file_hash] = res
+        cache[file_hash] = res
         return res
 
-    model = _load_model(model_size)
+    model = _load_model(model_size, **(model_options or {}))
     if model is None:
         res = _fake_result(duration, len(data))
-        _TRANSCRIPT_CACHE[file_hash] = res
+        cache[file_hash] = res
         return res
 
     try:
@@ -191,16 +243,17 @@ def transcribe_audio(data: bytes, *, lang: Optional[str] = None, model_size: str
             'model': f'faster-whisper-{model_size}',
             'cached': False,
         }
-        _TRANSCRIPT_CACHE[file_hash] = result
+        cache[file_hash] = result
         return result
     except Exception as e:
         logger.error("Transcribe başarısız: %s", e)
         res = _fake_result(duration, len(data))
-        _TRANSCRIPT_CACHE[file_hash] = res
+        cache[file_hash] = res
         return res
 
 
 __all__ = [
     'transcribe_audio',
     'compute_file_hash',
+    'get_worker_config',
 ]
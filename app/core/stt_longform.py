@@ -0,0 +1,282 @@
+"""Uzun ses kayıtları için pencereli (long-form) transcription.
+
+Akış:
+ 1. Ses mono 16 kHz PCM'e çözülür (faster-whisper `decode_audio`, yoksa WAV için stdlib `wave`).
+ 2. Enerji tabanlı basit VAD ile sessiz bölgeler bulunur.
+ 3. Kayıt en fazla `max_window_sec` uzunluğunda pencerelere, mümkünse sessizlik
+    ortasından bölünür; sessizlik yoksa `overlap_sec` örtüşmeli sert kesim yapılır.
+ 4. Pencereler transcription service worker havuzuna (stt_service) paralel gönderilir.
+ 5. Segmentler mutlak zaman damgalarıyla birleştirilir, örtüşme metni tekilleştirilir.
+
+Bir pencerenin başarısız olması diğerlerini etkilemez: sonuç `failed_windows`
+ve `partial=True` ile döner. İlerleme `on_progress(done, total, window)` ile bildirilir.
+NumPy veya ses çözme yoksa tek parça `transcribe_audio` çağrısına düşülür.
+"""
+from __future__ import annotations
+
+import io
+import re
+import wave
+from concurrent.futures import as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.logger import get_logger
+from app.core.stt import compute_file_hash, transcribe_audio, _TRANSCRIPT_CACHE
+
+logger = get_logger(__name__)
+
+try:  # pragma: no cover
+    import numpy as np  # type: ignore
+    _NUMPY = True
+except Exception:
+    np = None  # type: ignore
+    _NUMPY = False
+
+SAMPLE_RATE = 16000
+_WORD_NORM_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def decode_pcm(data: bytes, sample_rate: int = SAMPLE_RATE):
+    """Ses bytes -> mono float32 ndarray ([-1, 1]); çözülemezse None."""
+    if not _NUMPY:
+        return None
+    try:
+        from faster_whisper.audio import decode_audio  # type: ignore
+        return decode_audio(io.BytesIO(data), sampling_rate=sample_rate)
+    except Exception:
+        pass
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as w:
+            if w.getsampwidth() != 2:
+                return None
+            channels = w.getnchannels()
+            rate = w.getframerate()
+            raw = w.readframes(w.getnframes())
+        pcm = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+        if channels > 1:
+            pcm = pcm.reshape(-1, channels).mean(axis=1)
+        if rate != sample_rate and len(pcm):
+            n_out = int(round(len(pcm) * sample_rate / rate))
+            pcm = np.interp(np.linspace(0, len(pcm) - 1, n_out), np.arange(len(pcm)), pcm).astype(np.float32)
+        return pcm
+    except Exception:
+        return None
+
+
+def encode_wav(samples, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Mono float32 örnekleri 16-bit PCM WAV bytes'a çevir."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def find_silences(
+    samples,
+    sample_rate: int = SAMPLE_RATE,
+    *,
+    frame_ms: int = 30,
+    min_silence_ms: int = 300,
+    energy_threshold: Optional[float] = None,
+) -> List[Tuple[float, float]]:
+    """Enerji (RMS) tabanlı sessiz bölgeler: [(start_sec, end_sec), ...].
+
+    energy_threshold verilmezse yüksek enerjili çerçevelerin (95. persentil) %10'u kullanılır.
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return []
+    frames = np.asarray(samples[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    thr = energy_threshold if energy_threshold is not None else 0.1 * float(np.percentile(rms, 95))
+    silent = rms <= thr
+    # Ardışık sessiz çerçeve koşuları (run-length) vektörize bul
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    min_frames = max(1, int(min_silence_ms / frame_ms))
+    frame_sec = frame / sample_rate
+    return [
+        (float(s * frame_sec), float(e * frame_sec))
+        for s, e in zip(starts, ends)
+        if e - s >= min_frames
+    ]
+
+
+def plan_windows(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    *,
+    max_window_sec: float = 30.0,
+    min_window_sec: float = 5.0,
+    overlap_sec: float = 1.0,
+) -> List[Dict[str, float]]:
+    """Pencere planı: [{'start', 'end', 'overlap'}] (overlap: önceki pencereyle örtüşme sn)."""
+    cuts = [(s + e) / 2.0 for s, e in silences]
+    windows: List[Dict[str, float]] = []
+    cur = 0.0
+    overlap = 0.0
+    while cur < duration - 1e-6:
+        limit = cur + max_window_sec
+        if limit >= duration:
+            windows.append({'start': cur, 'end': duration, 'overlap': overlap})
+            break
+        candidates = [c for c in cuts if cur + min_window_sec <= c <= limit]
+        if candidates:
+            cut = candidates[-1]
+            windows.append({'start': cur, 'end': cut, 'overlap': overlap})
+            cur, overlap = cut, 0.0
+        else:
+            # Sessizlik yok: sert kes, sonraki pencere geriye örtüşsün
+            windows.append({'start': cur, 'end': limit, 'overlap': overlap})
+            overlap = min(overlap_sec, max_window_sec / 2.0)
+            cur = limit - overlap
+    return windows
+
+
+def _norm_words(text: str) -> List[str]:
+    return [_WORD_NORM_RE.sub('', w.lower()) for w in text.split()]
+
+
+def merge_overlap_text(prev_text: str, new_text: str, max_words: int = 12) -> str:
+    """new_text başındaki, prev_text sonuyla tekrarlanan kelimeleri at."""
+    prev = _norm_words(prev_text)[-max_words:]
+    words = new_text.split()
+    new = _norm_words(new_text)[:max_words]
+    for k in range(min(len(prev), len(new)), 0, -1):
+        if prev[-k:] == new[:k]:
+            return ' '.join(words[k:])
+    return new_text
+
+
+def _stitch(windows: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+    segments: List[Dict[str, Any]] = []
+    texts: List[str] = []
+    prev_end = None
+    for w in windows:
+        res = w.get('result')
+        if not res:
+            prev_end = None
+            continue
+        w_segments = res.get('segments') or []
+        if w_segments:
+            for seg in w_segments:
+                start = w['start'] + float(seg.get('start', 0.0))
+                end = w['start'] + float(seg.get('end', 0.0))
+                # Örtüşme bölgesi önceki pencereye ait: orta noktası oradaysa atla
+                if w['overlap'] and prev_end is not None and (start + end) / 2.0 < prev_end:
+                    continue
+                text = seg.get('text', '').strip()
+                if w['overlap'] and texts:
+                    text = merge_overlap_text(texts[-1], text)
+                if text:
+                    texts.append(text)
+                segments.append({'start': start, 'end': end, 'text': text})
+        else:
+            text = (res.get('text') or '').strip()
+            if w['overlap'] and texts:
+                text = merge_overlap_text(texts[-1], text)
+            if text:
+                texts.append(text)
+        prev_end = w['end']
+    return ' '.join(texts).strip(), segments
+
+
+def transcribe_long_audio(
+    data: bytes,
+    *,
+    lang: Optional[str] = None,
+    model_size: str = 'small',
+    use_real: bool = True,
+    max_window_sec: float = 30.0,
+    min_window_sec: float = 5.0,
+    overlap_sec: float = 1.0,
+    service: Any = None,
+    on_progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Uzun sesi pencerelere bölüp paralel transcribe et.
+
+    Dönen sözlük `transcribe_audio` alanlarına ek olarak:
+      windows: [{'start', 'end', 'overlap', 'status'}], failed_windows: [index], partial: bool
+    use_real iken 'fake' sonuç dönen pencere başarısız sayılır (metne eklenmez, sonuç cache'lenmez).
+    Not: service worker thread'inden çağrılmamalı (kendi kuyruğunu bekler).
+    """
+    file_hash = 'long:' + compute_file_hash(data)
+    if file_hash in _TRANSCRIPT_CACHE:
+        cached = _TRANSCRIPT_CACHE[file_hash].copy()
+        cached['cached'] = True
+        return cached
+
+    samples = decode_pcm(data)
+    if samples is None or len(samples) == 0:
+        return transcribe_audio(data, lang=lang, model_size=model_size, use_real=use_real)
+
+    duration = len(samples) / SAMPLE_RATE
+    silences = find_silences(samples)
+    plan = plan_windows(
+        duration, silences,
+        max_window_sec=max_window_sec, min_window_sec=min_window_sec, overlap_sec=overlap_sec,
+    )
+    if service is None:
+        from app.core.stt_service import get_transcription_service
+        service = get_transcription_service()
+
+    windows: List[Dict[str, Any]] = [dict(w, status='pending', result=None) for w in plan]
+    futures = {}
+    for i, w in enumerate(windows):
+        a = int(w['start'] * SAMPLE_RATE)
+        b = int(w['end'] * SAMPLE_RATE)
+        fut = service.submit(encode_wav(samples[a:b]), lang=lang, model_size=model_size, use_real=use_real)
+        futures[fut] = i
+
+    done = 0
+    for fut in as_completed(futures):
+        i = futures[fut]
+        try:
+            res = fut.result()
+            # transcribe_audio model/API hatasını yutup placeholder döndürür; gerçek modda hata sayılır
+            if use_real and res.get('model') == 'fake':
+                raise RuntimeError('model kullanılamadı (fake sonuç)')
+            windows[i]['result'] = res
+            windows[i]['status'] = 'done'
+        except Exception as e:
+            logger.warning("Pencere %d transcribe başarısız: %s", i, e)
+            windows[i]['status'] = 'failed'
+        done += 1
+        if on_progress:
+            try:
+                on_progress(done, len(windows), windows[i])
+            except Exception:
+                pass
+
+    text, segments = _stitch(windows)
+    failed = [i for i, w in enumerate(windows) if w['status'] != 'done']
+    languages = [w['result'].get('language') for w in windows if w.get('result') and w['result'].get('language')]
+    models = [w['result'].get('model') for w in windows if w.get('result')]
+    result = {
+        'text': text,
+        'segments': segments,
+        'duration_seconds': duration,
+        'language': languages[0] if languages else lang,
+        'model': models[0] if models else 'fake',
+        'cached': False,
+        'windows': [{k: w[k] for k in ('start', 'end', 'overlap', 'status')} for w in windows],
+        'failed_windows': failed,
+        'partial': bool(failed),
+    }
+    if not failed:
+        _TRANSCRIPT_CACHE[file_hash] = result
+    return result
+
+
+__all__ = [
+    'transcribe_long_audio',
+    'find_silences',
+    'plan_windows',
+    'merge_overlap_text',
+]
@@ -0,0 +1,152 @@
+"""Transcription service katmanı (iş kuyruğu + worker havuzu).
+
+Amaç: Streamlit script thread'ini bloklamadan transcribe işleri kabul etmek.
+ - Sınırlı kuyruk (max_queue) + sabit sayıda worker thread (pool_size)
+ - submit(...) -> concurrent.futures.Future (UI submit edip poll eder)
+ - queue_depth() / stats() ile kuyruk durumu raporu
+ - Modeller process başına bir kez yüklenir (stt._load_model cache'i) ve
+   worker'lar arasında paylaşılır; faster-whisper (CTranslate2) inference
+   sırasında GIL'i bıraktığı için thread tabanlı havuz yeterlidir.
+
+Ayarlar `config/settings.yaml` > `stt.worker` altından okunur
+(device, compute_type, cpu_threads, num_workers, pool_size, max_queue).
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+from app.core.logger import get_logger
+from app.core.stt import get_worker_config, transcribe_audio
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class TranscriptionService:
+    def __init__(
+        self,
+        *,
+        pool_size: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        model_options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        cfg = get_worker_config()
+        self.pool_size = max(1, int(pool_size or cfg.get('pool_size') or 1))
+        self.max_queue = max(1, int(max_queue or cfg.get('max_queue') or 16))
+        self.model_options = {
+            k: cfg.get(k) for k in ('device', 'compute_type', 'cpu_threads', 'num_workers')
+        }
+        if model_options:
+            self.model_options.update(model_options)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_queue)
+        self._lock = threading.Lock()
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"stt-worker-{i}", daemon=True)
+            for i in range(self.pool_size)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                fut, kwargs = job
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                with self._lock:
+                    self._running += 1
+                try:
+                    res = transcribe_audio(**kwargs)
+                    fut.set_result(res)
+                    with self._lock:
+                        self._completed += 1
+                except BaseException as e:  # future'a taşı, worker ölmesin
+                    logger.error("Transcribe işi başarısız: %s", e)
+                    fut.set_exception(e)
+                    with self._lock:
+                        self._failed += 1
+                finally:
+                    with self._lock:
+                        self._running -= 1
+            finally:
+                self._queue.task_done()
+
+    def submit(
+        self,
+        data: bytes,
+        *,
+        lang: Optional[str] = None,
+        model_size: str = 'small',
+        use_real: bool = True,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Future:
+        """İşi kuyruğa ekle ve Future döndür.
+
+        Kuyruk doluysa block=True iken yer açılana (veya timeout'a) kadar bekler;
+        block=False veya timeout dolarsa `queue.Full` fırlatılır.
+        """
+        if self._closed:
+            raise RuntimeError("TranscriptionService kapatıldı.")
+        fut: Future = Future()
+        kwargs = {
+            'data': data,
+            'lang': lang,
+            'model_size': model_size,
+            'use_real': use_real,
+            'model_options': self.model_options,
+        }
+        self._queue.put((fut, kwargs), block=block, timeout=timeout)
+        return fut
+
+    def queue_depth(self) -> int:
+        """Henüz bir worker tarafından alınmamış iş sayısı."""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'running': self._running,
+                'completed': self._completed,
+                'failed': self._failed,
+                'workers': self.pool_size,
+                'max_queue': self.max_queue,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        if wait:
+            for t in self._threads:
+                t.join()
+
+
+_SERVICE: Optional[TranscriptionService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_transcription_service() -> TranscriptionService:
+    """Process genelinde paylaşılan servis örneği (Streamlit session'ları arasında)."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = TranscriptionService()
+        return _SERVICE
+
+
+__all__ = ['TranscriptionService', 'get_transcription_service']
@@ -0,0 +1,133 @@
+"""Transkript için tek geçişlik metin profili (delivery + pedagogy ortak girdisi).
+
+delivery ve pedagogy modülleri aynı transkripti ayrı ayrı normalize edip
+cümlelere bölüyor, kelime regex'ini tekrar tekrar çalıştırıyordu. TextProfile
+metni bir kez tarar ve şunları saklar:
+
+ - tokens / word_spans : küçük harf token'lar ve kelime (start, end) ofsetleri
+ - counts              : token -> adet (Counter)
+ - sentence_spans      : cümle (start, end) ofsetleri (orijinal metinde)
+ - sentences / sentences_lower : satır sonları boşluğa çevrilmiş cümle metinleri
+                         (küçük harf sürümü aynı uzunlukta; eşleşme ofsetleri ikisinde de geçerli)
+ - pause_markers       : '...', '…', '--' ve boş satır sayısı
+
+Profil transkript hash'i (sha256) ile süreç içinde küçük bir LRU önbellekte
+tutulur (`get_text_profile`); konfig değişince yeniden skorlama yalnız
+normalizasyon hesabına mal olur.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import List, Optional, Tuple
+
+WORD_RE = re.compile(r"\b\w+\b", re.UNICODE)
+SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_NEWLINES_RE = re.compile(r"[\r\n]+")
+_PAUSE_RE = re.compile(r"(\.\.\.|…|--)")
+# 'İ'.lower() iki karakter ('i' + birleşik nokta) üretir; ofsetler korunsun ve
+# "İlk olarak" gibi cümle başları pattern'lerle eşleşsin diye önce 'i'ye çevrilir
+_LOWER_FIX = str.maketrans({'İ': 'i'})
+
+
+def lower_text(text: str) -> str:
+    """Uzunluğu koruyan küçük harf dönüşümü (İ -> i)."""
+    return text.translate(_LOWER_FIX).lower()
+
+_CACHE_SIZE = 16
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """Boşluk kırpılmış (start, end) cümle aralıkları; ayraç `SENT_SPLIT_RE`."""
+    bounds = [0]
+    for m in SENT_SPLIT_RE.finditer(text):
+        bounds.extend(m.span())
+    bounds.append(len(text))
+    out: List[Tuple[int, int]] = []
+    for i in range(0, len(bounds), 2):
+        s, e = bounds[i], bounds[i + 1]
+        piece = text[s:e]
+        stripped = piece.strip()
+        if stripped:
+            lead = len(piece) - len(piece.lstrip())
+            out.append((s + lead, s + lead + len(stripped)))
+    return out
+
+
+class TextProfile:
+    """Bir transkriptin tek seferde çıkarılmış kelime / cümle yapısı."""
+
+    __slots__ = (
+        'text', 'hash', '_word_spans', 'tokens', 'counts',
+        'sentence_spans', 'sentences', 'sentences_lower', 'pause_markers',
+    )
+
+    def __init__(self, text: str, hash_: Optional[str] = None):
+        self.text = text or ''
+        self.hash = hash_ or text_hash(self.text)
+        self._word_spans: Optional[List[Tuple[int, int]]] = None
+        self.tokens = WORD_RE.findall(lower_text(self.text))
+        self.counts = Counter(self.tokens)
+        self.sentence_spans = _sentence_spans(self.text)
+        self.sentences = [_NEWLINES_RE.sub(' ', self.text[s:e]) for s, e in self.sentence_spans]
+        self.sentences_lower = [lower_text(s) for s in self.sentences]
+        self.pause_markers = len(_PAUSE_RE.findall(self.text)) + self.text.count('\n\n')
+
+    @property
+    def word_spans(self) -> List[Tuple[int, int]]:
+        """Kelime (start, end) ofsetleri; yalnız konum gereken yerlerde ilk erişimde çıkarılır."""
+        if self._word_spans is None:
+            self._word_spans = [m.span() for m in WORD_RE.finditer(self.text)]
+        return self._word_spans
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def unique_words(self) -> int:
+        return len(self.counts)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_spans)
+
+    def sentence_word_ranges(self) -> List[Tuple[int, int]]:
+        """Her cümle için [ilk, son) kelime indeksi (word_spans üzerinde ikili arama)."""
+        starts = [s for s, _ in self.word_spans]
+        return [(bisect_left(starts, s), bisect_left(starts, e)) for s, e in self.sentence_spans]
+
+
+_CACHE: "OrderedDict[str, TextProfile]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def get_text_profile(text: str) -> TextProfile:
+    """Transkript hash'ine göre önbellekli profil (son `_CACHE_SIZE` metin)."""
+    key = text_hash(text or '')
+    with _CACHE_LOCK:
+        prof = _CACHE.get(key)
+        if prof is not None:
+            _CACHE.move_to_end(key)
+            return prof
+    prof = TextProfile(text, key)
+    with _CACHE_LOCK:
+        _CACHE[key] = prof
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return prof
+
+
+def clear_profile_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+__all__ = ['TextProfile', 'get_text_profile', 'clear_profile_cache', 'text_hash', 'lower_text']
@@ -27,6 +27,40 @@ def prepare_run_dataframe(runs: List[Dict[str, Any]]):  # type: ignore[override]
     return df
 
 
+def load_columnar_runs(base_dir: str, fmt: str = 'parquet', material=None, since_month=None):
+    """history_export ile yazılmış Parquet/Arrow dosyalarından trend DataFrame'i.
+
+    SQLite'a dokunmaz; çıktı prepare_run_dataframe ile aynı sıralama kuralına uyar.
+    """
+    from .history_export import load_runs_dataframe
+    df = load_runs_dataframe(base_dir, fmt=fmt, material=material, since_month=since_month)
+    sort_col = 'created_at' if 'created_at' in df.columns else 'id'
+    return df.sort_values([sort_col, 'id'] if sort_col != 'id' else 'id').reset_index(drop=True)
+
+
+def rollup_dataframe(rollups: List[Dict[str, Any]], stat: str = 'mean'):
+    """storage.fetch_rollups satırları -> kova başına bir satır, skor başına bir kolon.
+
+    stat: mean | min | max | last. Ek olarak 'bucket' ve 'count' (kovadaki run sayısı,
+    total_score üzerinden) kolonları bulunur. compute_basic_deltas / top_improvements
+    bu DataFrame ile doğrudan çalışır.
+    """
+    import pandas as pd
+    cols = ['bucket', 'count', 'total_score', 'coverage_score', 'delivery_score', 'pedagogy_score']
+    if not rollups:
+        return pd.DataFrame(columns=cols)
+    long_df = pd.DataFrame(rollups)
+    wide = long_df.pivot(index='bucket', columns='metric', values=stat)
+    counts = long_df.groupby('bucket')['count'].max()
+    wide.insert(0, 'count', counts)
+    wide = wide.reset_index().sort_values('bucket').reset_index(drop=True)
+    wide.columns.name = None
+    for c in cols:
+        if c not in wide.columns:
+            wide[c] = None
+    return wide
+
+
 def compute_basic_deltas(df):
     """İlk ve son run arasındaki delta sözlüğü.
     Yoksa boş dict.
@@ -81,6 +115,8 @@ def annotate_threshold_color(value: float) -> str:
 
 __all__ = [
     'prepare_run_dataframe',
+    'rollup_dataframe',
+    'load_columnar_runs',
     'compute_basic_deltas',
     'top_improvements',
     'annotate_threshold_color'
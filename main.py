@@ -5,8 +5,8 @@ Step 1: PDF/TXT Upload & Extraction UI
 
 import streamlit as st
 from app.core import ingestion
-from app.core.chunking import tokenize_and_chunk
-from app.core.embeddings import get_or_compute_embeddings
+from app.core.chunking import content_defined_chunks, tokenize_and_chunk
+from app.core.embeddings import get_or_compute_embeddings, update_embeddings
 from app.core.config import get_settings, get_validation
 from app.core.logger import get_logger
 
@@ -16,6 +16,27 @@ logger = get_logger()
 settings = get_settings()
 validation = get_validation()
 
+
+def _set_transcript(text: str, language=None, segments=None) -> None:
+    """Transkripti STT meta verisiyle (dil, segmentler) birlikte yaz.
+
+    Meta veri metnin hash'i ile saklanır; metin başka kaynaktan değişirse
+    (streaming, elle düzenleme) `_transcript_meta` boş döner.
+    """
+    from app.core.text_profile import text_hash
+    st.session_state['transcript_text'] = text
+    st.session_state['transcript_language'] = language
+    st.session_state['transcript_segments'] = segments or []
+    st.session_state['transcript_meta_hash'] = text_hash(text or '')
+
+
+def _transcript_meta(text: str):
+    """(language, segments) yalnız STT'nin ürettiği metinle eşleşiyorsa; aksi halde (None, [])."""
+    from app.core.text_profile import text_hash
+    if st.session_state.get('transcript_meta_hash') != text_hash(text or ''):
+        return None, []
+    return st.session_state.get('transcript_language'), st.session_state.get('transcript_segments') or []
+
 # Sidebar'da config & validation durumu
 with st.sidebar.expander("⚙️ Config & Validation", expanded=not validation['is_valid']):
     st.write({
@@ -47,7 +68,15 @@ if uploaded:
     else:
         raw_text = ""
         if uploaded.type == "application/pdf" or uploaded.name.lower().endswith(".pdf"):
-            raw_text = ingestion.read_pdf(uploaded.read())
+            pdf_bytes = uploaded.read()
+            n_pages = ingestion.count_pdf_pages(pdf_bytes) or 1
+            page_bar = st.progress(0.0, text="PDF sayfaları çıkarılıyor...")
+            page_texts = []
+            for page_no, page_text in ingestion.iter_pdf_pages(pdf_bytes, max_workers=4):
+                page_texts.append(page_text)
+                page_bar.progress(min(1.0, (page_no + 1) / n_pages), text=f"Sayfa {page_no + 1}/{n_pages}")
+            page_bar.empty()
+            raw_text = "\n".join(page_texts)
         else:
             raw_text = ingestion.read_txt(uploaded.read())
 
@@ -93,14 +122,63 @@ else:
     with col4:
         use_real_embed = st.checkbox("Gerçek Embedding", value=False, help="Gemini API key tanımlıysa gerçek modeli çağırır, yoksa fake fallback.")
     model_name = st.text_input("Embedding Model", value="text-embedding-004", help="Gerekirse model adını değiştir.")
+    _chunk_cfg = settings.get('chunking') or {}
+    _chunk_modes = {'fixed': "Sabit pencere (overlap)", 'content': "İçerik tabanlı (düzenlemede yalnız değişen chunk'lar)"}
+    _default_mode = _chunk_cfg.get('mode') if _chunk_cfg.get('mode') in _chunk_modes else 'fixed'
+    chunk_mode = st.radio(
+        "Chunk modu", list(_chunk_modes), index=list(_chunk_modes).index(_default_mode),
+        format_func=_chunk_modes.get, horizontal=True,
+        help="İçerik tabanlı modda sınırlar cümle hash'lerine bağlıdır; metin düzenlenince yalnız eklenen chunk'lar embed edilir (overlap uygulanmaz).",
+    )
+
+    # Aynı metin daha önce işlendiyse kayıtlı chunk + embedding'leri SQLite'tan aç
+    import hashlib
+    from app.core import storage as _stg_chunks
+    _db_path_chunks = (settings.get('app') or {}).get('db_path')
+    _text_hash = hashlib.sha256(st.session_state['source_text'].encode('utf-8')).hexdigest()
+    if st.session_state.get('material_text_hash') != _text_hash:
+        st.session_state.pop('material_id', None)
+        st.session_state['material_text_hash'] = _text_hash
+    # DB kontrolü (init_db DDL + sorgular) her widget rerun'ında değil, metin/model değişince bir kez
+    _chunk_check_key = (_text_hash, model_name, _db_path_chunks)
+    _chunk_check = st.session_state.get('stored_chunk_check')
+    if not _chunk_check or _chunk_check[0] != _chunk_check_key:
+        try:
+            _stg_chunks.init_db(_db_path_chunks)
+            _mid = _stg_chunks.find_material(_text_hash, db_path=_db_path_chunks)
+            _n = _stg_chunks.chunk_count(_mid, model=model_name, db_path=_db_path_chunks) if _mid else 0
+            _chunk_check = (_chunk_check_key, _mid, _n)
+            st.session_state['stored_chunk_check'] = _chunk_check
+        except Exception as e:
+            _chunk_check = (_chunk_check_key, None, 0)
+            logger.warning(f"Kayıtlı chunk kontrolü başarısız: {e}")
+    _, _stored_mid, _stored_n = _chunk_check
+    if _stored_n and 'embedded_chunks' not in st.session_state:
+        st.caption(f"Bu materyal için kayıtlı {_stored_n} chunk + embedding bulundu ({model_name}).")
+        if st.button("Kayıtlı Chunk/Embedding Yükle", type="secondary"):
+            stored = _stg_chunks.load_chunks(_stored_mid, model=model_name, db_path=_db_path_chunks)
+            st.session_state['material_id'] = _stored_mid
+            st.session_state['chunks'] = [{k: v for k, v in ch.items() if k != 'embedding'} for ch in stored]
+            st.session_state['embedded_chunks'] = stored
+            st.session_state['embedded_model'] = model_name
+            st.session_state['rag_index'] = _stg_chunks.load_index(_stored_mid, model=model_name, db_path=_db_path_chunks)
+            st.success("Kayıtlı chunk, embedding ve RAG indeksi yüklendi.")
 
     if st.button("Chunk Oluştur", type="primary"):
-        chunks = tokenize_and_chunk(
-            st.session_state['source_text'],
-            max_tokens=max_tokens,
-            overlap=overlap,
-            min_chunk_tokens=min_chunk_tokens,
-        )
+        if chunk_mode == 'content':
+            chunks = content_defined_chunks(
+                st.session_state['source_text'],
+                max_tokens=max_tokens,
+                min_chunk_tokens=min_chunk_tokens,
+                avg_sentences=int(_chunk_cfg.get('avg_sentences') or 8),
+            )
+        else:
+            chunks = tokenize_and_chunk(
+                st.session_state['source_text'],
+                max_tokens=max_tokens,
+                overlap=overlap,
+                min_chunk_tokens=min_chunk_tokens,
+            )
         st.session_state['chunks'] = chunks
         st.success(f"{len(chunks)} chunk üretildi.")
 
@@ -111,8 +189,25 @@ else:
                 st.code(f"{ch['id']} | tokens={ch['token_count']}\n" + ch['text'][:300] + ('...' if len(ch['text'])>300 else ''))
         if st.button("Embeddings Hesapla"):
             with st.spinner("Embedding hesaplanıyor / cache kontrol ediliyor..."):
-                embedded = get_or_compute_embeddings(st.session_state['chunks'], model=model_name, use_real=use_real_embed)
+                _prev = st.session_state.get('embedded_chunks')
+                if chunk_mode == 'content' and _prev and st.session_state.get('embedded_model') == model_name:
+                    # Önceki sürümde aynı içerikli chunk'lar vektörünü korur; yalnız eklenenler embed edilir
+                    _upd = update_embeddings(_prev, st.session_state['chunks'], model=model_name, use_real=use_real_embed)
+                    embedded = _upd['embedded']
+                    st.caption(f"{len(_upd['added'])} yeni chunk embed edildi, {len(embedded) - len(_upd['added'])} chunk yeniden kullanıldı, {len(_upd['removed'])} chunk düştü.")
+                else:
+                    embedded = get_or_compute_embeddings(st.session_state['chunks'], model=model_name, use_real=use_real_embed)
                 st.session_state['embedded_chunks'] = embedded
+                st.session_state['embedded_model'] = model_name
+                st.session_state.pop('rag_index', None)
+                # Kalıcı kayıt: yenileme / başka oturum aynı materyali tekrar hesaplamaz
+                try:
+                    mid = _stg_chunks.ensure_material(st.session_state.get('source_meta') or {}, _text_hash, db_path=_db_path_chunks)
+                    _stg_chunks.save_chunks(mid, embedded, model=model_name, db_path=_db_path_chunks)
+                    st.session_state['material_id'] = mid
+                    st.session_state.pop('stored_chunk_check', None)
+                except Exception as e:
+                    logger.warning(f"Chunk kaydı başarısız: {e}")
             if use_real_embed:
                 st.success("Embeddings hazır (GERÇEK veya fallback).")
             else:
@@ -183,17 +278,61 @@ Sonuç""".strip()
                 lang_override = st.text_input("Dil Override", value="", help="Boş bırak otomatik tespit (ör: en, tr, de)")
             with stt_cols[2]:
                 model_size = st.selectbox("Model Boyutu", ["tiny","base","small"], index=2)
+            _long_cfg = (settings.get('stt') or {}).get('longform') or {}
+            _long_min_bytes = float(_long_cfg.get('min_size_mb', 8)) * 1024 * 1024
+            long_mode = st.checkbox(
+                "Uzun kayıt modu (pencereli)",
+                value=bool(audio_file) and getattr(audio_file, 'size', 0) >= _long_min_bytes,
+                help=f"Kayıt sessizliklerden pencerelere bölünüp paralel transcribe edilir; {_long_cfg.get('min_size_mb', 8)} MB üstü dosyalarda varsayılan açık.",
+            )
+            stt_res = None
             if audio_file and st.button("Transcribe Çalıştır"):
-                from app.core.stt import transcribe_audio
                 data = audio_file.read()
-                with st.spinner("Ses çözümleniyor..."):
-                    res = transcribe_audio(data, lang=lang_override or None, model_size=model_size, use_real=use_real_stt)
-                st.session_state['transcript_text'] = res['text']
+                if long_mode:
+                    from app.core.stt_longform import transcribe_long_audio
+                    stt_progress = st.progress(0.0, text="Pencereler hazırlanıyor...")
+
+                    def _on_window(done, total, window):
+                        stt_progress.progress(done / total, text=f"Pencere {done}/{total} ({window['start']:.0f}-{window['end']:.0f} sn: {window['status']})")
+
+                    try:
+                        stt_res = transcribe_long_audio(
+                            data, lang=lang_override or None, model_size=model_size, use_real=use_real_stt,
+                            max_window_sec=float(_long_cfg.get('max_window_sec', 30.0)),
+                            overlap_sec=float(_long_cfg.get('overlap_sec', 1.0)),
+                            on_progress=_on_window,
+                        )
+                    except Exception as e:
+                        st.error(f"Transcribe başarısız: {e}")
+                    stt_progress.empty()
+                else:
+                    from app.core.stt_service import get_transcription_service
+                    st.session_state['stt_future'] = get_transcription_service().submit(
+                        data, lang=lang_override or None, model_size=model_size, use_real=use_real_stt
+                    )
+            if 'stt_future' in st.session_state:
+                stt_future = st.session_state['stt_future']
+                if not stt_future.done():
+                    from app.core.stt_service import get_transcription_service
+                    svc_stats = get_transcription_service().stats()
+                    st.info(f"Transcribe işi sırada/çalışıyor (kuyruk: {svc_stats['queued']}, aktif: {svc_stats['running']}).")
+                    st.button("Durumu Yenile")
+                else:
+                    st.session_state.pop('stt_future', None)
+                    try:
+                        stt_res = stt_future.result()
+                    except Exception as e:
+                        st.error(f"Transcribe başarısız: {e}")
+            if stt_res:
+                res = stt_res
+                _set_transcript(res['text'], res.get('language'), res.get('segments'))
                 # Süreyi set et (mevcut duration 0 ise veya kullanıcı henüz girmediyse)
                 auto_minutes = (res.get('duration_seconds') or 0.0) / 60.0
                 if auto_minutes > 0:
                     st.session_state['auto_duration_min'] = auto_minutes
                 st.success(f"Transcribe tamamlandı (model={res['model']} cached={res['cached']}).")
+                if res.get('partial'):
+                    st.warning(f"{len(res['failed_windows'])}/{len(res['windows'])} pencere transcribe edilemedi; metin eksik olabilir (sonuç cache'lenmedi).")
                 with st.expander("Transcribe Çıktısı", expanded=False):
                     st.text_area("Metin", value=res['text'][:5000], height=200)
                 if res.get('segments'):
@@ -237,7 +376,11 @@ Sonuç""".strip()
                 with col_m1:
                     streaming_mode = st.checkbox("Canlı Streaming", value=False, help="Deneysel: belirli aralıklarla partial transcript üretir.")
                     if streaming_mode and 'stream_transcriber' not in st.session_state:
-                        st.session_state['stream_transcriber'] = StreamingTranscriber(use_real=use_real_stt, model_size=model_size, lang=lang_override or None)
+                        # WebRTC frame'leri: 48 kHz, s16, interleaved stereo PCM
+                        st.session_state['stream_transcriber'] = StreamingTranscriber(
+                            use_real=use_real_stt, model_size=model_size, lang=lang_override or None,
+                            mode='incremental', sample_rate=48000, channels=2,
+                        )
                     if not st.session_state['mic_recording']:
                         if st.button("Kaydı Başlat"):
                             st.session_state['mic_recording'] = True
@@ -245,6 +388,13 @@ Sonuç""".strip()
                             st.session_state['mic_recording_started'] = time.time()
                             if streaming_mode:
                                 st.session_state['stream_partial_text'] = ""
+                                from app.core.live_metrics import LiveMetrics
+                                # Canlı skorlar: commit edilen delta'lar artımlı tüketilir
+                                st.session_state['live_metrics'] = LiveMetrics(
+                                    delivery_config=(settings.get('metrics') or {}).get('delivery') or {},
+                                    pedagogy_config=(settings.get('metrics') or {}).get('pedagogy') or {},
+                                    language=lang_override or None,
+                                )
                             st.info("Kayıt başladı...")
                     else:
                         if st.button("Kaydı Bitir"):
@@ -259,7 +409,8 @@ Sonuç""".strip()
                             else:
                                 with st.spinner("Mikrofon kaydı işleniyor..."):
                                     res = _mic_transcribe(raw_bytes, lang=None, model_size=model_size, use_real=use_real_stt)
-                                st.session_state['transcript_text'] = res['text'] or st.session_state.get('transcript_text', '')
+                                if res['text']:
+                                    _set_transcript(res['text'], res.get('language'), res.get('segments'))
                                 dur_min = (res.get('duration_seconds') or 0.0) / 60.0
                                 if dur_min > 0:
                                     st.session_state['auto_duration_min'] = dur_min
@@ -270,7 +421,8 @@ Sonuç""".strip()
                             if streaming_mode and 'stream_transcriber' in st.session_state:
                                 final_full = st.session_state['stream_transcriber'].close()
                                 if final_full:
-                                    st.session_state['transcript_text'] = final_full
+                                    # streaming metni segment zaman damgası taşımaz
+                                    _set_transcript(final_full, language=lang_override or None)
                                 st.session_state.pop('stream_transcriber', None)
                 with col_m2:
                     if st.session_state.get('mic_recording'):
@@ -284,14 +436,26 @@ Sonuç""".strip()
                             if collected:
                                 chunk_bytes = b"".join(collected)
                                 partial = st.session_state['stream_transcriber'].feed(chunk_bytes)
-                                if partial and partial.get('new_text'):
-                                    existing = st.session_state.get('stream_partial_text','')
-                                    st.session_state['stream_partial_text'] = existing + partial['new_text']
+                                if partial:
+                                    # commit edilmiş metin + kararsız son hipotez
+                                    st.session_state['stream_partial_text'] = partial.get('full_text', '')
+                                    if 'live_metrics' in st.session_state and partial.get('new_text'):
+                                        st.session_state['live_metrics'].feed(partial['new_text'])
                 with col_m3:
                     st.write("Durum: "+ ("Kayıt" if st.session_state.get('mic_recording') else "Hazır"))
                     if streaming_mode and st.session_state.get('mic_recording'):
                         st.markdown("**Canlı Partial:**")
                         st.text_area("Partial", value=st.session_state.get('stream_partial_text','')[-1000:], height=150)
+                        live = st.session_state.get('live_metrics')
+                        if live is not None:
+                            elapsed_min = (time.time() - st.session_state.get('mic_recording_started', time.time())) / 60.0
+                            snap = live.snapshot(duration_minutes=elapsed_min)
+                            d_raw = snap['delivery']['raw']
+                            lc1, lc2, lc3, lc4 = st.columns(4)
+                            lc1.metric("WPM", f"{d_raw['wpm']:.0f}")
+                            lc2.metric("Filler", d_raw['filler_count'])
+                            lc3.metric("Delivery", f"{snap['delivery']['scores']['delivery_score']:.2f}")
+                            lc4.metric("Pedagogy", f"{snap['pedagogy']['scores']['pedagogy_score']:.2f}")
             except Exception as e:
                 st.info(f"Mikrofon modu kullanılamıyor: {e}")
         # --- /STT Bölümü ---
@@ -299,19 +463,28 @@ Sonuç""".strip()
             default_tx = st.session_state.get('transcript_text') or st.session_state['source_text'][:1000]
             transcript_text = st.text_area("Transkript", value=default_tx, height=200)
             st.session_state['transcript_text'] = transcript_text
+        # dil / segmentler yalnız STT'nin ürettiği metin değişmeden duruyorsa geçerli
+        transcript_language, transcript_segments = _transcript_meta(transcript_text)
         colA, colB = st.columns(2)
         with colA:
             prefill_dur = st.session_state.get('auto_duration_min', 0.0)
             duration_min = st.number_input("Süre (dakika)", min_value=0.0, value=prefill_dur, step=0.5, help="0 girersen tahmini süre (150 WPM varsayımı) kullanılır.")
         with colB:
             show_config = st.checkbox("Konfig detaylarını göster", value=False)
+            use_segments = st.checkbox(
+                "STT zaman damgalarını kullan", value=bool(transcript_segments),
+                disabled=not transcript_segments,
+                help="Süre, sessizlikler ve WPM zaman serisi STT segmentlerinden hesaplanır.",
+            )
         if st.button("Delivery Hesapla", type="primary"):
             from app.core.delivery import compute_delivery_metrics
             # Yeni config modülü üzerinden al
             delivery_cfg = (settings.get('metrics') or {}).get('delivery', {}) or {}
             custom_cfg = dict(delivery_cfg)
             with st.spinner("Delivery metrikleri hesaplanıyor..."):
-                res = compute_delivery_metrics(transcript_text, duration_minutes=duration_min, config=custom_cfg)
+                res = compute_delivery_metrics(transcript_text, duration_minutes=duration_min, config=custom_cfg,
+                                               language=transcript_language,
+                                               segments=transcript_segments if use_segments else None)
                 st.session_state['delivery'] = res
             st.success("Delivery analizi tamam.")
         if 'delivery' in st.session_state:
@@ -334,6 +507,28 @@ Sonuç""".strip()
                 st.write({k: v for k, v in raw.items() if k != 'insufficient_data'})
                 if raw['insufficient_data']:
                     st.warning("Kelime sayısı çok düşük: Normalizasyon devre dışı (0 skor). Daha uzun transkript sağlayın.")
+            timeline = res.get('timeline')
+            if timeline and timeline.get('wpm'):
+                with st.expander("Zaman Serisi (segment modu)", expanded=False):
+                    import pandas as pd
+                    st.line_chart(pd.DataFrame({'WPM': timeline['wpm']}, index=[round(t / 60.0, 2) for t in timeline['t']]))
+                    st.caption(f"Pencere {timeline['window_sec']:.0f} sn, adım {timeline['step_sec']:.0f} sn (x: dakika)")
+                    if timeline.get('pauses'):
+                        st.write(f"Uzun duraklamalar ({len(timeline['pauses'])})")
+                        st.dataframe(pd.DataFrame(timeline['pauses']), use_container_width=True)
+                    if timeline.get('bursts'):
+                        st.write(f"Hız patlamaları ({len(timeline['bursts'])})")
+                        st.dataframe(pd.DataFrame(timeline['bursts']), use_container_width=True)
+            fill = res.get('fillers')
+            if fill:
+                with st.expander(f"Filler Detayı (dil: {fill['language']})", expanded=False):
+                    per_min = fill.get('per_minute')
+                    st.write(f"Toplam: {fill['count']} | Dakika başı: {per_min:.2f}" if per_min is not None else f"Toplam: {fill['count']}")
+                    if fill.get('counts'):
+                        st.bar_chart(fill['counts'])
+                    if fill.get('by_minute'):
+                        st.caption("Dakika bazında filler sayısı")
+                        st.bar_chart(fill['by_minute'])
             if show_config:
                 with st.expander("Kullanılan Konfig", expanded=False):
                     st.write(res['config_used'])
@@ -436,26 +631,42 @@ Sonuç""".strip()
             if st.button("Run Kaydet", type="primary"):
                 try:
                     from app.core import storage
-                    storage.init_db(db_path)
+                    from app.core.storage_writer import get_storage_writer, get_writer_config
                     source_meta = st.session_state.get('source_meta') or {
                         'filename':'bilinmiyor.txt',
                         'size_mb': None,
                         'stats': {}
                     }
-                    material_id = storage.insert_material(source_meta, db_path=db_path)
-                    run_id = storage.insert_run(material_id, agg, coverage=cov_obj, delivery=del_obj, pedagogy=ped_obj, db_path=db_path)
-                    if cov_obj:
-                        storage.bulk_insert_topics(run_id, cov_obj, db_path=db_path)
-                        storage.insert_coverage_metrics(run_id, cov_obj, db_path=db_path)
-                    if del_obj:
-                        storage.insert_delivery_metrics(run_id, del_obj, db_path=db_path)
-                    if ped_obj:
-                        storage.insert_pedagogy_metrics(run_id, ped_obj, db_path=db_path)
-                    st.session_state['last_run_id'] = run_id
-                    st.success(f"Run kaydedildi (ID={run_id}).")
+                    save_kwargs = dict(coverage=cov_obj, delivery=del_obj, pedagogy=ped_obj, db_path=db_path,
+                                       material_id=st.session_state.get('material_id'))
+                    if get_writer_config().get('enabled'):
+                        # Arka planda yaz; sayfa commit'i (ve init_db) beklemez — şemayı yazıcı thread'i hazırlar
+                        st.session_state['save_future'] = get_storage_writer(db_path).save_run(source_meta, agg, **save_kwargs)
+                    else:
+                        from concurrent.futures import Future
+                        storage.init_db(db_path)
+                        fut = Future()
+                        fut.set_result(storage.save_run(source_meta, agg, **save_kwargs))
+                        st.session_state['save_future'] = fut
                 except Exception as e:
                     st.error(f"Kayıt başarısız: {e}")
 
+            if 'save_future' in st.session_state:
+                save_future = st.session_state['save_future']
+                if not save_future.done():
+                    st.info("Run kaydediliyor...")
+                    st.button("Durumu Yenile", key="save_refresh")
+                else:
+                    st.session_state.pop('save_future', None)
+                    try:
+                        saved = save_future.result()
+                        run_id = saved['run_id']
+                        st.session_state['last_run_id'] = run_id
+                        counts = saved['counts']
+                        st.success(f"Run kaydedildi (ID={run_id}, {counts['topics']} topic, {counts['metrics']} metrik).")
+                    except Exception as e:
+                        st.error(f"Kayıt başarısız: {e}")
+
             if 'last_run_id' in st.session_state:
                 st.info(f"Son kaydedilen run ID: {st.session_state['last_run_id']}")
 
@@ -622,11 +833,12 @@ Sonuç""".strip()
                     load_btn = st.button("Run Detay Yükle", type="secondary")
                     if load_btn and sel_run:
                         try:
-                            run_a = _stg.fetch_run_details(sel_run, db_path=db_path)
-                            st.session_state['history_run_a'] = run_a
-                            if sel_run_b:
-                                run_b = _stg.fetch_run_details(sel_run_b, db_path=db_path)
-                                st.session_state['history_run_b'] = run_b
+                            # A ve B tek seferde (küme sorguları)
+                            details = _stg.fetch_runs_details_bulk([sel_run, sel_run_b], db_path=db_path)
+                            by_id = {d['id']: d for d in details}
+                            st.session_state['history_run_a'] = by_id.get(sel_run, {})
+                            if sel_run_b and sel_run_b in by_id:
+                                st.session_state['history_run_b'] = by_id[sel_run_b]
                             else:
                                 st.session_state.pop('history_run_b', None)
                             st.success("Run detay(ları) yüklendi.")
@@ -691,6 +903,32 @@ Sonuç""".strip()
                                 st.dataframe(df_cmp, use_container_width=True)
                         except Exception as e:
                             st.error(f"Karşılaştırma hatası: {e}")
+
+                    # Çoklu karşılaştırma (run × metrik matrisi)
+                    with st.expander("Çoklu Run Karşılaştırma", expanded=False):
+                        multi_ids = st.multiselect("Run'lar (sıra = seçim sırası)", run_ids, key="run_select_multi")
+                        baseline_opt = st.selectbox("Baz", ['first', 'previous', 'mean'], key="run_multi_baseline",
+                                                    help="first: ilk run, previous: bir önceki run, mean: metrik ortalaması")
+                        if st.button("Çoklu Karşılaştır", key="run_multi_btn") and len(multi_ids) >= 2:
+                            try:
+                                from app.core.history import compare_many
+                                # sonuç session'da tutulur; tablo seçimi (radio) rerun'ında kaybolmasın
+                                st.session_state['run_multi_result'] = compare_many(
+                                    multi_ids, baseline=baseline_opt, db_path=db_path)
+                            except Exception as e:
+                                st.session_state.pop('run_multi_result', None)
+                                st.error(f"Çoklu karşılaştırma hatası: {e}")
+                        res_many = st.session_state.get('run_multi_result')
+                        if res_many:
+                            import pandas as pd
+                            st.dataframe(pd.DataFrame(res_many['runs']), use_container_width=True)
+                            metric_cols = [f"{m['category']}.{m['name']}" for m in res_many['metrics']]
+                            view = st.radio("Tablo", ["Delta", "Skor", "Yüzdelik", "Rank Değişimi"], horizontal=True,
+                                            key="run_multi_view")
+                            key_map = {"Delta": 'deltas', "Skor": 'scores', "Yüzdelik": 'percentiles',
+                                       "Rank Değişimi": 'rank_changes'}
+                            st.dataframe(pd.DataFrame(res_many[key_map[view]], index=res_many['run_ids'],
+                                                      columns=metric_cols), use_container_width=True)
             except Exception as e:
                 st.warning(f"Run history yüklenemedi: {e}")
 
@@ -700,41 +938,57 @@ Sonuç""".strip()
         st.header("📉 Adım 7: Trend & Progress")
         st.caption("Run skorlarının zaman içindeki gelişimini incele.")
         from app.core import storage as _stg2
-        from app.core.trends import prepare_run_dataframe, compute_basic_deltas, top_improvements
+        from app.core.trends import prepare_run_dataframe, rollup_dataframe, compute_basic_deltas, top_improvements
         db_path2 = (settings.get('app') or {}).get('db_path')
-        try:
-            all_runs = _stg2.fetch_recent_runs(limit=200, db_path=db_path2)
-        except Exception as e:
-            all_runs = []
-            st.warning(f"Run sorgusu başarısız: {e}")
-        run_count = len(all_runs)
-        if run_count < 2:
-            st.info("Trend analizi için en az 2 run gerekli.")
-        else:
-            # Slider min<max zorunluluğu nedeniyle run_count==2 özel durumu ele al
-            min_allowed = 2
-            max_allowed = min(50, run_count)
-            if max_allowed <= min_allowed:
-                # Tam olarak 2 run var; slider yerine sabit değer göster
-                max_n = 2
-                st.caption("2 run bulundu – tümü gösteriliyor.")
+        granularity = st.radio("Görünüm", ["Gün", "Hafta", "Run"], horizontal=True, key="trend_granularity",
+                               help="Gün/Hafta: önceden hesaplanmış rollup tablosundan (ortalama) okunur.")
+        df = None
+        x_col = 'id'
+        if granularity == "Run":
+            try:
+                all_runs = _stg2.fetch_recent_runs(limit=200, db_path=db_path2)
+            except Exception as e:
+                all_runs = []
+                st.warning(f"Run sorgusu başarısız: {e}")
+            run_count = len(all_runs)
+            if run_count < 2:
+                st.info("Trend analizi için en az 2 run gerekli.")
             else:
-                default_val = min(10, max_allowed)
-                max_n = st.slider(
-                    "Kaç run gösterilsin?",
-                    min_value=min_allowed,
-                    max_value=max_allowed,
-                    value=default_val,
-                )
-            subset = list(reversed(all_runs))[:max_n]
-            subset = list(reversed(subset))  # kronolojik sıra
-            df = prepare_run_dataframe(subset)
+                # Slider min<max zorunluluğu nedeniyle run_count==2 özel durumu ele al
+                min_allowed = 2
+                max_allowed = min(50, run_count)
+                if max_allowed <= min_allowed:
+                    # Tam olarak 2 run var; slider yerine sabit değer göster
+                    max_n = 2
+                    st.caption("2 run bulundu – tümü gösteriliyor.")
+                else:
+                    default_val = min(10, max_allowed)
+                    max_n = st.slider(
+                        "Kaç run gösterilsin?",
+                        min_value=min_allowed,
+                        max_value=max_allowed,
+                        value=default_val,
+                    )
+                subset = list(reversed(all_runs))[:max_n]
+                subset = list(reversed(subset))  # kronolojik sıra
+                df = prepare_run_dataframe(subset)
+        else:
+            period = 'day' if granularity == "Gün" else 'week'
+            try:
+                df = rollup_dataframe(_stg2.fetch_rollups(period=period, db_path=db_path2))
+            except Exception as e:
+                st.warning(f"Rollup sorgusu başarısız: {e}")
+            x_col = 'bucket'
+            if df is None or len(df) < 2:
+                st.info("Trend analizi için en az 2 dönem gerekli.")
+                df = None
+        if df is not None:
             import pandas as pd
             score_cols = ['total_score','coverage_score','delivery_score','pedagogy_score']
             # Line chart (Altair opsiyonel yoksa built-in)
-            chart_df = df[['id'] + [c for c in score_cols if c in df.columns]].copy()
-            chart_df = chart_df.melt(id_vars='id', var_name='metric', value_name='value')
-            st.line_chart(chart_df, x='id', y='value', color='metric')
+            chart_df = df[[x_col] + [c for c in score_cols if c in df.columns]].copy()
+            chart_df = chart_df.melt(id_vars=x_col, var_name='metric', value_name='value')
+            st.line_chart(chart_df, x=x_col, y='value', color='metric')
             deltas = compute_basic_deltas(df)
             if deltas:
                 st.subheader("Delta (İlk vs Son Run)")
@@ -760,7 +1014,7 @@ Sonuç""".strip()
                     for m, d in imp['declined']:
                         st.write(f"{m}: {d:.3f}")
             with st.expander("Skor Tablosu", expanded=False):
-                st.dataframe(df[['id'] + score_cols], use_container_width=True)
+                st.dataframe(df[[x_col] + score_cols], use_container_width=True)
 
         # ------------------------------------------------------------------
         # Adım 8: RAG Soru-Cevap
@@ -0,0 +1,66 @@
+"""Run kaydetme benchmark scripti (eski çağrı zinciri vs save_run).
+Çalıştırma: python scripts/bench_storage_save.py [adet]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from app.core import storage  # noqa
+
+SOURCE_META = {'filename': 'bench.pdf', 'size_mb': 1.0, 'stats': {'chars': 5000, 'words': 900, 'approx_tokens': 1200}}
+SCORING = {'total_score': 0.74, 'weights_used': {'coverage': 0.5, 'delivery': 0.3, 'pedagogy': 0.2}}
+COVERAGE = {
+    'summary': {'covered': 8, 'partial': 2, 'missing': 2, 'coverage_ratio': 0.72},
+    'topics': [{'topic': f'Konu {i}', 'status': 'covered', 'similarity': 0.8} for i in range(12)],
+}
+DELIVERY = {
+    'raw': {'wpm': 142, 'filler_ratio': 0.03, 'lexical_diversity': 0.55, 'avg_sentence_length': 15, 'pause_ratio': 0.07},
+    'scores': {'wpm': 0.9, 'filler_ratio': 0.8, 'lexical_diversity': 0.7, 'avg_sentence_length': 0.9, 'pause_ratio': 0.8, 'delivery_score': 0.82},
+}
+PEDAGOGY = {
+    'raw': {'examples': 3, 'questions': 2, 'signposting': 4, 'definitions': 1, 'summary': 1},
+    'scores': {'examples': 0.7, 'questions': 0.6, 'signposting': 0.8, 'definitions': 0.5, 'summary': 0.6, 'balance_bonus': 0.1, 'pedagogy_score': 0.66},
+}
+
+
+def save_chain(db_path):
+    mid = storage.insert_material(SOURCE_META, db_path=db_path)
+    rid = storage.insert_run(mid, SCORING, coverage=COVERAGE, delivery=DELIVERY, pedagogy=PEDAGOGY, db_path=db_path)
+    storage.bulk_insert_topics(rid, COVERAGE, db_path=db_path)
+    storage.insert_coverage_metrics(rid, COVERAGE, db_path=db_path)
+    storage.insert_delivery_metrics(rid, DELIVERY, db_path=db_path)
+    storage.insert_pedagogy_metrics(rid, PEDAGOGY, db_path=db_path)
+
+
+def save_atomic(db_path):
+    storage.save_run(SOURCE_META, SCORING, coverage=COVERAGE, delivery=DELIVERY, pedagogy=PEDAGOGY, db_path=db_path)
+
+
+def bench(fn, n):
+    tmpdir = tempfile.mkdtemp()
+    db_path = os.path.join(tmpdir, 'bench.db')
+    storage.init_db(db_path)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn(db_path)
+    return time.perf_counter() - t0
+
+
+def run():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    t_chain = bench(save_chain, n)
+    t_atomic = bench(save_atomic, n)
+    print(f"{n} kayıt")
+    print(f"  zincir   : {t_chain:.3f}s ({n / t_chain:.0f} run/s)")
+    print(f"  save_run : {t_atomic:.3f}s ({n / t_atomic:.0f} run/s)")
+    print(f"  hızlanma : x{t_chain / t_atomic:.1f}")
+    storage.close_engines()
+
+
+if __name__ == '__main__':
+    run()
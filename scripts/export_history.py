@@ -0,0 +1,34 @@
+"""Run geçmişini Parquet / Arrow IPC dosyalarına aktarır (ay + materyal bölümlü).
+Çalıştırma: python scripts/export_history.py OUT_DIR [--format parquet|arrow] [--since 2025-01] [--db data/app.db]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from app.core import storage  # noqa
+from app.core.history_export import export_history  # noqa
+
+
+def run():
+    parser = argparse.ArgumentParser(description="runs/topics/metrics kolon bazlı dışa aktarım")
+    parser.add_argument("out_dir")
+    parser.add_argument("--format", default="parquet", choices=["parquet", "arrow"])
+    parser.add_argument("--since", default=None, help="YYYY-MM; yalnız bu ay ve sonrası yeniden yazılır")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--db", default=None, help="SQLite yolu (varsayılan: data/app.db)")
+    args = parser.parse_args()
+    t0 = time.perf_counter()
+    counts = export_history(args.out_dir, fmt=args.format, batch_size=args.batch_size,
+                            since_month=args.since, db_path=args.db)
+    for table, n in counts.items():
+        print(f"{table}: {n} satır")
+    print(f"Süre: {time.perf_counter() - t0:.2f}s")
+    storage.close_engines()
+
+
+if __name__ == '__main__':
+    run()
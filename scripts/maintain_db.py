@@ -0,0 +1,50 @@
+"""Analiz veritabanı bakımı: saklama kuralları, arşivleme ve vacuum.
+Çalıştırma: python scripts/maintain_db.py [--db data/app.db] [--dry-run]
+            [--runs-days 730] [--metrics-days 90] [--topics-days 180] [--no-vacuum]
+Ayarlar varsayılan olarak config/settings.yaml > app.maintenance altından okunur.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from app.core import storage  # noqa
+from app.core.maintenance import run_maintenance  # noqa
+
+
+def run():
+    parser = argparse.ArgumentParser(description="DB saklama / arşiv / vacuum bakımı")
+    parser.add_argument("--db", default=None, help="SQLite yolu (varsayılan: data/app.db)")
+    parser.add_argument("--archive-dir", default=None, help="gzip JSONL arşiv dizini")
+    parser.add_argument("--runs-days", type=float, default=None, help="bu günden eski run'ları arşivle + sil")
+    parser.add_argument("--metrics-days", type=float, default=None, help="bu günden eski run'larda metrikleri özetle")
+    parser.add_argument("--topics-days", type=float, default=None, help="bu günden eski run'ların topic satırlarını sil")
+    parser.add_argument("--no-vacuum", action="store_true", help="vacuum adımını atla")
+    parser.add_argument("--dry-run", action="store_true", help="yalnız etkilenecek satırları say")
+    args = parser.parse_args()
+    retention = {
+        table: days
+        for table, days in (("runs", args.runs_days), ("metrics", args.metrics_days), ("topics", args.topics_days))
+        if days is not None
+    }
+    report = run_maintenance(
+        args.db,
+        retention_days=retention,
+        archive_dir=args.archive_dir,
+        vacuum=False if args.no_vacuum else None,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    mb = report['bytes_reclaimed'] / (1024 * 1024)
+    print(f"Kazanılan: {mb:.2f} MB | vacuum: {report['vacuum']}")
+    for name, before in report['latency_before_ms'].items():
+        after = report['latency_after_ms'][name]
+        print(f"  {name}: {before:.2f} ms -> {after:.2f} ms")
+    storage.close_engines()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,34 @@
+"""Trend rollup tablosunu ham runs verisinden yeniden hesaplar.
+Arşivlenmiş run içeren (bakımdan geçmiş) kovalar korunur, yeniden yazılmaz.
+Çalıştırma: python scripts/rebuild_rollups.py [--db data/app.db]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from app.core import storage  # noqa
+
+
+def run():
+    parser = argparse.ArgumentParser(description="run_rollups tablosunu yeniden oluştur")
+    parser.add_argument("--db", default=None, help="SQLite yolu (varsayılan: data/app.db)")
+    args = parser.parse_args()
+    storage.init_db(args.db)
+    eng = storage.get_engine(args.db)
+    archived = eng.query("SELECT COUNT(*) FROM runs WHERE archived_at IS NOT NULL")[0][0]
+    t0 = time.perf_counter()
+    n = storage.rebuild_rollups(args.db)
+    print(f"{n} rollup satırı yazıldı ({time.perf_counter() - t0:.3f}s)")
+    frozen = eng.query("SELECT COUNT(*) FROM run_rollups WHERE archived = 1")[0][0]
+    if archived or frozen:
+        print(f"Uyarı: {archived} arşivlenmiş run var; {frozen} dondurulmuş rollup satırı "
+              "korundu (bakımda silinen run'lar ham veride olmadığından yeniden hesaplanmadı).")
+    storage.close_engines()
+
+
+if __name__ == '__main__':
+    run()
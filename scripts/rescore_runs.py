@@ -0,0 +1,44 @@
+"""Geçmiş run'ları güncel (veya verilen) ağırlıklarla yeniden skorlar.
+Çalıştırma: python scripts/rescore_runs.py [--what-if] [--weights coverage=0.6,delivery=0.2,pedagogy=0.2] [--note "..."] [--db data/app.db]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from app.core import storage  # noqa
+from app.core.rescoring import rescore_runs  # noqa
+
+
+def _parse_weights(spec):
+    if not spec:
+        return None
+    out = {}
+    for part in spec.split(','):
+        k, v = part.split('=')
+        out[k.strip()] = float(v)
+    return out
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Toplu yeniden skorlama")
+    parser.add_argument("--what-if", action="store_true", help="Sonuçları yazma, sadece göster")
+    parser.add_argument("--weights", default=None, help="coverage=..,delivery=..,pedagogy=..")
+    parser.add_argument("--note", default=None)
+    parser.add_argument("--db", default=None, help="SQLite yolu (varsayılan: data/app.db)")
+    args = parser.parse_args()
+    storage.init_db(args.db)
+    t0 = time.perf_counter()
+    res = rescore_runs(weights=_parse_weights(args.weights), persist=not args.what_if, note=args.note, db_path=args.db)
+    s = res['summary']
+    print(f"{s['count']} run yeniden skorlandı ({time.perf_counter() - t0:.3f}s)")
+    print(f"  ortalama delta: {s['mean_delta']:+.4f} | artan: {s['count_up']} | azalan: {s['count_down']}")
+    print(f"  versiyon: {res['version'] if res['version'] is not None else '- (what-if)'}")
+    storage.close_engines()
+
+
+if __name__ == '__main__':
+    run()
@@ -16,3 +16,28 @@ def test_chunking_hard_split():
     chunks = tokenize_and_chunk(text, max_tokens=40, overlap=0, min_chunk_tokens=5)
     # Hard split en az 2 chunk üretmeli
     assert len(chunks) >= 2
+
+
+def test_content_defined_chunks_stable_under_local_edit():
+    from app.core.chunking import content_defined_chunks, diff_chunks
+    sents = [f"Bu {i}. cümle makine öğrenmesi ve veri hakkında konuşur." for i in range(120)]
+    old = content_defined_chunks(" ".join(sents), max_tokens=120, min_chunk_tokens=10)
+    edited = list(sents)
+    edited[60] = edited[60].replace("makine", "makina")
+    new = content_defined_chunks(" ".join(edited), max_tokens=120, min_chunk_tokens=10)
+    d = diff_chunks(old, new)
+    assert d['added'] and d['removed']
+    # Yerel düzeltme sadece birkaç chunk'ı etkilemeli
+    assert len(d['added']) <= 2
+    assert len(d['kept']) >= len(new) - 2
+
+
+def test_encode_sentences_matches_per_sentence_encode():
+    from app.core.chunking import encode_sentences, tokenize, chunk_sentences
+    sents = ["Birinci cümle.", "İkinci cümle biraz daha uzun.", "Üç."]
+    flat, offsets = encode_sentences(sents)
+    assert offsets[0] == 0 and offsets[-1] == len(flat)
+    for i, s in enumerate(sents):
+        assert flat[offsets[i]:offsets[i + 1]] == tokenize(s)
+    chunks = chunk_sentences(sents, max_tokens=8, overlap=2, min_chunk_tokens=1, store_tokens=True)
+    assert sum(len(c['tokens']) for c in chunks) >= len(flat)
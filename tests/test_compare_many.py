@@ -0,0 +1,75 @@
+import pytest
+
+from app.core import storage
+from app.core.history import compare_many, compare_runs
+
+
+def _run(rid, total, scores):
+    return {
+        'id': rid,
+        'total_score': total,
+        'metrics': [{'category': c, 'name': n, 'score': s} for (c, n), s in scores.items()],
+    }
+
+
+RUNS = [
+    _run(1, 0.50, {('delivery', 'wpm'): 0.6, ('delivery', 'filler'): 0.8}),
+    _run(2, 0.70, {('delivery', 'wpm'): 0.9, ('delivery', 'filler'): 0.8, ('pedagogy', 'examples'): 0.4}),
+    _run(3, 0.60, {('delivery', 'wpm'): 0.3, ('delivery', 'filler'): 0.9}),
+]
+
+
+def test_compare_many_first_baseline_matches_pairwise():
+    res = compare_many([1, 2, 3], runs=RUNS)
+    assert res['run_ids'] == [1, 2, 3]
+    names = [(m['category'], m['name']) for m in res['metrics']]
+    for i, run in enumerate(RUNS):
+        pair = compare_runs(RUNS[0], run)['summary']
+        row = res['runs'][i]
+        assert row['count_improved'] == pair['count_improved']
+        assert row['count_declined'] == pair['count_declined']
+        assert row['count_unchanged'] == pair['count_unchanged']
+        assert row['total_delta'] == pytest.approx(pair['total_score_delta'])
+    # Run 1'de olmayan metrik için delta yok
+    j = names.index(('pedagogy', 'examples'))
+    assert res['deltas'][1][j] is None
+    assert res['scores'][1][j] == pytest.approx(0.4)
+
+
+def test_compare_many_ranks_percentiles_and_previous():
+    res = compare_many([1, 2, 3], baseline='previous', runs=RUNS)
+    names = [(m['category'], m['name']) for m in res['metrics']]
+    w = names.index(('delivery', 'wpm'))
+    f = names.index(('delivery', 'filler'))
+    assert [res['ranks'][i][w] for i in range(3)] == [2, 1, 3]
+    assert [res['rank_changes'][i][w] for i in range(3)] == [0, 1, -2]
+    # filler: 0.8, 0.8 eşit -> aynı rank, ortalama yüzdelik
+    assert res['ranks'][0][f] == res['ranks'][1][f] == 2
+    assert res['percentiles'][0][f] == pytest.approx(100 * (0 + 0.5 * 2) / 3)
+    assert [r['total_rank'] for r in res['runs']] == [3, 1, 2]
+    assert res['runs'][2]['total_delta'] == pytest.approx(-0.1)
+
+
+def test_compare_many_mean_baseline_and_invalid():
+    res = compare_many([1, 2, 3], baseline='mean', runs=RUNS)
+    names = [(m['category'], m['name']) for m in res['metrics']]
+    w = names.index(('delivery', 'wpm'))
+    assert res['deltas'][0][w] == pytest.approx(0.6 - 0.6)
+    assert res['rank_changes'][0][w] is None
+    with pytest.raises(ValueError):
+        compare_many([1, 2], baseline=99, runs=RUNS)
+
+
+def test_compare_many_from_db(tmp_path):
+    db = str(tmp_path / 'cmp.db')
+    storage.init_db(db)
+    ids = []
+    for total, wpm in [(0.5, 0.4), (0.8, 0.9)]:
+        delivery = {'raw': {'wpm': 140}, 'scores': {'wpm': wpm, 'delivery_score': wpm}}
+        res = storage.save_run({'filename': 'a.pdf'}, {'total_score': total}, delivery=delivery, db_path=db)
+        ids.append(res['run_id'])
+    res = compare_many(ids + [999], db_path=db)
+    assert res['run_ids'] == ids
+    assert res['runs'][1]['count_improved'] == res['runs'][1]['metric_count'] > 0
+    j = [(m['category'], m['name']) for m in res['metrics']].index(('delivery', 'wpm'))
+    assert res['deltas'][1][j] == pytest.approx(0.5)
@@ -16,3 +16,17 @@ def test_coverage_classification():
     assert 'Görüntü işleme' in statuses
     # En az bir missing veya partial olmalı
     assert any(s != 'covered' for s in statuses.values())
+
+
+def test_best_matches_numpy_matches_python_fallback(monkeypatch):
+    from app.core import coverage as cov_mod
+    chunks = get_or_compute_embeddings(
+        [{'id': f'c{i}', 'text': f'Parça {i} içerik metni'} for i in range(12)],
+        use_real=False,
+    )
+    topics = cov_mod.embed_topics([f'Konu {j}' for j in range(7)])
+    fast = cov_mod.best_matches(chunks, topics)
+    monkeypatch.setattr(cov_mod, '_NUMPY', False)
+    slow = cov_mod.best_matches(chunks, topics)
+    assert [i for _, i in fast] == [i for _, i in slow]
+    assert all(abs(a - b) < 1e-5 for (a, _), (b, _) in zip(fast, slow))
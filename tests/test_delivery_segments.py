@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.delivery import analyze_segments, compute_delivery_metrics
+
+
+def _segments():
+    # 0-60 sn normal (2 kelime/sn = 120 WPM), 4 sn sessizlik, 64-94 sn hızlı (5 kelime/sn = 300 WPM)
+    segs = []
+    for i in range(12):
+        segs.append({'start': i * 5.0, 'end': i * 5.0 + 5.0, 'text': ' '.join(['kelime'] * 10) + '.'})
+    for i in range(6):
+        segs.append({'start': 64.0 + i * 5.0, 'end': 69.0 + i * 5.0, 'text': ' '.join(['hızlı'] * 25) + '.'})
+    return segs
+
+
+def test_analyze_segments_pauses_windows_bursts():
+    info = analyze_segments(_segments(), {'wpm_window_sec': 10.0, 'wpm_step_sec': 5.0})
+    raw = info['raw']
+    assert raw['long_pause_count'] == 1
+    assert raw['silence_seconds'] == pytest.approx(4.0)
+    assert info['timeline']['pauses'] == [{'start': 60.0, 'end': 64.0, 'duration': 4.0}]
+    assert info['duration_minutes'] == pytest.approx(94.0 / 60.0)
+    wpm = info['timeline']['wpm']
+    assert wpm[0] == pytest.approx(120.0)
+    assert max(wpm) == pytest.approx(300.0)
+    assert raw['burst_count'] == 1
+    burst = info['timeline']['bursts'][0]
+    assert 60.0 <= burst['start'] <= 65.0 and burst['end'] == pytest.approx(94.0)
+
+
+def test_delivery_segment_mode_shape():
+    segs = _segments()
+    res = compute_delivery_metrics("", segments=segs)
+    assert res['mode'] == 'segments'
+    assert res['raw']['words'] == 12 * 10 + 6 * 25
+    assert res['raw']['duration_minutes'] == pytest.approx(94.0 / 60.0)
+    assert res['raw']['pause_markers'] == 1 and res['raw']['long_pause_count'] == 1
+    assert 'timeline' in res and res['timeline']['wpm']
+    # Segment yoksa eski metin modu
+    text_res = compute_delivery_metrics(' '.join(s['text'] for s in segs), duration_minutes=2.0)
+    assert text_res['mode'] == 'text' and 'timeline' not in text_res
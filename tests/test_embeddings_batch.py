@@ -0,0 +1,53 @@
+import threading
+import time
+
+from app.core.embeddings import embed_texts
+
+
+class _RateLimited(Exception):
+    code = 429
+
+
+class _StubClient:
+    """Gecikme ve hata enjekte eden sahte embed_content istemcisi."""
+
+    def __init__(self, fail_first_n=0, latency=0.01):
+        self.calls = []
+        self.fail_first_n = fail_first_n
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    def embed_content(self, model, content):
+        with self._lock:
+            self.calls.append(content)
+            fail = len(self.calls) <= self.fail_first_n
+        time.sleep(self.latency)
+        if fail:
+            raise _RateLimited('429 quota')
+        items = content if isinstance(content, list) else [content]
+        return {'embedding': [[float(len(t)), float(i)] for i, t in enumerate(items)]}
+
+
+def test_batched_concurrent_preserves_order():
+    texts = ['x' * (i + 1) for i in range(23)]
+    client = _StubClient()
+    vecs = embed_texts(texts, use_real=True, client=client, batch_size=5, max_workers=4, requests_per_sec=None)
+    assert len(client.calls) == 5  # ceil(23/5) istek
+    assert [v[0] for v in vecs] == [float(len(t)) for t in texts]
+
+
+def test_rate_limit_retry_then_success():
+    texts = ['a', 'bb', 'ccc', 'dddd']
+    client = _StubClient(fail_first_n=2)
+    vecs = embed_texts(texts, use_real=True, client=client, batch_size=2, max_workers=2,
+                       requests_per_sec=None, retries=4, backoff=0.01)
+    assert [v[0] for v in vecs] == [1.0, 2.0, 3.0, 4.0]
+    assert len(client.calls) == 4
+
+
+def test_exhausted_retries_fall_back_to_fake():
+    client = _StubClient(fail_first_n=100, latency=0.0)
+    vecs = embed_texts(['a', 'b', 'c'], use_real=True, client=client, batch_size=2,
+                       requests_per_sec=None, retries=2, backoff=0.001)
+    assert len(vecs) == 3
+    assert all(len(v) == 8 for v in vecs)
@@ -9,3 +9,23 @@ def test_embedding_cache_reuse(tmp_path, monkeypatch):
     # Aynı id'ler aynı vektöre sahip olmalı
     assert emb1[0]['embedding'] == emb2[0]['embedding']
     assert emb1[1]['embedding'] == emb2[1]['embedding']
+
+
+def test_update_embeddings_embeds_only_added_chunks(monkeypatch):
+    from app.core import embeddings
+    old = [{'id': 'c1', 'text': 'Birinci bölüm.'}, {'id': 'c2', 'text': 'İkinci bölüm.'}, {'id': 'c3', 'text': 'Üçüncü bölüm.'}]
+    old = [{**ch, 'embedding': [float(i)]} for i, ch in enumerate(old)]
+    new = [{'id': 'c1', 'text': 'Birinci bölüm.'}, {'id': 'c2', 'text': 'İkinci bölüm düzeltildi.'}, {'id': 'c3', 'text': 'Üçüncü bölüm.'}]
+    seen = []
+
+    def spy(chunks, model='text-embedding-004', use_real=False):
+        seen.extend(ch['text'] for ch in chunks)
+        return [{**ch, 'embedding': [9.0]} for ch in chunks]
+
+    monkeypatch.setattr(embeddings, 'get_or_compute_embeddings', spy)
+    res = embeddings.update_embeddings(old, new)
+    assert seen == ['İkinci bölüm düzeltildi.']
+    assert [ch['id'] for ch in res['embedded']] == ['c1', 'c2', 'c3']
+    assert [ch['embedding'] for ch in res['embedded']] == [[0.0], [9.0], [2.0]]
+    assert [ch['text'] for ch in res['removed']] == ['İkinci bölüm.']
+    assert all('previous_id' not in ch for ch in res['embedded'])
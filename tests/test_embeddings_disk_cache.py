@@ -0,0 +1,36 @@
+import json
+
+from app.core.embeddings import EmbeddingDiskCache, _hash_key, _fake_embed  # type: ignore
+
+
+def test_binary_cache_roundtrip_and_reopen(tmp_path):
+    cache = EmbeddingDiskCache(str(tmp_path))
+    entries = [
+        {'key': _hash_key('m', f'metin {i}'), 'model': 'm', 'vector': _fake_embed(f'metin {i}', dim=8 + i)}
+        for i in range(5)
+    ]
+    assert cache.put_many(entries) == 5
+    # Aynı key tekrar eklenmez
+    assert cache.put_many(entries[:2]) == 0
+    cache.close()
+
+    reopened = EmbeddingDiskCache(str(tmp_path))
+    assert len(reopened) == 5
+    got = reopened.get_many([e['key'] for e in entries] + [_hash_key('m', 'yok')])
+    assert len(got) == 5
+    for e in entries:
+        assert len(got[e['key']]) == len(e['vector'])
+        assert all(abs(a - b) < 1e-6 for a, b in zip(got[e['key']], e['vector']))
+    reopened.close()
+
+
+def test_jsonl_migration_is_one_shot(tmp_path):
+    legacy = tmp_path / 'embeddings.jsonl'
+    rows = [{'key': _hash_key('m', t), 'model': 'm', 'text_sha': 'x', 'vector': _fake_embed(t)} for t in ('a', 'b')]
+    legacy.write_text('\n'.join(json.dumps(r) for r in rows) + '\n', encoding='utf-8')
+    cache = EmbeddingDiskCache(str(tmp_path))
+    assert cache.migrate_jsonl(str(legacy)) == 2
+    assert not legacy.exists()
+    assert cache.migrate_jsonl(str(legacy)) == 0
+    assert set(cache.get_many([r['key'] for r in rows])) == {r['key'] for r in rows}
+    cache.close()
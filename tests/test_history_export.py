@@ -0,0 +1,48 @@
+import pytest
+
+from app.core import storage
+
+pytest.importorskip('pyarrow')
+from app.core.history_export import export_history, load_runs_dataframe, load_metrics_dataframe  # noqa: E402
+from app.core.trends import load_columnar_runs, compute_basic_deltas  # noqa: E402
+
+
+def _seed(db):
+    for i, (fname, month) in enumerate([('a.pdf', '2024-11'), ('a.pdf', '2024-12'), ('b.pdf', '2024-12'), ('a.pdf', '2025-01')]):
+        rid = storage.save_run(
+            {'filename': fname, 'stats': {}},
+            {'total_score': 0.5 + i / 10, 'weights_used': {'coverage': 1.0}},
+            delivery={'raw': {'wpm': 130 + i}, 'scores': {'wpm': 0.8, 'delivery_score': 0.8}},
+            db_path=db,
+        )['run_id']
+        with storage.get_engine(db).transaction() as conn:
+            conn.execute("UPDATE runs SET created_at = ? WHERE id = ?", (f'{month}-15 09:00:00', rid))
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_export_and_load_roundtrip(tmp_path, fmt):
+    db = str(tmp_path / 'app.db')
+    out = str(tmp_path / 'export')
+    storage.init_db(db)
+    _seed(db)
+    counts = export_history(out, fmt=fmt, batch_size=2, db_path=db)
+    assert counts == {'runs': 4, 'topics': 0, 'metrics': 8}
+    assert (tmp_path / 'export' / 'runs' / 'month=2024-12' / 'material=b.pdf').is_dir()
+
+    runs = load_runs_dataframe(out, fmt=fmt)
+    assert list(runs['id']) == sorted(runs['id'])
+    assert len(runs) == 4 and set(runs['filename']) == {'a.pdf', 'b.pdf'}
+    only_a = load_runs_dataframe(out, fmt=fmt, material='a.pdf', since_month='2024-12')
+    assert sorted(only_a['month']) == ['2024-12', '2025-01']
+    metrics = load_metrics_dataframe(out, fmt=fmt, columns=['run_id', 'name', 'score'])
+    assert set(metrics['name']) == {'wpm', 'delivery_score'}
+
+    df = load_columnar_runs(out, fmt=fmt, material='a.pdf')
+    assert list(df['created_at']) == sorted(df['created_at'])
+    assert abs(compute_basic_deltas(df)['total_score_delta'] - 0.3) < 1e-9
+
+    # Artımlı: yalnız since_month ve sonrası bölümler yenilenir
+    storage.save_run({'filename': 'a.pdf', 'stats': {}}, {'total_score': 0.1}, db_path=db)
+    export_history(out, fmt=fmt, since_month='2025-01', db_path=db)
+    assert len(load_runs_dataframe(out, fmt=fmt)) == 5
+    storage.close_engines()
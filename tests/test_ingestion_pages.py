@@ -0,0 +1,93 @@
+import pytest
+
+from app.core import ingestion
+
+
+def _make_pdf(n_pages):
+    canvas_mod = pytest.importorskip("reportlab.pdfgen.canvas")
+    pytest.importorskip("pdfminer")
+    from io import BytesIO
+    buf = BytesIO()
+    c = canvas_mod.Canvas(buf)
+    for i in range(n_pages):
+        c.drawString(72, 720, f"Sayfa numarasi {i + 1}")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def test_iter_pdf_pages_order_and_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, '_PDF_CACHE_DIR', str(tmp_path))
+    data = _make_pdf(3)
+    pages = list(ingestion.iter_pdf_pages(data))
+    assert [p for p, _ in pages] == [0, 1, 2]
+    assert "Sayfa numarasi 2" in pages[1][1]
+    # İkinci okuma cache'ten gelmeli (extraction çağrılmamalı)
+    monkeypatch.setattr(ingestion, '_extract_pages', lambda *a, **k: iter(()))
+    assert list(ingestion.iter_pdf_pages(data)) == pages
+    assert "Sayfa numarasi 3" in ingestion.read_pdf(data)
+
+
+def test_parallel_extraction_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, '_PDF_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ingestion, '_PARALLEL_MIN_PAGES', 2)
+    monkeypatch.setattr(ingestion, '_PAGES_PER_TASK', 2)
+    data = _make_pdf(5)
+    serial = list(ingestion.iter_pdf_pages(data, use_cache=False))
+    parallel = list(ingestion.iter_pdf_pages(data, max_workers=2, use_cache=False))
+    assert parallel == serial
+
+
+class _CrashingPool:
+    """İkinci aralığı düşüren, işleri aynı süreçte çalıştıran sahte havuz."""
+
+    def __init__(self, *args, initializer=None, initargs=(), **kwargs):
+        initializer(*initargs)
+        self.calls = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, rng):
+        from concurrent.futures import Future
+        fut = Future()
+        self.calls += 1
+        if self.calls == 2:
+            fut.set_exception(RuntimeError('worker çöktü'))
+        else:
+            fut.set_result(fn(rng))
+        return fut
+
+
+def test_crashed_worker_range_is_retried_and_cache_stays_complete(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, '_PDF_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ingestion, '_PARALLEL_MIN_PAGES', 2)
+    monkeypatch.setattr(ingestion, '_PAGES_PER_TASK', 2)
+    monkeypatch.setattr(ingestion, 'ProcessPoolExecutor', _CrashingPool)
+    data = _make_pdf(5)
+    pages = list(ingestion.iter_pdf_pages(data, max_workers=2))
+    assert all(f"Sayfa numarasi {i + 1}" in text for i, (_, text) in enumerate(pages))
+    cached = ingestion._load_cached_pages(ingestion.compute_document_hash(data))
+    assert cached == [text for _, text in pages]
+
+
+def test_failed_retry_skips_cache_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, '_PDF_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ingestion, '_PARALLEL_MIN_PAGES', 2)
+    monkeypatch.setattr(ingestion, '_PAGES_PER_TASK', 2)
+    monkeypatch.setattr(ingestion, 'ProcessPoolExecutor', _CrashingPool)
+    data = _make_pdf(5)
+    real = ingestion._extract_pages
+
+    def flaky(file_bytes, page_numbers=None):
+        if page_numbers == [2, 3]:
+            raise RuntimeError('seri deneme de başarısız')
+        return real(file_bytes, page_numbers)
+
+    monkeypatch.setattr(ingestion, '_extract_pages', flaky)
+    pages = list(ingestion.iter_pdf_pages(data, max_workers=2))
+    assert [text for _, text in pages][2:4] == ["", ""]
+    assert ingestion._load_cached_pages(ingestion.compute_document_hash(data)) is None
@@ -0,0 +1,44 @@
+import random
+
+from app.core.delivery import compute_delivery_metrics
+from app.core.live_metrics import LiveMetrics
+from app.core.pedagogy import compute_pedagogy_metrics
+
+
+def _feed_random(lm: LiveMetrics, text: str, seed: int = 0):
+    rnd = random.Random(seed)
+    i = 0
+    while i < len(text):
+        j = i + rnd.randint(1, 12)
+        lm.feed(text[i:j])
+        i = j
+
+
+def test_live_matches_batch_on_random_deltas():
+    words = "şey yani örneğin neden önce sonra özetle nedir İlk olarak ders konu bir bu".split()
+    seps = [' ', ' ', '. ', '? ', '... ', '\n\n', ' -- ']
+    rnd = random.Random(7)
+    for seed in range(20):
+        text = ''.join(rnd.choice(words) + rnd.choice(seps) for _ in range(rnd.randint(5, 150)))
+        lm = LiveMetrics(language='tr')
+        _feed_random(lm, text, seed)
+        d, b = lm.delivery(2.0), compute_delivery_metrics(text, 2.0, language='tr')
+        assert d['mode'] == 'live'
+        assert d['raw'] == b['raw'] and d['scores'] == b['scores']
+        assert d['fillers']['counts'] == b['fillers']['counts']
+        p, q = lm.pedagogy(), compute_pedagogy_metrics(text)
+        assert p['raw'] == q['raw'] and p['scores'] == q['scores']
+
+
+def test_filler_phrase_across_delta_boundary_and_snapshot_is_pure():
+    lm = LiveMetrics(language='en')
+    for delta in ["So you", " know", ", it is like", " the limit. You kn", "ow what I mean"]:
+        lm.feed(delta)
+    first = lm.snapshot(1.0)
+    assert first['delivery']['fillers']['counts'] == {'you know': 2, 'so': 1, 'like': 1}
+    # snapshot durumu değiştirmez; kuyruk sonraki delta ile birleşir
+    assert lm.snapshot(1.0) == first
+    lm.feed(" you know.")
+    text = "So you know, it is like the limit. You know what I mean you know."
+    assert lm.delivery(1.0)['raw'] == compute_delivery_metrics(text, 1.0, language='en')['raw']
+    assert lm.delivery(1.0)['fillers']['counts']['you know'] == 3
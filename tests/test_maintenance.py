@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+
+from app.core import storage
+from app.core.maintenance import iter_archive, run_maintenance
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _seed(db):
+    coverage = {
+        'summary': {'covered': 1, 'partial': 0, 'missing': 1, 'coverage_ratio': 0.5},
+        'topics': [{'topic': 'A' * 200, 'status': 'covered', 'similarity': 0.9}] * 20,
+    }
+    delivery = {'raw': {'wpm': 140}, 'scores': {'wpm': 0.9, 'delivery_score': 0.9}}
+    ids = []
+    for created in ['2024-01-10 10:00:00', '2025-02-01 10:00:00', '2025-05-30 10:00:00']:
+        res = storage.save_run({'filename': 'a.pdf'}, {'total_score': 0.7}, coverage=coverage,
+                               delivery=delivery, db_path=db)
+        with storage.get_engine(db).transaction() as conn:
+            conn.execute("UPDATE runs SET created_at = ? WHERE id = ?", (created, res['run_id']))
+        ids.append(res['run_id'])
+    return ids
+
+
+def test_maintenance_dry_run_changes_nothing(tmp_path):
+    db = str(tmp_path / 'm.db')
+    storage.init_db(db)
+    ids = _seed(db)
+    rep = run_maintenance(db, retention_days={'runs': 365, 'metrics': 30, 'topics': 30},
+                          archive_dir=str(tmp_path / 'arc'), dry_run=True, now=NOW)
+    assert rep['deleted']['runs'] == 1
+    assert rep['deleted']['topics'] == 40
+    assert rep['archive_file'] is None
+    assert len(storage.fetch_runs_details_bulk(ids, db_path=db)) == 3
+
+
+def test_maintenance_archive_downsample_delete(tmp_path):
+    db = str(tmp_path / 'm.db')
+    storage.init_db(db)
+    ids = _seed(db)
+    storage.rebuild_rollups(db)  # _seed created_at'i kayıttan sonra değiştirir
+    rollups_before = storage.fetch_rollups('day', db_path=db)
+    assert [r['bucket'] for r in rollups_before][:1] == ['2024-01-10']
+    rep = run_maintenance(db, retention_days={'runs': 365, 'metrics': 30, 'topics': 30},
+                          keep_metrics=['coverage_ratio', 'delivery_score'],
+                          archive_dir=str(tmp_path / 'arc'), now=NOW)
+    assert rep['archived_runs'] == 2
+    assert rep['deleted']['runs'] == 1
+    assert rep['vacuum'] in ('incremental', 'full')
+    assert rep['bytes_reclaimed'] == rep['bytes_before'] - rep['bytes_after']
+    assert set(rep['latency_after_ms']) == set(rep['latency_before_ms'])
+    assert storage.get_engine(db).query("PRAGMA freelist_count")[0][0] == 0
+
+    # Arşivde silinen ve downsample edilen run'ların tam detayı var
+    archived = list(iter_archive(rep['archive_file']))
+    assert [r['id'] for r in archived] == ids[:2]
+    assert archived[0]['filename'] == 'a.pdf' and len(archived[0]['topics']) == 20
+
+    remaining = {d['id']: d for d in storage.fetch_runs_details_bulk(ids, db_path=db)}
+    assert set(remaining) == set(ids[1:])
+    assert {m['name'] for m in remaining[ids[1]]['metrics']} == {'coverage_ratio', 'delivery_score'}
+    assert remaining[ids[1]]['topics'] == []
+    assert len(remaining[ids[2]]['topics']) == 20  # yeni run'a dokunulmaz
+    # Rollup'lar korunur; rebuild silinen run'ların kovalarını yeniden yazmaz
+    assert storage.fetch_rollups('day', db_path=db) == rollups_before
+    storage.rebuild_rollups(db)
+    assert storage.fetch_rollups('day', db_path=db) == rollups_before
+
+    # İkinci çalıştırma aynı run'ları tekrar arşivlemez
+    rep2 = run_maintenance(db, retention_days={'runs': 365, 'metrics': 30, 'topics': 30},
+                           archive_dir=str(tmp_path / 'arc'), now=NOW)
+    assert rep2['archived_runs'] == 0
+    assert rep2['deleted'] == {'topics': 0, 'metrics': 0, 'runs': 0, 'materials': 0}
+
+
+def test_rescore_after_metric_downsampling_uses_stored_scores(tmp_path):
+    from app.core.delivery import compute_delivery_metrics
+    from app.core.pedagogy import compute_pedagogy_metrics
+    from app.core.rescoring import rescore_runs
+
+    db = str(tmp_path / 'm.db')
+    storage.init_db(db)
+    text = ' '.join(f"Önce örnek {i} verelim, neden böyle olduğunu düşünün." for i in range(15))
+    delivery = compute_delivery_metrics(text, duration_minutes=1.0)
+    pedagogy = compute_pedagogy_metrics(text)
+    coverage = {'summary': {'covered': 1, 'partial': 0, 'missing': 1, 'coverage_ratio': 0.5}, 'topics': []}
+    res = storage.save_run({'filename': 'a.pdf'}, {'total_score': 0.7}, coverage=coverage,
+                           delivery=delivery, pedagogy=pedagogy, db_path=db)
+    with storage.get_engine(db).transaction() as conn:
+        conn.execute("UPDATE runs SET created_at = '2025-01-01 10:00:00' WHERE id = ?", (res['run_id'],))
+    before = rescore_runs(persist=False, db_path=db)['runs'][0]
+    assert before['delivery_score'] and before['pedagogy_score']
+
+    run_maintenance(db, retention_days={'runs': None, 'metrics': 30, 'topics': 30},
+                    keep_metrics=['coverage_ratio', 'delivery_score', 'pedagogy_score'],
+                    archive_dir=str(tmp_path / 'arc'), now=NOW)
+    after = rescore_runs(persist=False, db_path=db)['runs'][0]
+    for key in ('delivery_score', 'pedagogy_score', 'total_score'):
+        assert abs(after[key] - before[key]) < 1e-9
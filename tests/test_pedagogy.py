@@ -17,3 +17,51 @@ def test_pedagogy_balance():
     )
     res = compute_pedagogy_metrics(txt, config={'min_sentences': 3})
     assert 0.0 <= res['scores']['pedagogy_score'] <= 1.0
+
+
+def test_pattern_matcher_single_pass_positions_and_config():
+    from app.core.pedagogy import DEFAULT_CONFIG, get_matcher
+
+    sents = ["örneğin bir fonksiyon", "özetle türev nedir?", "hiçbiri yok"]
+    hits, matches = get_matcher().classify(sents, positions=True)
+    assert hits['examples'] == {0}
+    assert hits['summary'] == {1} and hits['signposting'] == {1} and hits['definitions'] == {1}
+    m = next(x for x in matches if x['category'] == 'definitions')
+    assert (m['sentence'], sents[1][m['start']:m['end']], m['pattern']) == (1, 'nedir', 'nedir')
+    # Aynı set için derlenmiş matcher tekrar kullanılır
+    assert get_matcher() is get_matcher()
+
+    txt = "İlk olarak kuralı yazalım. Bir vaka inceleyelim. Başka bir vaka daha."
+    targets_before = dict(DEFAULT_CONFIG['targets'])
+    res = compute_pedagogy_metrics(
+        txt,
+        config={'min_sentences': 3, 'patterns': {'examples': [r'\bvaka\b']}, 'targets': {'examples': 0.5}},
+        return_matches=True,
+    )
+    assert res['raw']['counts']['examples'] == 2
+    assert res['raw']['counts']['signposting'] == 1  # 'İlk olarak' küçük harfe doğru iner
+    assert any(x['text'] == 'vaka' for x in res['matches'])
+    assert DEFAULT_CONFIG['targets'] == targets_before
+
+
+def test_pattern_matcher_does_not_match_across_sentences():
+    from app.core.pedagogy import PatternMatcher
+
+    m = PatternMatcher({'examples': [r"ders\.\s+bugün", r"ilk\s+olarak", r"vaka[^x]+yok"]})
+    sents = ["bu bir ders.", "bugün ilk olarak vaka", "yok."]
+    for positions in (False, True):
+        hits, matches = m.classify(sents, positions=positions)
+        assert hits['examples'] == {1}
+        if positions:
+            assert [(x['sentence'], x['text']) for x in matches] == [(1, 'ilk olarak')]
+
+
+def test_pattern_matcher_config_alternation_keeps_all_alternatives():
+    import re
+    from app.core.pedagogy import PatternMatcher
+
+    sents = ['bir misal verelim', 'örnek olarak', '(i)nce bir ayrıntı', 'hiçbiri']
+    pats = ['örnek|misal', r'(?:\(i\))nce']
+    hits, _ = PatternMatcher({'examples': pats}).classify(sents)
+    expected = {i for i, s in enumerate(sents) if any(re.search(p, s) for p in pats)}
+    assert hits['examples'] == expected == {0, 1, 2}
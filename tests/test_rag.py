@@ -50,3 +50,20 @@ def test_rag_empty_results():
     assert res == []
     ans = generate_answer("herhangi", res)
     assert 'bulunamadı' in ans['answer']
+
+
+def test_vector_index_matches_bruteforce_and_search_many():
+    from app.core.embeddings import cosine_similarity, embed_texts
+    chunks = _fake_chunks()
+    idx = build_index(chunks)
+    q_vecs = embed_texts(["derin öğrenme", "veri yapısı"], use_real=False)
+    batch = idx.search_many(q_vecs, top_k=3)
+    assert len(batch) == 2
+    for q, res in zip(q_vecs, batch):
+        expected = sorted(chunks, key=lambda c: cosine_similarity(q, c['embedding']), reverse=True)[:3]
+        assert [r['id'] for r in res] == [c['id'] for c in expected]
+        single = idx.search(q, top_k=3)
+        assert [r['id'] for r in single] == [r['id'] for r in res]
+        assert abs(res[0]['similarity'] - cosine_similarity(q, expected[0]['embedding'])) < 1e-5
+    # top_k indeks boyutundan büyükse tüm entry'ler döner
+    assert len(idx.search(q_vecs[0], top_k=50)) == len(chunks)
@@ -0,0 +1,76 @@
+import pytest
+
+from app.core import storage
+from app.core.delivery import compute_delivery_metrics
+from app.core.pedagogy import compute_pedagogy_metrics
+from app.core.scoring import aggregate_scores
+
+pytest.importorskip('numpy')
+from app.core.rescoring import rescore_runs, resolve_config, fetch_score_versions, fetch_run_scores  # noqa: E402
+
+BASE = (
+    "Bugün makine öğrenmesine giriş yapacağız. Önce temel kavramları görelim. "
+    "Örneğin regresyon sürekli değer tahmin eder. Sizce sınıflandırma nedir? "
+    "Sınıflandırma kategorik tahmin olarak tanımlanır. Şimdi bir örnek verelim... "
+    "Yani veri hazırlığı çok önemlidir. Sonra modeli eğitiriz. Ardından test ederiz. "
+    "Özetle süreç veri, model ve değerlendirme adımlarından oluşur. "
+)
+
+
+def _analyse(i, cfg):
+    text = BASE * (1 + i % 3) + ("Şey, aslında bu kısım zor. " * i)
+    dlv = compute_delivery_metrics(text, duration_minutes=0.5 + i * 0.3, config=cfg['delivery'])
+    ped = compute_pedagogy_metrics(text, config=cfg['pedagogy'])
+    cov = {'summary': {'covered': 2, 'partial': 1, 'missing': 1, 'coverage_ratio': 0.2 * (i % 5)}, 'topics': []}
+    return cov, dlv, ped
+
+
+def test_rescore_matches_pipeline_and_versions(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    cfg = resolve_config()
+    expected = {}
+    for i in range(6):
+        cov, dlv, ped = _analyse(i, cfg)
+        agg = aggregate_scores(cov, dlv, ped, weights=cfg['weights'])
+        rid = storage.save_run({'filename': 'x.pdf'}, agg, coverage=cov, delivery=dlv, pedagogy=ped, db_path=db)['run_id']
+        expected[rid] = agg['total_score']
+    # tamamen metriksiz (eksik modül) run
+    empty = storage.save_run({'filename': 'y.pdf'}, {'total_score': 0.0}, db_path=db)['run_id']
+
+    # aynı konfigürasyonla what-if: pipeline ile birebir aynı
+    same = rescore_runs(persist=False, db_path=db)
+    assert same['version'] is None and fetch_score_versions(db_path=db) == []
+    by_id = {r['run_id']: r for r in same['runs']}
+    for rid, total in expected.items():
+        assert abs(by_id[rid]['total_score'] - total) < 1e-9
+    assert by_id[empty]['delivery_score'] is None and by_id[empty]['total_score'] == 0.0
+
+    # yeni ağırlıklar: yalnız coverage -> total = coverage_ratio; yeni versiyon yazılır
+    new_cfg = {'delivery': {'weights': {'wpm': 1.0, 'filler': 0, 'repetition': 0, 'sentence_length': 0, 'pause': 0}}}
+    res = rescore_runs(weights={'coverage': 1.0, 'delivery': 0.0, 'pedagogy': 0.0}, delivery=new_cfg['delivery'],
+                       note='yalnız coverage', db_path=db)
+    assert res['version'] == 1
+    stored = {r['run_id']: r for r in fetch_run_scores(1, db_path=db)}
+    for rid in expected:
+        d = storage.fetch_run_details(rid, db_path=db)
+        assert abs(stored[rid]['total_score'] - d['coverage_score']) < 1e-9
+        wpm = next(m for m in d['metrics'] if m['category'] == 'delivery' and m['name'] == 'wpm')
+        assert abs(stored[rid]['delivery_score'] - wpm['score']) < 1e-9
+    assert fetch_score_versions(db_path=db)[0]['note'] == 'yalnız coverage'
+    # runs tablosundaki orijinal skorlar değişmez
+    assert storage.fetch_run_details(empty, db_path=db)['total_score'] == 0.0
+    storage.close_engines()
+
+
+def test_vectorized_normalizers_match_scalar():
+    import numpy as np
+    from app.core import delivery as d, pedagogy as p
+    from app.core.rescoring import _band, _tolerance, _diversity, _norm_ratio
+    xs = np.array([-1.0, 0.0, 0.01, 0.05, 0.07, 0.1, 0.2, 0.5, 0.9, 1.5, 8, 20, 100, 150, 200, 400])
+    assert np.allclose(_band(xs, 130, 170), [d._normalize_wpm(x, 130, 170) for x in xs])
+    assert np.allclose(_band(xs, 8, 24), [d._normalize_sentence_len(x, 8, 24) for x in xs])
+    assert np.allclose(_tolerance(xs, 0.05), [d._normalize_filler(x, 0.05) for x in xs])
+    assert np.allclose(_diversity(xs, 0.55), [d._normalize_diversity(x, 0.55) for x in xs])
+    assert np.allclose(_norm_ratio(xs, 0.15), [p._norm_score(x, 0.15) for x in xs])
+    assert np.isnan(_band(np.array([np.nan]), 130, 170)[0])
@@ -1,5 +1,9 @@
 import os
+import sqlite3
 import tempfile
+
+import pytest
+
 from app.core import storage
 
 
@@ -58,3 +62,30 @@ def test_storage_lifecycle():
             os.remove(tmp)
         except OSError:
             pass
+
+
+def test_save_run_atomic(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    coverage = {
+        'summary': {'covered': 1, 'partial': 0, 'missing': 1, 'coverage_ratio': 0.5},
+        'topics': [{'topic': 'A', 'status': 'covered', 'similarity': 0.9}, {'topic': 'B', 'status': 'missing', 'similarity': 0.2}],
+    }
+    delivery = {'raw': {'wpm': 140, 'insufficient_data': False}, 'scores': {'wpm': 0.9, 'delivery_score': 0.9}}
+    pedagogy = {'raw': {'examples': 2}, 'scores': {'examples': 0.7, 'pedagogy_score': 0.7}}
+    res = storage.save_run({'filename': 'a.pdf', 'stats': {}}, {'total_score': 0.7, 'weights_used': {}},
+                           coverage=coverage, delivery=delivery, pedagogy=pedagogy, db_path=db)
+    assert res['counts'] == {'materials': 1, 'runs': 1, 'topics': 2, 'metrics': 4 + 2 + 2}
+    detail = storage.fetch_run_details(res['run_id'], db_path=db)
+    assert detail['material_id'] == res['material_id']
+    assert len(detail['metrics']) == res['counts']['metrics']
+
+    # Metrik yazımı patlarsa run ve material da geri alınır
+    bad = {'raw': {'wpm': object()}, 'scores': {}}
+    with pytest.raises(sqlite3.Error):
+        storage.save_run({'filename': 'b.pdf'}, {'total_score': 0.1}, delivery=bad, db_path=db)
+    eng = storage.get_engine(db)
+    for table, n in (('materials', 1), ('runs', 1), ('metrics', 8)):
+        assert eng.query(f"SELECT COUNT(*) FROM {table}")[0][0] == n
+    assert eng.query("SELECT COUNT(*) FROM materials WHERE filename='b.pdf'")[0][0] == 0
+    storage.close_engines()
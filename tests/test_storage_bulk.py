@@ -0,0 +1,45 @@
+from app.core import storage
+
+
+def _seed(db, n=5):
+    ids = []
+    for i in range(n):
+        res = storage.save_run(
+            {'filename': 'a.pdf' if i % 2 == 0 else 'b.pdf', 'stats': {}},
+            {'total_score': i / 10, 'weights_used': {'coverage': 1.0}},
+            coverage={'summary': {'coverage_ratio': 0.5}, 'topics': [{'topic': f'T{i}', 'status': 'covered', 'similarity': 0.8}]},
+            delivery={'raw': {'wpm': 120 + i}, 'scores': {'wpm': 0.5, 'delivery_score': 0.5}},
+            db_path=db,
+        )
+        ids.append(res['run_id'])
+    return ids
+
+
+def test_fetch_runs_details_bulk_matches_single(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    ids = _seed(db)
+    order = [ids[3], ids[0], 99999, ids[4]]
+    bulk = storage.fetch_runs_details_bulk(order, db_path=db)
+    assert [r['id'] for r in bulk] == [ids[3], ids[0], ids[4]]
+    for r in bulk:
+        assert r == storage.fetch_run_details(r['id'], db_path=db)
+    assert bulk[0]['weights'] == {'coverage': 1.0}
+    assert [t['topic'] for t in bulk[0]['topics']] == ['T3']
+    storage.close_engines()
+
+
+def test_iter_runs_keyset_pages_and_filters(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    ids = _seed(db, 7)
+    # aynı saniyede oluşan satırlar: (created_at, id) anahtarı tekrarsız sayfalamalı
+    assert [r['id'] for r in storage.iter_runs(page_size=2, db_path=db)] == ids
+    with storage.get_engine(db).transaction() as conn:
+        conn.execute("UPDATE runs SET created_at = '2020-01-01 00:00:00' WHERE id IN (?, ?)", (ids[0], ids[1]))
+    recent = [r['id'] for r in storage.iter_runs(since='2021-01-01', page_size=3, db_path=db)]
+    assert recent == ids[2:]
+    only_b = list(storage.iter_runs(material='b.pdf', page_size=2, with_details=True, db_path=db))
+    assert [r['id'] for r in only_b] == [ids[1], ids[3], ids[5]]
+    assert all(len(r['metrics']) == 4 + 2 for r in only_b)
+    storage.close_engines()
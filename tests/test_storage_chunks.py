@@ -0,0 +1,81 @@
+from app.core import storage
+from app.core.embeddings import embed_texts
+from app.core.rag import build_index
+
+
+def _embedded():
+    texts = ['Makine öğrenmesi veri kullanır.', 'Derin öğrenme katmanlıdır.', 'Regresyon sürekli değer tahmin eder.']
+    vecs = embed_texts(texts, use_real=False)
+    return [
+        {'id': f'c{i+1}', 'text': t, 'token_count': 5, 'embedding': v}
+        for i, (t, v) in enumerate(zip(texts, vecs))
+    ]
+
+
+def test_chunks_roundtrip_and_load_index(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    mid = storage.ensure_material({'filename': 'ml.pdf', 'stats': {}}, 'hash-1', db_path=db)
+    assert storage.ensure_material({'filename': 'ml.pdf'}, 'hash-1', db_path=db) == mid
+    assert storage.find_material('yok', db_path=db) is None
+
+    chunks = _embedded()
+    assert storage.save_chunks(mid, chunks, model='m1', db_path=db) == 3
+    # tekrar kaydetmek eskiyi değiştirir
+    storage.save_chunks(mid, chunks, model='m1', db_path=db)
+    assert storage.chunk_count(mid, model='m1', db_path=db) == 3
+    assert storage.chunk_count(mid, model='m2', db_path=db) == 0
+
+    loaded = storage.load_chunks(mid, model='m1', db_path=db)
+    assert [c['id'] for c in loaded] == ['c1', 'c2', 'c3']
+    for a, b in zip(loaded, chunks):
+        assert all(abs(x - y) < 1e-6 for x, y in zip(a['embedding'], b['embedding']))
+
+    idx = storage.load_index(mid, model='m1', db_path=db)
+    ref = build_index(chunks)
+    q = chunks[1]['embedding']
+    got = idx.search(q, top_k=3)
+    exp = ref.search(q, top_k=3)
+    assert [r['id'] for r in got] == [r['id'] for r in exp]
+    assert all(abs(g['similarity'] - e['similarity']) < 1e-5 for g, e in zip(got, exp))
+    assert 'embedding' not in got[0]
+
+    # run kaydı mevcut materyali kullanır; materyal silinince chunk'lar da gider
+    res = storage.save_run({'filename': 'ml.pdf'}, {'total_score': 0.5}, db_path=db, material_id=mid)
+    assert res['material_id'] == mid and res['counts']['materials'] == 0
+    with storage.get_engine(db).transaction() as conn:
+        conn.execute("DELETE FROM materials WHERE id = ?", (mid,))
+    assert storage.chunk_count(mid, db_path=db) == 0
+    assert len(storage.load_index(mid, db_path=db)) == 0
+    storage.close_engines()
+
+
+def test_second_model_keeps_first_model_vectors(tmp_path):
+    import pytest
+
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    mid = storage.ensure_material({'filename': 'ml.pdf', 'stats': {}}, 'hash-2', db_path=db)
+    chunks = _embedded()
+    storage.save_chunks(mid, chunks, model='A', db_path=db)
+    other = [dict(c, embedding=[x * 3.0 for x in reversed(c['embedding'])]) for c in chunks]
+    storage.save_chunks(mid, other, model='B', db_path=db)
+    assert storage.chunk_count(mid, model='A', db_path=db) == 3
+    assert storage.chunk_count(mid, model='B', db_path=db) == 3
+    # chunk satırları yeniden kullanılır, çoğaltılmaz
+    assert storage.get_engine(db).query("SELECT COUNT(*) FROM chunks WHERE material_id = ?", (mid,))[0][0] == 3
+
+    idx_a = storage.load_index(mid, model='A', db_path=db)
+    got = idx_a.search(chunks[2]['embedding'], top_k=1)
+    assert got[0]['id'] == 'c3' and abs(got[0]['similarity'] - 1.0) < 1e-5
+    # normalize saklanan vektörler frombuffer görünümü olarak kopyasız kullanılır
+    assert not idx_a._matrix.flags.writeable
+    with pytest.raises(ValueError):
+        storage.load_index(mid, db_path=db)
+
+    # model A için chunk listesi değişince B'nin vektörleri kalmaya devam eder
+    storage.save_chunks(mid, chunks[:2], model='A', db_path=db)
+    assert storage.chunk_count(mid, model='A', db_path=db) == 2
+    assert storage.chunk_count(mid, model='B', db_path=db) == 3
+    assert [c['id'] for c in storage.load_chunks(mid, model='B', db_path=db)] == ['c1', 'c2', 'c3']
+    storage.close_engines()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import threading
+
+import pytest
+
+from app.core import storage
+
+
+def _tmp_db():
+    fd, tmp = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    return tmp
+
+
+def test_engine_wal_and_connection_reuse():
+    tmp = _tmp_db()
+    try:
+        storage.init_db(tmp)
+        eng = storage.get_engine(tmp)
+        assert storage.get_engine(tmp) is eng
+        conn = eng.connection()
+        assert eng.connection() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        # farklı thread kendi bağlantısını alır
+        other = []
+        t = threading.Thread(target=lambda: other.append(eng.connection()))
+        t.start(); t.join()
+        assert other and other[0] is not conn
+    finally:
+        storage.close_engines()
+        os.remove(tmp)
+
+
+def test_transaction_rollback_and_reader_during_write():
+    tmp = _tmp_db()
+    try:
+        storage.init_db(tmp)
+        mid = storage.insert_material({'filename': 'a.txt', 'stats': {}}, db_path=tmp)
+        storage.insert_run(mid, {'total_score': 0.5, 'weights_used': {}}, db_path=tmp)
+        eng = storage.get_engine(tmp)
+        # hata -> iç içe eklemeler dahil hiçbir şey yazılmaz
+        with pytest.raises(RuntimeError):
+            with eng.transaction():
+                storage.insert_run(mid, {'total_score': 0.9}, db_path=tmp)
+                raise RuntimeError('boom')
+        assert len(storage.fetch_recent_runs(db_path=tmp)) == 1
+
+        # yazma işlemi açıkken başka thread okuyabilmeli (WAL)
+        seen = []
+        with eng.transaction():
+            storage.insert_run(mid, {'total_score': 0.7}, db_path=tmp)
+            t = threading.Thread(target=lambda: seen.append(len(storage.fetch_recent_runs(db_path=tmp))))
+            t.start(); t.join(5)
+        assert seen == [1]  # commit edilmemiş satır görünmez
+        assert len(storage.fetch_recent_runs(db_path=tmp)) == 2
+    finally:
+        storage.close_engines()
+        os.remove(tmp)
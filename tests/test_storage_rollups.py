@@ -0,0 +1,47 @@
+from app.core import storage
+from app.core.trends import rollup_dataframe, compute_basic_deltas
+
+
+def _save(db, filename, total, cov=None):
+    coverage = {'summary': {'coverage_ratio': cov}} if cov is not None else None
+    return storage.save_run({'filename': filename, 'stats': {}}, {'total_score': total}, coverage=coverage, db_path=db)['run_id']
+
+
+def test_rollups_incremental_match_rebuild(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    ids = [_save(db, 'a.pdf', 0.4, 0.5), _save(db, 'a.pdf', 0.6), _save(db, 'b.pdf', 0.9, 0.7)]
+    eng = storage.get_engine(db)
+    # kayıt anında artımlı güncellenen satırlar == ham veriden yeniden hesap
+    incremental = sorted(eng.query("SELECT * FROM run_rollups"))
+    assert incremental
+    storage.rebuild_rollups(db)
+    assert sorted(eng.query("SELECT * FROM run_rollups")) == incremental
+
+    with eng.transaction() as conn:
+        conn.execute("UPDATE runs SET created_at = '2025-01-06 10:00:00' WHERE id = ?", (ids[0],))
+    storage.rebuild_rollups(db)
+    days = storage.fetch_rollups('day', material='a.pdf', metrics=['total_score'], db_path=db)
+    assert [r['bucket'] for r in days] == ['2025-01-06', days[1]['bucket']]
+    assert days[0]['count'] == 1 and days[0]['mean'] == 0.4
+
+    # materyaller birleştirildiğinde: count/mean toplanır, last en son run'dan
+    all_days = storage.fetch_rollups('day', metrics=['total_score'], db_path=db)
+    today = all_days[-1]
+    assert today['count'] == 2
+    assert abs(today['mean'] - 0.75) < 1e-9
+    assert today['min'] == 0.6 and today['max'] == 0.9 and today['last'] == 0.9
+    storage.close_engines()
+
+
+def test_rollup_dataframe_feeds_deltas():
+    rows = [
+        {'bucket': '2025-W01', 'metric': 'total_score', 'count': 2, 'mean': 0.5, 'last': 0.6},
+        {'bucket': '2025-W01', 'metric': 'coverage_score', 'count': 2, 'mean': 0.4, 'last': 0.4},
+        {'bucket': '2025-W02', 'metric': 'total_score', 'count': 1, 'mean': 0.7, 'last': 0.7},
+    ]
+    df = rollup_dataframe(rows)
+    assert list(df['bucket']) == ['2025-W01', '2025-W02']
+    assert list(df['count']) == [2, 1]
+    d = compute_basic_deltas(df)
+    assert abs(d['total_score_delta'] - 0.2) < 1e-9
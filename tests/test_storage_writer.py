@@ -0,0 +1,96 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from app.core import storage
+from app.core.storage_writer import StorageWriter
+
+
+def _save_args(i):
+    return ({'filename': f'{i}.pdf', 'stats': {}}, {'total_score': i / 100})
+
+
+def test_writer_batches_and_isolates_failures(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    infos = []
+    w = StorageWriter(db, batch_max=16, on_commit=infos.append)
+    futs = [w.save_run(*_save_args(i), delivery={'raw': {'wpm': 120}, 'scores': {'wpm': 0.5}}) for i in range(40)]
+    bad = w.save_run({'filename': 'bad.pdf'}, {'total_score': 0.1}, delivery={'raw': {'wpm': object()}, 'scores': {}})
+    assert w.flush(timeout=10)
+    assert all(f.result()['counts']['metrics'] == 1 for f in futs)
+    with pytest.raises(Exception):
+        bad.result()
+    # hatalı iş yalnız kendini geri aldı; diğer 40 run kalıcı
+    assert len(storage.fetch_recent_runs(limit=100, db_path=db)) == 40
+    st = w.stats()
+    assert st['committed'] == 40 and st['failed'] == 1 and st['pending'] == 0
+    assert sum(i['jobs'] for i in infos) == 41 and len(infos) == st['batches']
+    w.close()
+    with pytest.raises(RuntimeError):
+        w.save_run(*_save_args(0))
+    storage.close_engines()
+
+
+def test_writer_backpressure_policies(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    gate = threading.Event()
+
+    def _blocker():
+        gate.wait(5)
+
+    for policy in ('raise', 'sync'):
+        w = StorageWriter(db, max_queue=1, batch_max=1, on_full=policy)
+        w.submit(_blocker)           # yazıcı thread'i bu işte bekler
+        time.sleep(0.05)
+        w.save_run(*_save_args(1))   # kuyruğu doldurur
+        if policy == 'raise':
+            with pytest.raises(queue.Full):
+                w.save_run(*_save_args(2))
+        else:
+            # yazıcının açık batch'i bitince (kilit boşalınca) çağıran thread'de yazılır
+            threading.Timer(0.2, gate.set).start()
+            fut = w.save_run(*_save_args(3))
+            assert fut.done() and fut.result()['run_id'] > 0
+        gate.set()
+        w.close(timeout=5)
+        gate.clear()
+    storage.close_engines()
+
+
+def test_reader_sees_consistent_snapshot(tmp_path):
+    db = str(tmp_path / 'app.db')
+    storage.init_db(db)
+    w = StorageWriter(db, batch_max=64)
+    coverage = {'summary': {'coverage_ratio': 0.5}, 'topics': [{'topic': 'A', 'status': 'covered', 'similarity': 0.9}]}
+    futs = [w.save_run(*_save_args(i), coverage=coverage) for i in range(30)]
+    seen = []
+    while not all(f.done() for f in futs):
+        ids = [r['id'] for r in storage.fetch_recent_runs(limit=100, db_path=db)]
+        for d in storage.fetch_runs_details_bulk(ids, db_path=db):
+            seen.append((len(d['topics']), len(d['metrics'])))
+    w.close()
+    # hiçbir okumada yarım yazılmış run görülmez
+    assert all(s == (1, 4) for s in seen)
+    storage.close_engines()
+
+
+def test_writer_prepares_schema_on_its_own_thread(tmp_path, monkeypatch):
+    db = str(tmp_path / 'fresh.db')
+    real_init = storage.init_db
+    threads = []
+
+    def spy(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return real_init(*args, **kwargs)
+
+    monkeypatch.setattr(storage, 'init_db', spy)
+    w = StorageWriter(db)
+    fut = w.save_run(*_save_args(1))
+    assert fut.result(timeout=10)['run_id']
+    assert threads == ['storage-writer']
+    w.close()
+    storage.close_engines()
@@ -17,3 +17,40 @@ def test_streaming_partial_generation():
     assert isinstance(outputs[-1]['full_text'], str)
     final = st.close()
     assert isinstance(final, str)
+
+
+def test_incremental_mode_commits_stable_words_with_bounded_window(monkeypatch):
+    import io
+    import wave
+    from array import array
+    from app.core import streaming_stt
+
+    def fake_transcribe(data, **kwargs):
+        # Her saniyelik PCM bloğu tek kelimeyi temsil eder (örnek değeri = kelime no)
+        with wave.open(io.BytesIO(data)) as w:
+            samples = array('h', w.readframes(w.getnframes()))
+        words, segments = [], []
+        for i in range(0, len(samples), 16000):
+            v = samples[i]
+            words.append(f"w{v}")
+            segments.append({'start': i / 16000, 'end': min(len(samples), i + 16000) / 16000, 'text': f"w{v}"})
+        if words:  # son kelime henüz kararsız: her seferinde farklı
+            words[-1] += f"~{len(samples)}"
+            segments[-1]['text'] = words[-1]
+        return {'text': ' '.join(words), 'segments': segments, 'duration_seconds': len(samples) / 16000,
+                'model': 'stub', 'cached': False}
+
+    monkeypatch.setattr(streaming_stt, 'transcribe_audio', fake_transcribe)
+    st = StreamingTranscriber(mode='incremental', min_interval_sec=0.0, min_bytes=1, max_window_sec=4.0)
+    committed_events = []
+    max_window = 0.0
+    for sec in range(20):
+        out = st.feed(array('h', [sec] * 16000).tobytes())
+        assert out is not None
+        committed_events += [e['text'] for e in out['events'] if e['type'] == 'commit']
+        max_window = max(max_window, out['window_seconds'])
+    assert max_window <= 5.0
+    committed = " ".join(committed_events).split()
+    assert committed == [f"w{i}" for i in range(len(committed))]
+    assert len(committed) >= 15
+    assert st.close().split()[:len(committed)] == committed
@@ -0,0 +1,76 @@
+import math
+from concurrent.futures import Future
+
+from app.core import stt_longform as lf
+
+
+def _wav_with_pauses(bursts, gap_sec=0.6, burst_sec=4.0):
+    import numpy as np
+    sr = lf.SAMPLE_RATE
+    parts = []
+    for _ in range(bursts):
+        t = np.arange(int(burst_sec * sr)) / sr
+        parts.append(0.5 * np.sin(2 * math.pi * 220 * t))
+        parts.append(np.zeros(int(gap_sec * sr)))
+    return lf.encode_wav(np.concatenate(parts).astype('float32'))
+
+
+class _StubService:
+    """Her pencere için segment döndüren; fail_index penceresini düşüren sahte servis."""
+
+    def __init__(self, fail_index=None, fake_index=None):
+        self.calls = 0
+        self.fail_index = fail_index
+        self.fake_index = fake_index
+
+    def submit(self, data, **kwargs):
+        idx = self.calls
+        self.calls += 1
+        fut = Future()
+        if idx == self.fail_index:
+            fut.set_exception(RuntimeError('pencere hatası'))
+        elif idx == self.fake_index:
+            # transcribe_audio model hatasını yutunca dönen placeholder
+            fut.set_result({'text': 'FAKE TRANSCRIPT (len=10 bytes)', 'segments': [], 'language': None, 'model': 'fake'})
+        else:
+            fut.set_result({'text': f'p{idx}', 'segments': [{'start': 0.5, 'end': 1.0, 'text': f'p{idx}'}],
+                            'language': 'tr', 'model': 'stub'})
+        return fut
+
+
+def test_windows_cut_on_silence_with_absolute_timestamps():
+    data = _wav_with_pauses(6)
+    progress = []
+    res = lf.transcribe_long_audio(data, service=_StubService(), max_window_sec=10.0, min_window_sec=2.0,
+                                   on_progress=lambda d, t, w: progress.append((d, t)))
+    assert len(res['windows']) >= 3
+    assert progress[-1][0] == progress[-1][1] == len(res['windows'])
+    # Pencere sınırları sessizlik bölgesine düşmeli (burst 4.0 sn + 0.6 sn boşluk)
+    for w in res['windows'][:-1]:
+        assert (w['end'] % 4.6) > 4.0
+    starts = [s['start'] for s in res['segments']]
+    assert starts == sorted(starts)
+    assert abs(starts[1] - (res['windows'][1]['start'] + 0.5)) < 1e-6
+
+
+def test_one_failed_window_keeps_partial_result():
+    data = _wav_with_pauses(7)
+    res = lf.transcribe_long_audio(data, service=_StubService(fail_index=1), max_window_sec=10.0, min_window_sec=2.0)
+    assert res['partial'] is True
+    assert res['failed_windows'] == [1]
+    assert 'p0' in res['text'] and 'p2' in res['text']
+
+
+def test_fake_window_result_counts_as_failure_and_is_not_cached():
+    data = _wav_with_pauses(8)
+    res = lf.transcribe_long_audio(data, service=_StubService(fake_index=1), max_window_sec=10.0, min_window_sec=2.0)
+    assert res['partial'] is True
+    assert res['failed_windows'] == [1]
+    assert 'FAKE' not in res['text'] and 'p0' in res['text']
+    again = lf.transcribe_long_audio(data, service=_StubService(), max_window_sec=10.0, min_window_sec=2.0)
+    assert again['cached'] is False and again['partial'] is False
+
+
+def test_merge_overlap_text_drops_repeated_words():
+    assert lf.merge_overlap_text("bugün makine öğrenmesi", "Öğrenmesi konusuna geçelim") == "konusuna geçelim"
+    assert lf.merge_overlap_text("abc", "def") == "def"
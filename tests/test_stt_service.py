@@ -0,0 +1,15 @@
+from app.core.stt_service import TranscriptionService
+
+
+def test_service_returns_futures_and_stats():
+    svc = TranscriptionService(pool_size=2, max_queue=8)
+    try:
+        futs = [svc.submit(bytes([i]) * 300, use_real=False) for i in range(5)]
+        results = [f.result(timeout=5) for f in futs]
+        assert all(r['model'] == 'fake' for r in results)
+        stats = svc.stats()
+        assert stats['completed'] == 5
+        assert stats['failed'] == 0
+        assert svc.queue_depth() == 0
+    finally:
+        svc.shutdown()
@@ -0,0 +1,45 @@
+import re
+
+from app.core.delivery import compute_delivery_metrics
+from app.core.pedagogy import compute_pedagogy_metrics
+from app.core.text_profile import TextProfile, clear_profile_cache, get_text_profile
+
+TEXT = (
+    "Bugün türev konusunu işleyeceğiz. Önce tanımı hatırlayalım... Türev nedir?\n"
+    "Örneğin x kare fonksiyonunu düşünün!\n\nSonra   zincir kuralına geçeceğiz. "
+    "Yani şey, aslında basit -- özetle\nsonuç olarak türev bir limittir. Sizce neden önemli?"
+)
+
+
+def _old_sentences(text):
+    t = text.strip()
+    if not t:
+        return []
+    t = re.sub(r"[\r\n]+", " ", t)
+    return [p.strip() for p in re.split(r"(?<=[.!?])\s+", t) if p.strip()]
+
+
+def test_profile_matches_previous_tokenization():
+    prof = TextProfile(TEXT)
+    assert prof.tokens == [w.lower() for w in re.findall(r"\b\w+\b", TEXT)]
+    assert prof.sentences == _old_sentences(TEXT)
+    assert all(TEXT[s:e] == TEXT[s:e].strip() for s, e in prof.sentence_spans)
+    assert prof.pause_markers == 3  # '...', '--', boş satır
+    ranges = prof.sentence_word_ranges()
+    assert sum(b - a for a, b in ranges) == prof.word_count
+    assert TextProfile("").sentence_count == 0
+
+
+def test_profile_cache_and_metric_modules_share_profile():
+    clear_profile_cache()
+    prof = get_text_profile(TEXT)
+    assert get_text_profile(TEXT) is prof
+    text = TEXT * 5
+    d1 = compute_delivery_metrics(text, duration_minutes=1.0)
+    d2 = compute_delivery_metrics("", duration_minutes=1.0, profile=TextProfile(text))
+    assert d1['raw'] == d2['raw'] and d1['scores'] == d2['scores']
+    assert d1['raw']['filler_count'] == 5 * 3  # yani, şey, aslında
+    p1 = compute_pedagogy_metrics(text, config={'min_sentences': 3})
+    p2 = compute_pedagogy_metrics("", config={'min_sentences': 3}, profile=get_text_profile(text))
+    assert p1['raw'] == p2['raw']
+    assert p1['raw']['counts']['questions'] >= 5